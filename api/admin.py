@@ -22,6 +22,7 @@ from .models import (
     S3File,
     TaxCharge,
     Transaction,
+    TransactionImport,
     UtilityBill,
     UtilityBillRule,
 )
@@ -127,6 +128,18 @@ class S3FileAdmin(admin.ModelAdmin):
     list_display = ("user_filename", "prefill", "analysis_complete")
 
 
+class TransactionImportAdmin(admin.ModelAdmin):
+    list_display = (
+        "user_filename",
+        "account",
+        "status",
+        "imported_count",
+        "skipped_count",
+        "created",
+    )
+    list_filter = ("status",)
+
+
 class UtilityBillRuleAdmin(admin.ModelAdmin):
     list_select_related = ("account",)
     list_display = (
@@ -171,6 +184,7 @@ admin.site.register(TaxCharge)
 admin.site.register(CSVColumnValuePair)
 admin.site.register(Amortization)
 admin.site.register(S3File, S3FileAdmin)
+admin.site.register(TransactionImport, TransactionImportAdmin)
 admin.site.register(DocSearch)
 admin.site.register(Paystub, PaystubAdmin)
 admin.site.register(PaystubValue)
@@ -5,25 +5,22 @@ from api.services.tax_services import get_tax_accounts
 class ReconciliationFactory:
     @staticmethod
     def create_bulk_reconciliations(date):
-        existing_reconciliations = set(
-            Reconciliation.objects.filter(date=date).values_list(
-                "account__name", flat=True
-            )
-        )
-        balance_sheet_account_names = set(
+        # One insert for every open balance-sheet account without a row yet;
+        # ignore_conflicts covers a concurrent load racing on (account, date).
+        missing_account_ids = (
             Account.objects.filter(
                 type__in=[Account.Type.ASSET, Account.Type.LIABILITY], is_closed=False
-            ).values_list("name", flat=True)
+            )
+            .exclude(reconciliation__date=date)
+            .values_list("pk", flat=True)
+        )
+        Reconciliation.objects.bulk_create(
+            [
+                Reconciliation(account_id=account_id, date=date)
+                for account_id in missing_account_ids
+            ],
+            ignore_conflicts=True,
         )
-
-        new_reconciliations = balance_sheet_account_names - existing_reconciliations
-        new_reconciliation_list = [
-            Reconciliation(account=Account.objects.get(name=account_name), date=date)
-            for account_name in new_reconciliations
-        ]
-
-        if new_reconciliation_list:
-            Reconciliation.objects.bulk_create(new_reconciliation_list)
 
         reconciliations = Reconciliation.objects.filter(date=date)
         return reconciliations
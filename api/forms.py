@@ -1,3 +1,4 @@
+import codecs
 import csv
 from decimal import Decimal, InvalidOperation
 from typing import Dict
@@ -149,23 +150,26 @@ class UploadTransactionsForm(forms.Form):
     )
     transaction_csv = forms.FileField()
 
-    def _csv_to_list_of_lists(self, csvfile):
-        # Open the file in text mode with the correct encoding
-        decoded_file = csvfile.read().decode("utf-8").splitlines()
-        csv_reader = csv.reader(decoded_file)
-        list_of_lists = list(csv_reader)
-        return list_of_lists
+    def _csv_rows(self, csvfile):
+        # Decode line by line so large exports are never read into memory whole
+        csvfile.seek(0)
+        return csv.reader(codecs.iterdecode(csvfile, "utf-8"))
 
-    def save(self):
+    def iter_batches(self, batch_size=None):
         account = self.cleaned_data["account"]
         csv_profile = account.csv_profile
-        transaction_list = self._csv_to_list_of_lists(
-            self.cleaned_data["transaction_csv"]
-        )
-        transactions = csv_profile.create_transactions_from_csv(
-            transaction_list, account
+        return csv_profile.iter_transaction_batches(
+            self._csv_rows(self.cleaned_data["transaction_csv"]),
+            account,
+            batch_size=batch_size,
         )
-        return transactions
+
+    def save(self):
+        return [
+            transaction
+            for batch in self.iter_batches()
+            for transaction in batch.transactions
+        ]
 
 
 class ReconciliationFilterForm(forms.Form):
@@ -1,12 +1,20 @@
+import bisect
 import calendar
 import datetime
+import itertools
 from decimal import Decimal
+from functools import cached_property
 
 from django.core.management.base import BaseCommand
-from django.db.models import Prefetch, Q
+from django.db.models import Prefetch
 
-from api.models import Account, JournalEntry, JournalEntryItem
-from api.statement import BalanceSheet, CashFlowStatement, IncomeStatement
+from api.models import (
+    Account,
+    JournalEntry,
+    JournalEntryItem,
+    debit_credit_total_annotations,
+)
+from api.statement import CashFlowStatement, FrameLedger
 
 # The discrepancy flag is an all-time reconciliation, so mirror the global window
 # that calculate_cash_flow_metrics() uses (api/services/statement_services.py).
@@ -21,10 +29,114 @@ INVESTING_SUB_TYPES = [
     Account.SubType.VEHICLES,
 ]
 
+# Balance-sheet sub_types whose period delta is a line in operations
+# (get_cash_from_operations_balances) or financing.
+DELTA_SUB_TYPES = [
+    Account.SubType.ACCOUNTS_RECEIVABLE,
+    Account.SubType.PREPAID_EXPENSES,
+    Account.SubType.SHORT_TERM_DEBT,
+    Account.SubType.TAXES_PAYABLE,
+    Account.SubType.LONG_TERM_DEBT,
+]
+
+BALANCE_SHEET_TYPES = [
+    Account.Type.ASSET,
+    Account.Type.LIABILITY,
+    Account.Type.EQUITY,
+]
+
 # Residuals below this are floating-point / rounding noise, not a real gap.
 THRESHOLD = Decimal("0.005")
 
 
+class DailyResiduals:
+    """Every period residual from one pass over the ledger.
+
+    A period's residual is linear in the items dated inside it: each item
+    moves cash, net cash flow and starting equity by amounts fixed by its
+    account (and, for investing legs, by whether its entry is non-cash). So
+    two grouped reads of per-day, per-account totals give each day's residual,
+    and prefix sums over the days answer any [start, end] in O(1).
+    """
+
+    def __init__(self):
+        accounts = {account.pk: account for account in Account.objects.all()}
+        daily = {}
+
+        for row in self._get_daily_totals(JournalEntryItem.objects.all()):
+            account = accounts[row["account"]]
+            daily.setdefault(row["journal_entry__date"], Decimal("0"))
+            daily[row["journal_entry__date"]] += self._get_residual(
+                account, row["debit_total"], row["credit_total"]
+            )
+
+        investing_items = JournalEntryItem.objects.filter(
+            CashFlowStatement.CASH_ENTRY,
+            account__sub_type__in=Account.INVESTMENT_SUB_TYPES,
+        )
+        for row in self._get_daily_totals(investing_items):
+            account = accounts[row["account"]]
+            daily.setdefault(row["journal_entry__date"], Decimal("0"))
+            daily[row["journal_entry__date"]] -= (
+                CashFlowStatement._get_investing_adjustment(
+                    account, row["debit_total"], row["credit_total"]
+                )
+            )
+
+        self.days = sorted(daily)
+        self.daily = [daily[day] for day in self.days]
+        self.prefix = list(itertools.accumulate(self.daily, initial=Decimal("0")))
+
+    @staticmethod
+    def _get_daily_totals(journal_entry_items):
+        return (
+            journal_entry_items.values("journal_entry__date", "account")
+            .annotate(**debit_credit_total_annotations())
+            .order_by()
+        )
+
+    @staticmethod
+    def _get_residual(account, debits, credits):
+        """cash - operations/financing flow - starting equity, for one account.
+
+        Mirrors CashFlowStatement: net income less unrealized gains, plus the
+        depreciation add-back, plus the DELTA_SUB_TYPES balance-sheet deltas
+        (sign-flipped for assets). Investing is handled by the caller.
+        """
+        balance = Account.get_balance_from_debit_and_credit(
+            account.type, debits=debits, credits=credits
+        )
+        cash = starting_equity = flow = Decimal("0")
+        if account.type in BALANCE_SHEET_TYPES:
+            if account.sub_type == Account.SubType.CASH:
+                cash = balance
+            if account.special_type == Account.SpecialType.STARTING_EQUITY:
+                starting_equity = balance
+            if account.sub_type in DELTA_SUB_TYPES:
+                flow = -balance if account.type == Account.Type.ASSET else balance
+        else:
+            flow = balance if account.type == Account.Type.INCOME else -balance
+            if account.sub_type == Account.SubType.UNREALIZED_INVESTMENT_GAINS:
+                flow -= balance
+            if account.is_depreciation:
+                flow += balance
+        return cash - flow - starting_equity
+
+    def get(self, start, end):
+        """The residual for [start, end] (dates or ISO strings)."""
+        low = bisect.bisect_left(self.days, _to_date(start))
+        high = bisect.bisect_right(self.days, _to_date(end))
+        return self.prefix[high] - self.prefix[low]
+
+    def get_flagged_days(self):
+        """(day, residual) for every day whose residual clears THRESHOLD."""
+        return [
+            (day, residual)
+            for day, residual in zip(self.days, self.daily)
+            if abs(residual) > THRESHOLD
+        ]
+
+
 class Command(BaseCommand):
     help = (
         "Read-only. Reproduce the global cash-flow discrepancy and localize it. "
@@ -36,6 +148,17 @@ class Command(BaseCommand):
         "equity, which telescopes to the global discrepancy."
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help=(
+                "Localize from daily prefix sums (one pass over the ledger) "
+                "instead of a CashFlowStatement per period, and report every "
+                "flagged day, even in months whose days offset each other."
+            ),
+        )
+
     def handle(self, *args, **options):
         cash_flow = self._statement(GLOBAL_START, GLOBAL_END)
 
@@ -73,17 +196,23 @@ class Command(BaseCommand):
             )
             return
 
-        self._localize_in_time()
+        if options["batch"]:
+            self._localize_in_batch()
+        else:
+            self._localize_in_time()
 
     # -- statement / residual helpers ------------------------------------
 
+    @cached_property
+    def ledger(self) -> FrameLedger:
+        # Bisection asks for a statement per year, month and day; loading the
+        # ledger once answers every one of them without another query.
+        return FrameLedger()
+
     def _statement(self, start, end) -> CashFlowStatement:
         """A CashFlowStatement covering [start, end] (dates or ISO strings)."""
-        prior_day = _to_date(start) - datetime.timedelta(days=1)
-        return CashFlowStatement(
-            income_statement=IncomeStatement(end_date=end, start_date=start),
-            end_balance_sheet=BalanceSheet(end_date=end),
-            start_balance_sheet=BalanceSheet(end_date=prior_day),
+        return CashFlowStatement.from_ledger(
+            self.ledger, _to_date(start), _to_date(end)
         )
 
     @staticmethod
@@ -129,43 +258,30 @@ class Command(BaseCommand):
 
         get_cash_from_investing_balances excludes any securities/RE/vehicle leg
         whose JE contains an unrealized-gain or depreciation leg. When such a JE
-        *also* has a cash leg, that real cash movement is silently dropped from
-        investing, leaving a permanent residual.
+        *also* has a cash leg (classified "mixed"), that real cash movement is
+        silently dropped from investing, leaving a permanent residual.
         """
-        suspects = (
-            JournalEntry.objects.filter(
-                Q(
-                    journal_entry_items__account__sub_type=(
-                        Account.SubType.UNREALIZED_INVESTMENT_GAINS
-                    )
-                )
-                | Q(journal_entry_items__account__is_depreciation=True)
-            )
-            .filter(journal_entry_items__account__sub_type__in=INVESTING_SUB_TYPES)
-            .distinct()
-            .prefetch_related(
-                Prefetch(
-                    "journal_entry_items",
-                    queryset=JournalEntryItem.objects.select_related("account"),
-                )
-            )
+        suspects = JournalEntry.objects.filter(
+            cash_classification=JournalEntry.CashClassification.MIXED,
+            journal_entry_items__account__sub_type__in=INVESTING_SUB_TYPES,
+        ).distinct()
+        legs = (
+            JournalEntryItem.objects.filter(journal_entry__in=suspects)
+            .select_related("journal_entry", "account")
+            .order_by("journal_entry_id", "id")
         )
 
         self.stdout.write("Suspect JEs (real cash leg dropped by whole-JE exclusion):")
         net_dropped = Decimal("0")
         lines = []
-        for journal_entry in suspects:
-            legs = list(journal_entry.journal_entry_items.all())
-            cash_legs = [
-                leg for leg in legs if leg.account.sub_type == Account.SubType.CASH
-            ]
-            if not cash_legs:
-                continue
-            lines.append(self._describe(journal_entry))
-            lines.extend(self._describe_leg(leg) for leg in legs)
-            net_dropped += sum(
-                (leg.get_signed_amount() for leg in cash_legs), Decimal("0")
-            )
+        journal_entry = None
+        for leg in legs:
+            if leg.journal_entry != journal_entry:
+                journal_entry = leg.journal_entry
+                lines.append(self._describe(journal_entry))
+            lines.append(self._describe_leg(leg))
+            if leg.account.sub_type == Account.SubType.CASH:
+                net_dropped += leg.get_signed_amount()
 
         for line in lines or ["  (none)"]:
             self.stdout.write(line)
@@ -198,6 +314,35 @@ class Command(BaseCommand):
                     self.stdout.write(f"      {d_start}: {d_res}")
                     self._dump_day(d_start)
 
+    def _localize_in_batch(self) -> None:
+        """Report every flagged day, under its year and month residuals."""
+        residuals = DailyResiduals()
+        flagged_days = residuals.get_flagged_days()
+        if not flagged_days:
+            self.stdout.write("No day carries a residual.")
+            return
+
+        self.stdout.write(
+            "Flagged days (cash_delta - net_cash_flow - change in starting "
+            "equity):"
+        )
+        year = month = None
+        for day, residual in flagged_days:
+            if day.year != year:
+                year, month = day.year, None
+                self.stdout.write(
+                    f"  {year}: "
+                    f"{residuals.get(*next(_year_bounds(day, day)))}"
+                )
+            if day.month != month:
+                month = day.month
+                self.stdout.write(
+                    f"    {day:%Y-%m}: "
+                    f"{residuals.get(*next(_month_bounds(day, day)))}"
+                )
+            self.stdout.write(f"      {day}: {residual}")
+            self._dump_day(day)
+
     def _dump_day(self, day: datetime.date) -> None:
         entries = (
             JournalEntry.objects.filter(date=day)
@@ -0,0 +1,67 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction as db_transaction
+
+from api.models import AccountBalanceSnapshot, JournalEntryItem
+
+
+def _keyed_totals(snapshots):
+    """{(account_id, entity_id, month): (debits, credits)}, merging duplicates."""
+    totals = defaultdict(lambda: (0, 0))
+    for snapshot in snapshots:
+        key = (snapshot.account_id, snapshot.entity_id, snapshot.month)
+        debits, credits = totals[key]
+        totals[key] = (debits + snapshot.debit_total, credits + snapshot.credit_total)
+    return totals
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the monthly account-balance snapshot from journal entry items, "
+        "or with --verify, compare the stored snapshot against a full recompute "
+        "and report every cell that has drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare only; write nothing. Exits non-zero on any drift.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["verify"]:
+            with db_transaction.atomic():
+                created = AccountBalanceSnapshot.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt {len(created)} snapshot rows.")
+            )
+            return
+
+        stored = _keyed_totals(AccountBalanceSnapshot.objects.all())
+        expected = _keyed_totals(
+            AccountBalanceSnapshot.compute(JournalEntryItem.objects.all())
+        )
+
+        drifted = []
+        for key in sorted(
+            set(stored) | set(expected), key=lambda k: (k[2], k[0], k[1] or 0)
+        ):
+            if stored.get(key, (0, 0)) != expected.get(key, (0, 0)):
+                drifted.append(key)
+                account_id, entity_id, month = key
+                self.stdout.write(
+                    f"  {month:%Y-%m} account={account_id} entity={entity_id}: "
+                    f"stored {stored.get(key, (0, 0))} != "
+                    f"expected {expected.get(key, (0, 0))}"
+                )
+
+        if drifted:
+            raise CommandError(
+                f"{len(drifted)} snapshot cells have drifted from the ledger. "
+                "Run rebuild_balance_snapshots without --verify to repair them."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Snapshot matches the ledger ({len(expected)} cells).")
+        )
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction as db_transaction
 
-from api.models import Account
+from api.models import Account, LedgerVersion
 
 # Old 4-digit account-number prefix -> new prefix. The command rewrites only the
 # numeric prefix in each Account.name and preserves the label after the first
@@ -197,6 +197,9 @@ class Command(BaseCommand):
             for account, new_name in changed:
                 account.name = new_name
             Account.objects.bulk_update(accounts, ["name"])
+            # bulk_update skips the post_save signal that would invalidate
+            # cached statements, which show account names.
+            LedgerVersion.bump()
 
         self.stdout.write(
             self.style.SUCCESS(
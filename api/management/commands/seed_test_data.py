@@ -27,6 +27,7 @@ from api.models import (
     Prefill,
     S3File,
     Transaction,
+    defer_ledger_refresh,
 )
 
 
@@ -50,10 +51,12 @@ class Command(BaseCommand):
         months = options['months']
         clear = options['clear']
 
+        # Item writes refresh the derived ledger state once, not per row.
         if clear:
-            self._clear_data()
+            with defer_ledger_refresh():
+                self._clear_data()
 
-        with db_transaction.atomic():
+        with db_transaction.atomic(), defer_ledger_refresh():
             self._create_test_user()
             entities = self._create_entities()
             accounts = self._create_accounts(entities)
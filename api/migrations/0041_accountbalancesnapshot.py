@@ -0,0 +1,71 @@
+# Generated by Django 6.0.6 on 2026-10-17 06:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, DecimalField, Sum, Value, When
+from django.db.models.functions import TruncMonth
+
+
+def build_snapshots(apps, schema_editor):
+    # Mirrors AccountBalanceSnapshot.rebuild() against the historical models.
+    AccountBalanceSnapshot = apps.get_model("api", "AccountBalanceSnapshot")
+    JournalEntryItem = apps.get_model("api", "JournalEntryItem")
+
+    aggregates = (
+        JournalEntryItem.objects.annotate(month=TruncMonth("journal_entry__date"))
+        .values("account", "entity", "month")
+        .annotate(
+            debit_total=Sum(
+                Case(
+                    When(type="debit", then="amount"),
+                    output_field=DecimalField(),
+                    default=Value(0),
+                )
+            ),
+            credit_total=Sum(
+                Case(
+                    When(type="credit", then="amount"),
+                    output_field=DecimalField(),
+                    default=Value(0),
+                )
+            ),
+        )
+        .order_by()
+    )
+    AccountBalanceSnapshot.objects.bulk_create(
+        [
+            AccountBalanceSnapshot(
+                account_id=aggregate["account"],
+                entity_id=aggregate["entity"],
+                month=aggregate["month"],
+                debit_total=aggregate["debit_total"],
+                credit_total=aggregate["credit_total"],
+            )
+            for aggregate in aggregates
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0040_delete_prefillitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountBalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_snapshots', to='api.account')),
+                ('entity', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.entity')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['month', 'account'], name='snapshot_month_account_idx')],
+            },
+        ),
+        migrations.RunPython(build_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.6 on 2026-10-17 06:42
+
+from django.db import migrations, models
+from django.db.models import Case, Exists, OuterRef, Value, When
+
+
+def classify_journal_entries(apps, schema_editor):
+    # Mirrors JournalEntry.classify() against the historical models.
+    JournalEntry = apps.get_model("api", "JournalEntry")
+    JournalEntryItem = apps.get_model("api", "JournalEntryItem")
+
+    legs = JournalEntryItem.objects.filter(journal_entry=OuterRef("pk"))
+    mark = Exists(legs.filter(account__sub_type="unrealized_investment_gains"))
+    depreciation = Exists(legs.filter(account__is_depreciation=True))
+    cash = Exists(legs.filter(account__sub_type="cash"))
+    JournalEntry.objects.update(
+        cash_classification=Case(
+            When((mark | depreciation) & cash, then=Value("mixed")),
+            When(mark, then=Value("non_cash_mark")),
+            When(depreciation, then=Value("depreciation")),
+            default=Value("cash"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0042_ledgerversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='cash_classification',
+            field=models.CharField(choices=[('cash', 'Cash'), ('non_cash_mark', 'Non-cash Mark'), ('depreciation', 'Depreciation'), ('mixed', 'Mixed')], default='cash', max_length=20),
+        ),
+        migrations.RunPython(classify_journal_entries, migrations.RunPython.noop),
+    ]
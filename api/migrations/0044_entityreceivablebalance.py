@@ -0,0 +1,70 @@
+# Generated by Django 6.0.6 on 2026-10-17 06:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, DecimalField, Max, Sum, Value, When
+
+
+def build_receivable_balances(apps, schema_editor):
+    # Mirrors EntityReceivableBalance.rebuild() against the historical models.
+    EntityReceivableBalance = apps.get_model("api", "EntityReceivableBalance")
+    JournalEntryItem = apps.get_model("api", "JournalEntryItem")
+
+    def total(entry_type):
+        return Sum(
+            Case(
+                When(type=entry_type, then="amount"),
+                output_field=DecimalField(),
+                default=Value(0),
+            )
+        )
+
+    aggregates = (
+        JournalEntryItem.objects.filter(
+            account__sub_type="accounts_receivable", entity__isnull=False
+        )
+        .values("account", "entity")
+        .annotate(
+            debit_total=total("debit"),
+            credit_total=total("credit"),
+            last_activity_date=Max("journal_entry__date"),
+        )
+        .order_by()
+    )
+    EntityReceivableBalance.objects.bulk_create(
+        [
+            EntityReceivableBalance(
+                account_id=aggregate["account"],
+                entity_id=aggregate["entity"],
+                debit_total=aggregate["debit_total"],
+                credit_total=aggregate["credit_total"],
+                last_activity_date=aggregate["last_activity_date"],
+            )
+            for aggregate in aggregates
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0043_journalentry_cash_classification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntityReceivableBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('last_activity_date', models.DateField()),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receivable_balances', to='api.account')),
+                ('entity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receivable_balances', to='api.entity')),
+            ],
+            options={
+                'unique_together': {('account', 'entity')},
+            },
+        ),
+        migrations.RunPython(build_receivable_balances, migrations.RunPython.noop),
+    ]
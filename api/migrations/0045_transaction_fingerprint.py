@@ -0,0 +1,65 @@
+# Generated by Django 6.0.6 on 2026-10-17 07:16
+
+import hashlib
+import re
+from collections import Counter
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def fingerprint(transaction, ordinal):
+    # Mirrors Transaction.get_fingerprint().
+    key = "|".join(
+        [
+            str(transaction.account_id),
+            transaction.date.isoformat(),
+            f"{Decimal(transaction.amount):.2f}",
+            re.sub(" +", " ", transaction.description.strip().lower()),
+            str(ordinal),
+        ]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def fingerprint_existing_transactions(apps, schema_editor):
+    # Existing rows get fingerprints so the first re-upload after this change
+    # is deduplicated too; repeats are numbered in creation order.
+    Transaction = apps.get_model("api", "Transaction")
+    occurrences = Counter()
+    batch = []
+    for transaction in Transaction.objects.order_by("pk").only(
+        "account_id", "date", "amount", "description"
+    ).iterator(chunk_size=2000):
+        first_fingerprint = fingerprint(transaction, 0)
+        transaction.fingerprint = fingerprint(
+            transaction, occurrences[first_fingerprint]
+        )
+        occurrences[first_fingerprint] += 1
+        batch.append(transaction)
+        if len(batch) == 2000:
+            Transaction.objects.bulk_update(batch, ["fingerprint"])
+            batch = []
+    Transaction.objects.bulk_update(batch, ["fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0044_entityreceivablebalance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['fingerprint'], name='fingerprint_idx'),
+        ),
+        migrations.RunPython(
+            fingerprint_existing_transactions, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.6 on 2026-10-17 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0046_transactionimport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='autotag',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,12 +1,33 @@
 import calendar
 import datetime
+import hashlib
 import math
 import re
+import threading
+import uuid
+from collections import Counter, deque, namedtuple
+from contextlib import contextmanager
 from decimal import ROUND_HALF_UP, Decimal
 
-from django.db.models import Q
+from dateutil.relativedelta import relativedelta
+
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    Exists,
+    F,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import TruncMonth
 from django.utils.translation import gettext_lazy as _
 from api.aws_services import (
     clean_and_convert_string_to_decimal,
@@ -335,26 +356,27 @@ class Reconciliation(models.Model):
             gain_loss_entry_type = JournalEntryItem.JournalEntryType.DEBIT
             account_entry_type = JournalEntryItem.JournalEntryType.CREDIT
 
-        journal_entry_items = JournalEntryItem.objects.filter(
-            journal_entry=journal_entry
-        )
-        journal_entry_items.delete()
-
-        JournalEntryItem.objects.create(
-            journal_entry=journal_entry,
-            type=gain_loss_entry_type,
-            amount=abs(delta),
-            account=GAIN_LOSS_ACCOUNT,
-            entity=self.account.entity,
-        )
+        with defer_ledger_refresh():
+            journal_entry_items = JournalEntryItem.objects.filter(
+                journal_entry=journal_entry
+            )
+            journal_entry_items.delete()
+
+            JournalEntryItem.objects.create(
+                journal_entry=journal_entry,
+                type=gain_loss_entry_type,
+                amount=abs(delta),
+                account=GAIN_LOSS_ACCOUNT,
+                entity=self.account.entity,
+            )
 
-        JournalEntryItem.objects.create(
-            journal_entry=journal_entry,
-            type=account_entry_type,
-            amount=abs(delta),
-            account=self.account,
-            entity=self.account.entity,
-        )
+            JournalEntryItem.objects.create(
+                journal_entry=journal_entry,
+                type=account_entry_type,
+                amount=abs(delta),
+                account=self.account,
+                entity=self.account.entity,
+            )
 
         transaction.close()
 
@@ -391,7 +413,28 @@ class TransactionQuerySet(models.QuerySet):
             queryset = queryset.filter(
                 journal_entry__journal_entry_items__account__in=related_accounts
             ).distinct()
-        return queryset.order_by("date", "account", "pk")
+        return queryset.order_by("date", "account__name", "pk")
+
+    def after(self, date, account_id, pk):
+        """Rows after the given position in filter_for_table's (date, account
+        name, pk) order, as an index seek rather than an offset.
+
+        The position's account is compared by name, read with a subquery, so
+        the seek follows the table's order whatever the account ids are.
+        """
+        account_name = Subquery(
+            Account.objects.filter(pk=account_id).values("name")[:1]
+        )
+        return self.filter(
+            Q(date__gt=date)
+            | Q(date=date, account__name__gt=account_name)
+            | Q(date=date, account__name=account_name, pk__gt=pk)
+        )
+
+    def before(self, date, pk):
+        """Rows after the given position in the API's newest-first (-date,
+        -pk) order, as an index seek rather than an offset."""
+        return self.filter(Q(date__lt=date) | Q(date=date, pk__lt=pk))
 
 
 class TransactionManager(models.Manager):
@@ -444,6 +487,8 @@ class Transaction(models.Model):
         blank=True,
         related_name="transactions",
     )
+    # Set on CSV import so re-uploaded rows can be recognised; see get_fingerprint.
+    fingerprint = models.CharField(max_length=64, blank=True, default="", editable=False)
 
     objects = TransactionManager()
 
@@ -454,6 +499,7 @@ class Transaction(models.Model):
             models.Index(fields=["type"], name="type_idx"),
             models.Index(fields=["is_closed"], name="is_closed_idx"),
             models.Index(fields=["linked_transaction"], name="linked_transaction_idx"),
+            models.Index(fields=["fingerprint"], name="fingerprint_idx"),
         ]
 
     def __str__(self):
@@ -467,6 +513,29 @@ class Transaction(models.Model):
             + str(self.amount)
         )
 
+    def delete(self, *args, **kwargs):
+        # The cascade deletes the journal entry's items; refresh derived ledger
+        # state once for all of them.
+        with defer_ledger_refresh():
+            return super().delete(*args, **kwargs)
+
+    def get_fingerprint(self, ordinal=0):
+        """Hash of account, date, amount, normalized description and ``ordinal``.
+
+        ``ordinal`` counts earlier rows with the same values in one import, so
+        two identical purchases on the same day stay distinct.
+        """
+        key = "|".join(
+            [
+                str(self.account_id),
+                self.date.isoformat(),
+                f"{Decimal(self.amount):.2f}",
+                re.sub(" +", " ", self.description.strip().lower()),
+                str(ordinal),
+            ]
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
     def close(self, date=None):
         if not date:
             date = datetime.date.today()
@@ -481,24 +550,44 @@ class Transaction(models.Model):
         self.save()
         transaction.close()
 
+    # The fields apply_autotags sets.
+    AUTOTAG_FIELDS = ["suggested_account", "prefill", "type", "suggested_entity"]
+
     @staticmethod
     def apply_autotags(transactions):
-        all_tags = AutoTag.objects.all()
+        """Applies each transaction's first matching autotag, in place.
+
+        Returns the transactions whose suggestion actually changed, so callers
+        re-tagging saved rows only need to write those.
+        """
+        matcher = AutoTagMatcher.get_current()
+        changed = []
         for transaction in transactions:
-            cleaned_description = re.sub(
-                " +", " ", transaction.description.strip().lower()
+            tag = matcher.match(transaction.description)
+            if tag is None:
+                continue
+            suggestion = (
+                tag.account_id,
+                tag.entity_id,
+                tag.prefill_id,
+                tag.transaction_type or Transaction.TransactionType.PURCHASE,
             )
-
-            for tag in all_tags:
-                if tag.search_string.lower() in cleaned_description:
-                    transaction.suggested_account = tag.account
-                    transaction.suggested_entity = tag.entity
-                    transaction.prefill = tag.prefill
-                    if tag.transaction_type:
-                        transaction.type = tag.transaction_type
-                    else:
-                        transaction.type = Transaction.TransactionType.PURCHASE
-                    break
+            current = (
+                transaction.suggested_account_id,
+                transaction.suggested_entity_id,
+                transaction.prefill_id,
+                transaction.type,
+            )
+            if suggestion == current:
+                continue
+            (
+                transaction.suggested_account_id,
+                transaction.suggested_entity_id,
+                transaction.prefill_id,
+                transaction.type,
+            ) = suggestion
+            changed.append(transaction)
+        return changed
 
 
 class TaxCharge(models.Model):
@@ -545,23 +634,23 @@ class TaxCharge(models.Model):
             journal_entry = JournalEntry.objects.create(
                 date=self.date, transaction=self.transaction
             )
-        journal_entry.delete_journal_entry_items()
-
         tax_payable_account = self.account.tax_payable_account
-        JournalEntryItem.objects.create(
-            journal_entry=journal_entry,
-            type=JournalEntryItem.JournalEntryType.DEBIT,
-            amount=self.transaction.amount,
-            account=self.account,
-            entity=self.account.entity,
-        )
-        JournalEntryItem.objects.create(
-            journal_entry=journal_entry,
-            type=JournalEntryItem.JournalEntryType.CREDIT,
-            amount=self.transaction.amount,
-            account=tax_payable_account,
-            entity=tax_payable_account.entity,
-        )
+        with defer_ledger_refresh():
+            journal_entry.delete_journal_entry_items()
+            JournalEntryItem.objects.create(
+                journal_entry=journal_entry,
+                type=JournalEntryItem.JournalEntryType.DEBIT,
+                amount=self.transaction.amount,
+                account=self.account,
+                entity=self.account.entity,
+            )
+            JournalEntryItem.objects.create(
+                journal_entry=journal_entry,
+                type=JournalEntryItem.JournalEntryType.CREDIT,
+                amount=self.transaction.amount,
+                account=tax_payable_account,
+                entity=tax_payable_account.entity,
+            )
 
         # Update the Reconciliation per the new tax amount
         liability_balance = tax_payable_account.get_balance(self.date)
@@ -772,40 +861,64 @@ class Account(models.Model):
             return credits - debits
 
     def get_balance(self, end_date, start_date=None):
-        INCOME_STATEMENT_ACCOUNT_TYPES = ["income", "expense"]
-
-        journal_entry_items = JournalEntryItem.objects.filter(
-            journal_entry__date__lte=end_date, account=self
-        )
+        return Account.get_balances([self], end_date, start_date)[self]
 
-        if self.type in INCOME_STATEMENT_ACCOUNT_TYPES:
-            journal_entry_items = journal_entry_items.filter(
-                journal_entry__date__gte=start_date,
-            )
-
-        debits = 0
-        credits = 0
-        for journal_entry_item in journal_entry_items:
-            amount = journal_entry_item.amount
+    @staticmethod
+    def get_balances(accounts, end_date, start_date=None):
+        """{account: balance} for `accounts`, from one grouped aggregate.
 
-            journal_entry_type = JournalEntryItem.JournalEntryType.DEBIT
-            if journal_entry_item.type == journal_entry_type:
-                debits += amount
-            else:
-                credits += amount
+        Balance-sheet accounts sum everything up to `end_date`; income and
+        expense accounts only from `start_date` on.
+        """
+        INCOME_STATEMENT_ACCOUNT_TYPES = ["income", "expense"]
 
-        return Account.get_balance_from_debit_and_credit(
-            account_type=self.type, debits=debits, credits=credits
+        window = Q(journal_entry__date__lte=end_date)
+        if start_date is not None:
+            window &= ~Q(account__type__in=INCOME_STATEMENT_ACCOUNT_TYPES) | Q(
+                journal_entry__date__gte=start_date
+            )
+        aggregates = (
+            JournalEntryItem.objects.filter(window, account__in=accounts)
+            .values("account")
+            .annotate(**debit_credit_total_annotations())
+            .order_by()
         )
+        totals = {
+            aggregate["account"]: (aggregate["debit_total"], aggregate["credit_total"])
+            for aggregate in aggregates
+        }
+
+        balances = {}
+        for account in accounts:
+            debits, credits = totals.get(account.pk, (0, 0))
+            balances[account] = Account.get_balance_from_debit_and_credit(
+                account_type=account.type, debits=debits, credits=credits
+            )
+        return balances
 
 
 class JournalEntry(models.Model):
+    class CashClassification(models.TextChoices):
+        # Whether the entry's investing legs moved cash. A mark or depreciation
+        # leg makes the whole entry non-cash; "mixed" entries also carry a real
+        # cash leg, which the cash flow statement currently drops with them.
+        CASH = "cash", _("Cash")
+        NON_CASH_MARK = "non_cash_mark", _("Non-cash Mark")
+        DEPRECIATION = "depreciation", _("Depreciation")
+        MIXED = "mixed", _("Mixed")
+
     date = models.DateField()
     description = models.CharField(max_length=200, blank=True)
     transaction = models.OneToOneField(
         "Transaction", related_name="journal_entry", on_delete=models.CASCADE
     )
     created_by = models.CharField(max_length=100, default="user")
+    # Derived from the legs; kept current by classify() (see api.signals).
+    cash_classification = models.CharField(
+        max_length=20,
+        choices=CashClassification.choices,
+        default=CashClassification.CASH,
+    )
 
     class Meta:
         verbose_name_plural = "journal entries"
@@ -817,11 +930,56 @@ class JournalEntry(models.Model):
         self.transaction.is_closed = False
         self.transaction.date_closed = None
         self.transaction.save()
-        super().delete(*args, **kwargs)
+        with defer_ledger_refresh():
+            super().delete(*args, **kwargs)
 
     def delete_journal_entry_items(self):
         journal_entry_items = JournalEntryItem.objects.filter(journal_entry=self)
-        journal_entry_items.delete()
+        with defer_ledger_refresh():
+            journal_entry_items.delete()
+
+    @classmethod
+    def classify(cls, journal_entries):
+        """Recompute cash_classification for a queryset of entries, in one UPDATE.
+
+        An unrealized-gain leg takes precedence over a depreciation leg; either
+        alongside a cash leg makes the entry mixed.
+        """
+        legs = JournalEntryItem.objects.filter(journal_entry=OuterRef("pk"))
+        mark = Exists(
+            legs.filter(account__sub_type=Account.SubType.UNREALIZED_INVESTMENT_GAINS)
+        )
+        depreciation = Exists(legs.filter(account__is_depreciation=True))
+        cash = Exists(legs.filter(account__sub_type=Account.SubType.CASH))
+        classification = cls.CashClassification
+        return journal_entries.update(
+            cash_classification=Case(
+                When((mark | depreciation) & cash, then=Value(classification.MIXED)),
+                When(mark, then=Value(classification.NON_CASH_MARK)),
+                When(depreciation, then=Value(classification.DEPRECIATION)),
+                default=Value(classification.CASH),
+            )
+        )
+
+
+def debit_credit_total_annotations():
+    """Aggregation kwargs summing a queryset's amounts into debit/credit totals."""
+    return {
+        "debit_total": Sum(
+            Case(
+                When(type="debit", then="amount"),
+                output_field=DecimalField(),
+                default=Value(0),
+            )
+        ),
+        "credit_total": Sum(
+            Case(
+                When(type="credit", then="amount"),
+                output_field=DecimalField(),
+                default=Value(0),
+            )
+        ),
+    }
 
 
 class JournalEntryItemQuerySet(models.QuerySet):
@@ -922,6 +1080,440 @@ class JournalEntryItem(models.Model):
         )
 
 
+class AccountBalanceSnapshot(models.Model):
+    """Materialized debit/credit totals for one (account, entity, month).
+
+    Statements read whole months from here and only sum the partial months at
+    either end of their window from raw JournalEntryItem rows, so their cost
+    stops growing with ledger history. Rows are derived data: ``refresh``
+    recomputes the cells a write touched (see api.signals for the per-item
+    hooks; bulk writers call it directly) and the ``rebuild_balance_snapshots``
+    command rebuilds or verifies the whole table.
+    """
+
+    account = models.ForeignKey(
+        "Account", on_delete=models.CASCADE, related_name="balance_snapshots"
+    )
+    # SET_NULL, like JournalEntryItem.entity, so deleting an entity keeps the
+    # totals; the next refresh of the cell folds the rows back together.
+    entity = models.ForeignKey(
+        "Entity", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    month = models.DateField()  # first day of the month
+    debit_total = models.DecimalField(decimal_places=2, max_digits=14, default=0)
+    credit_total = models.DecimalField(decimal_places=2, max_digits=14, default=0)
+
+    # Months recomputed per query by refresh(); keeps a bulk write spanning
+    # years well inside SQLite's expression-depth limit.
+    REFRESH_MONTHS_PER_QUERY = 100
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["month", "account"], name="snapshot_month_account_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.account.name}"
+
+    @staticmethod
+    def get_month_start(date):
+        if isinstance(date, str):
+            date = datetime.datetime.strptime(date, "%Y-%m-%d").date()
+        return date + relativedelta(day=1)
+
+    @staticmethod
+    def get_account_months(journal_entry_items):
+        """The (account_id, month) cells a set of items contributes to."""
+        return {
+            (account_id, AccountBalanceSnapshot.get_month_start(date))
+            for account_id, date in journal_entry_items.values_list(
+                "account_id", "journal_entry__date"
+            ).distinct()
+        }
+
+    @classmethod
+    def compute(cls, journal_entry_items):
+        """Unsaved snapshot rows summarizing ``journal_entry_items``."""
+        aggregates = (
+            journal_entry_items.annotate(month=TruncMonth("journal_entry__date"))
+            .values("account", "entity", "month")
+            .annotate(**debit_credit_total_annotations())
+            .order_by()
+        )
+        return [
+            cls(
+                account_id=aggregate["account"],
+                entity_id=aggregate["entity"],
+                month=aggregate["month"],
+                debit_total=aggregate["debit_total"],
+                credit_total=aggregate["credit_total"],
+            )
+            for aggregate in aggregates
+        ]
+
+    @classmethod
+    def refresh(cls, account_months):
+        """Recompute the given (account_id, date) cells from raw items.
+
+        Dates are folded to their month, so callers can pass item dates as-is.
+        Recomputing (rather than applying deltas) keeps a refresh correct no
+        matter how the items changed.
+        """
+        accounts_by_month = {}
+        for account_id, date in account_months:
+            accounts_by_month.setdefault(cls.get_month_start(date), set()).add(
+                account_id
+            )
+
+        months = sorted(accounts_by_month)
+        # (account_id, entity_id) pairs whose totals in some cell changed.
+        changed_account_entities = set()
+        for i in range(0, len(months), cls.REFRESH_MONTHS_PER_QUERY):
+            snapshot_filter = Q()
+            item_filter = Q()
+            for month in months[i : i + cls.REFRESH_MONTHS_PER_QUERY]:
+                account_ids = accounts_by_month[month]
+                snapshot_filter |= Q(month=month, account_id__in=account_ids)
+                item_filter |= Q(
+                    account_id__in=account_ids,
+                    journal_entry__date__gte=month,
+                    journal_entry__date__lte=month + relativedelta(day=31),
+                )
+            previous = {
+                (account_id, entity_id, month): (debit_total, credit_total)
+                for account_id, entity_id, month, debit_total, credit_total in (
+                    cls.objects.filter(snapshot_filter).values_list(
+                        "account_id", "entity_id", "month", "debit_total", "credit_total"
+                    )
+                )
+            }
+            cls.objects.filter(snapshot_filter).delete()
+            snapshots = cls.objects.bulk_create(
+                cls.compute(JournalEntryItem.objects.filter(item_filter))
+            )
+            for snapshot in snapshots:
+                key = (snapshot.account_id, snapshot.entity_id, snapshot.month)
+                if previous.pop(key, None) != (
+                    snapshot.debit_total,
+                    snapshot.credit_total,
+                ):
+                    changed_account_entities.add(key[:2])
+            # Whatever is left had its last item in the cell removed.
+            changed_account_entities.update(key[:2] for key in previous)
+        # Every journal entry item write funnels through here, so this is where
+        # cached statements learn the ledger moved and receivables catch up.
+        EntityReceivableBalance.refresh(changed_account_entities)
+        LedgerVersion.bump()
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """Add {(account_id, entity_id, date): (debits, credits)} to their cells.
+
+        The single-item counterpart of refresh(): one UPDATE per changed cell
+        rather than a recompute. A cell a removal empties keeps a zero row,
+        which reads (and verifies) the same as no row.
+        """
+        changed_account_entities = set()
+        for (account_id, entity_id, date), (debits, credits) in deltas.items():
+            if not debits and not credits:
+                continue
+            month = cls.get_month_start(date)
+            updated = cls.objects.filter(
+                account_id=account_id, entity_id=entity_id, month=month
+            ).update(
+                debit_total=F("debit_total") + debits,
+                credit_total=F("credit_total") + credits,
+            )
+            if not updated:
+                cls.objects.create(
+                    account_id=account_id,
+                    entity_id=entity_id,
+                    month=month,
+                    debit_total=debits,
+                    credit_total=credits,
+                )
+            changed_account_entities.add((account_id, entity_id))
+        EntityReceivableBalance.refresh(changed_account_entities)
+        LedgerVersion.bump()
+
+    @classmethod
+    def rebuild(cls):
+        cls.objects.all().delete()
+        snapshots = cls.objects.bulk_create(
+            cls.compute(JournalEntryItem.objects.all())
+        )
+        EntityReceivableBalance.rebuild()
+        LedgerVersion.bump()
+        return snapshots
+
+    @staticmethod
+    def _add_totals(totals, aggregates):
+        for aggregate in aggregates:
+            debits, credits = totals.get(aggregate["account"], (0, 0))
+            totals[aggregate["account"]] = (
+                debits + aggregate["debit_total"],
+                credits + aggregate["credit_total"],
+            )
+
+    @classmethod
+    def get_totals(cls, account_types, end_date, start_date=None):
+        """{account_id: (debits, credits)} for items dated within the window.
+
+        Whole months come from the snapshot; the partial months at either end
+        are summed from raw items. ``start_date=None`` means the beginning of
+        the ledger, as a balance sheet needs.
+        """
+        if isinstance(end_date, str):
+            end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
+        if isinstance(start_date, str):
+            start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
+
+        if start_date is None or start_date.day == 1:
+            first_full_month = start_date
+        else:
+            first_full_month = cls.get_month_start(start_date) + relativedelta(
+                months=1
+            )
+        last_full_month_end = end_date
+        if end_date != end_date + relativedelta(day=31):
+            last_full_month_end = cls.get_month_start(end_date) - datetime.timedelta(
+                days=1
+            )
+
+        totals = {}
+        raw_windows = []
+        if first_full_month is not None and first_full_month > last_full_month_end:
+            # No whole month in the window: sum it all from raw items.
+            raw_windows.append((start_date, end_date))
+        else:
+            snapshots = cls.objects.filter(
+                account__type__in=account_types,
+                month__lte=cls.get_month_start(last_full_month_end),
+            )
+            if first_full_month is not None:
+                snapshots = snapshots.filter(month__gte=first_full_month)
+                if start_date < first_full_month:
+                    raw_windows.append(
+                        (start_date, first_full_month - datetime.timedelta(days=1))
+                    )
+            if last_full_month_end < end_date:
+                raw_windows.append(
+                    (last_full_month_end + datetime.timedelta(days=1), end_date)
+                )
+            cls._add_totals(
+                totals,
+                snapshots.values("account")
+                .annotate(
+                    debit_total=Sum("debit_total"), credit_total=Sum("credit_total")
+                )
+                .order_by(),
+            )
+
+        if raw_windows:
+            raw_filter = Q()
+            for window_start, window_end in raw_windows:
+                raw_filter |= Q(
+                    journal_entry__date__gte=window_start,
+                    journal_entry__date__lte=window_end,
+                )
+            cls._add_totals(
+                totals,
+                JournalEntryItem.objects.filter(
+                    raw_filter, account__type__in=account_types
+                )
+                .values("account")
+                .annotate(**debit_credit_total_annotations())
+                .order_by(),
+            )
+        return totals
+
+
+class EntityReceivableBalance(models.Model):
+    """Running receivable totals for one (account, entity).
+
+    Backs the receivables tab, which would otherwise re-aggregate every
+    accounts-receivable item on each load. Rows are derived data, kept current
+    by ``AccountBalanceSnapshot.refresh`` for the (account, entity) pairs whose
+    totals a write changed, and rebuilt with the snapshot.
+    """
+
+    account = models.ForeignKey(
+        "Account", on_delete=models.CASCADE, related_name="receivable_balances"
+    )
+    # Untagging an item (including via the entity's deletion) drops it from
+    # the receivables tab, so the row goes with the entity.
+    entity = models.ForeignKey(
+        "Entity", on_delete=models.CASCADE, related_name="receivable_balances"
+    )
+    debit_total = models.DecimalField(decimal_places=2, max_digits=14, default=0)
+    credit_total = models.DecimalField(decimal_places=2, max_digits=14, default=0)
+    last_activity_date = models.DateField()
+
+    class Meta:
+        unique_together = [["account", "entity"]]
+
+    def __str__(self):
+        return f"{self.account.name} {self.entity.name}"
+
+    @property
+    def balance(self):
+        return self.credit_total - self.debit_total
+
+    @classmethod
+    def compute(cls, journal_entry_items):
+        """Unsaved rows summarizing the tagged receivable ``journal_entry_items``."""
+        aggregates = (
+            journal_entry_items.filter(
+                account__sub_type=Account.SubType.ACCOUNTS_RECEIVABLE,
+                entity__isnull=False,
+            )
+            .values("account", "entity")
+            .annotate(
+                **debit_credit_total_annotations(),
+                last_activity_date=Max("journal_entry__date"),
+            )
+            .order_by()
+        )
+        return [
+            cls(
+                account_id=aggregate["account"],
+                entity_id=aggregate["entity"],
+                debit_total=aggregate["debit_total"],
+                credit_total=aggregate["credit_total"],
+                last_activity_date=aggregate["last_activity_date"],
+            )
+            for aggregate in aggregates
+        ]
+
+    @classmethod
+    def refresh(cls, account_entities):
+        """Recompute the rows of the given (account_id, entity_id) pairs.
+
+        Pairs on accounts that are not receivables, or without an entity, are
+        ignored, so callers can pass every pair a write touched.
+        """
+        entities_by_account = {}
+        for account_id, entity_id in account_entities:
+            if entity_id is not None:
+                entities_by_account.setdefault(account_id, set()).add(entity_id)
+        receivable_ids = Account.objects.filter(
+            pk__in=entities_by_account, sub_type=Account.SubType.ACCOUNTS_RECEIVABLE
+        ).values_list("pk", flat=True)
+        pair_filter = Q()
+        for account_id in receivable_ids:
+            pair_filter |= Q(
+                account_id=account_id, entity_id__in=entities_by_account[account_id]
+            )
+        if not pair_filter:
+            return
+        cls.objects.filter(pair_filter).delete()
+        cls.objects.bulk_create(
+            cls.compute(JournalEntryItem.objects.filter(pair_filter))
+        )
+
+    @classmethod
+    def rebuild(cls):
+        cls.objects.all().delete()
+        return cls.objects.bulk_create(cls.compute(JournalEntryItem.objects.all()))
+
+
+class LedgerVersion(models.Model):
+    """A token that changes whenever anything a statement reads changes.
+
+    Cached statements are keyed on it (see api.statement.StatementCache), so a
+    write makes every cached result unreachable without having to find and
+    evict them. It is a random token rather than a counter: a rolled-back write
+    restores the previous token along with the previous data, where a counter
+    could hand the same number to two different ledgers.
+    """
+
+    token = models.UUIDField(default=uuid.uuid4)
+
+    # The table holds a single row.
+    SINGLETON_ID = 1
+
+    @classmethod
+    def get_current(cls):
+        """The current token; ``"initial"`` before the first write."""
+        token = (
+            cls.objects.filter(pk=cls.SINGLETON_ID)
+            .values_list("token", flat=True)
+            .first()
+        )
+        return str(token) if token is not None else "initial"
+
+    @classmethod
+    def bump(cls):
+        # Runs on every ledger write, so one UPDATE; the row is created once.
+        token = uuid.uuid4()
+        if not cls.objects.filter(pk=cls.SINGLETON_ID).update(token=token):
+            cls.objects.create(pk=cls.SINGLETON_ID, token=token)
+
+
+_deferred = threading.local()
+
+
+class DeferredRefresh:
+    """The cells and entries item writes touched inside defer_ledger_refresh()."""
+
+    def __init__(self):
+        self.account_months = set()
+        self.journal_entry_ids = set()
+        # (account_id, journal_entry_id) of deleted items, dated on exit.
+        self.deleted_items = set()
+        # Dates of entries deleted in the block, which a lookup can't find.
+        self.deleted_entry_dates = {}
+
+    def add(self, account_months=(), journal_entry_ids=()):
+        """Also refresh cells and entries written without signals."""
+        self.account_months.update(account_months)
+        self.journal_entry_ids.update(journal_entry_ids)
+
+    def flush(self):
+        entry_dates = dict(
+            JournalEntry.objects.filter(
+                pk__in={entry_id for _, entry_id in self.deleted_items}
+            ).values_list("pk", "date")
+        )
+        entry_dates.update(self.deleted_entry_dates)
+        self.account_months.update(
+            (account_id, entry_dates[entry_id])
+            for account_id, entry_id in self.deleted_items
+        )
+        # Classify first: the refresh bumps the ledger version.
+        if self.journal_entry_ids:
+            JournalEntry.classify(
+                JournalEntry.objects.filter(pk__in=self.journal_entry_ids)
+            )
+        if self.account_months:
+            AccountBalanceSnapshot.refresh(self.account_months)
+
+
+@contextmanager
+def defer_ledger_refresh():
+    """Refresh derived ledger state once for every item write in the block.
+
+    Yields a DeferredRefresh; callers add the cells of their bulk writes to it
+    so those share the one refresh. Nested blocks join the outermost one, and
+    nothing is refreshed if the block raises.
+    """
+    pending = getattr(_deferred, "pending", None)
+    if pending is not None:
+        yield pending
+        return
+    pending = _deferred.pending = DeferredRefresh()
+    try:
+        yield pending
+    finally:
+        _deferred.pending = None
+    pending.flush()
+
+
+def get_deferred_refresh():
+    """The DeferredRefresh collecting item writes, or None outside a block."""
+    return getattr(_deferred, "pending", None)
+
+
 class AutoTag(models.Model):
     search_string = models.CharField(max_length=20)
     account = models.ForeignKey(
@@ -936,11 +1528,108 @@ class AutoTag(models.Model):
     entity = models.ForeignKey(
         "Entity", on_delete=models.CASCADE, null=True, blank=True
     )
+    # Lets AutoTagMatcher.get_current spot an edited tag without reading them all.
+    updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return '"' + self.search_string + '": ' + str(self.account)
 
 
+AutoTagRule = namedtuple(
+    "AutoTagRule",
+    ["pk", "search_string", "account_id", "transaction_type", "prefill_id", "entity_id"],
+)
+
+
+class AutoTagMatcher:
+    """Every AutoTag search string compiled into one Aho-Corasick automaton.
+
+    ``match`` scans a description once, however many tags there are, and
+    returns the tag a loop over the tags in pk order would have stopped at:
+    the earliest one whose search string occurs in the description.
+    """
+
+    # (table state, matcher) for the rules last compiled in this process.
+    _cached = None
+
+    def __init__(self, rules):
+        self.rules = rules
+        # State 0 is the root. best[state] is the lowest rule index whose
+        # search string ends at that state, directly or via its fail links.
+        self.goto = [{}]
+        self.fail = [0]
+        self.best = [None]
+        for index, rule in enumerate(rules):
+            state = 0
+            for char in rule.search_string.lower():
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.best.append(None)
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            if self.best[state] is None:
+                self.best[state] = index
+
+        # Breadth-first, so a state's fail target is finished before it is.
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.best[state] = self._earliest(
+                self.best[state], self.best[self.fail[state]]
+            )
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                queue.append(child)
+
+    @staticmethod
+    def _earliest(first, second):
+        if first is None:
+            return second
+        if second is None:
+            return first
+        return min(first, second)
+
+    @classmethod
+    def get_current(cls):
+        """The matcher for the current AutoTag table.
+
+        Checking for changes is one aggregate query: the row count, highest pk
+        and latest ``updated`` move whenever an autotag is created, edited or
+        deleted (in any process). Only then are the rules read and the
+        automaton recompiled.
+        """
+        state = AutoTag.objects.aggregate(
+            count=Count("pk"), last_pk=Max("pk"), last_updated=Max("updated")
+        )
+        if cls._cached is None or cls._cached[0] != state:
+            rules = [
+                AutoTagRule(*row)
+                for row in AutoTag.objects.order_by("pk").values_list(
+                    *AutoTagRule._fields
+                )
+            ]
+            cls._cached = (state, cls(rules))
+        return cls._cached[1]
+
+    def match(self, description):
+        """The first matching AutoTagRule for ``description``, or None."""
+        text = re.sub(" +", " ", description.strip().lower())
+        best = self.best[0]
+        state = 0
+        for char in text:
+            if best == 0:
+                break
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            best = self._earliest(best, self.best[state])
+        return self.rules[best] if best is not None else None
+
+
 class Prefill(models.Model):
     name = models.CharField(max_length=200)
     is_closed = models.BooleanField(default=False)
@@ -1059,6 +1748,11 @@ class CSVColumnValuePair(models.Model):
     value = models.CharField(max_length=200)
 
 
+# One imported batch: the created transactions and how many rows were skipped
+# as already imported.
+CSVImportBatch = namedtuple("CSVImportBatch", ["transactions", "skipped"])
+
+
 class CSVProfile(models.Model):
     name = models.CharField(max_length=200)
     date = models.CharField(max_length=200)
@@ -1075,7 +1769,30 @@ class CSVProfile(models.Model):
     def __str__(self):
         return self.name
 
+    # Transactions autotagged and inserted per bulk_create.
+    IMPORT_BATCH_SIZE = 500
+    # Leading rows searched for clear_prepended_until_value; a file without the
+    # marker in them is imported whole.
+    PREPENDED_ROWS_LIMIT = 100
+
     def create_transactions_from_csv(self, csv, account):
+        """Imports ``csv`` (rows of cells) and returns every created transaction."""
+        return [
+            transaction
+            for batch in self.iter_transaction_batches(csv, account)
+            for transaction in batch.transactions
+        ]
+
+    def iter_transaction_batches(self, csv, account, batch_size=None):
+        """Imports ``csv`` in batches, yielding a ``CSVImportBatch`` for each.
+
+        ``csv`` may be any iterable of rows, e.g. a ``csv.reader`` over the
+        upload; rows are consumed lazily, so only one batch is held at a time.
+        Rows whose fingerprint is already stored are skipped, so overlapping
+        exports can be uploaded again.
+        """
+        batch_size = batch_size or self.IMPORT_BATCH_SIZE
+        occurrences = Counter()
         rows_cleaned_csv = self._clear_prepended_rows(csv)
         dict_based_csv = self._list_of_lists_to_list_of_dicts(rows_cleaned_csv)
         cleared_rows_csv = self._clear_extraneous_rows(dict_based_csv)
@@ -1099,16 +1816,44 @@ class CSVProfile(models.Model):
                 prefill=None,  # Default value
                 type=Transaction.TransactionType.PURCHASE,  # Default type
             )
+            first_fingerprint = transaction.get_fingerprint()
+            ordinal = occurrences[first_fingerprint]
+            occurrences[first_fingerprint] += 1
+            transaction.fingerprint = (
+                transaction.get_fingerprint(ordinal) if ordinal else first_fingerprint
+            )
             transactions_list.append(transaction)
+            if len(transactions_list) == batch_size:
+                yield self._create_batch(transactions_list)
+                transactions_list = []
 
-        Transaction.apply_autotags(transactions_list)
-        created = Transaction.objects.bulk_create(transactions_list)
+        if transactions_list:
+            yield self._create_batch(transactions_list)
 
+    @staticmethod
+    def _create_batch(transactions_list):
+        existing = set(
+            Transaction.objects.filter(
+                fingerprint__in=[
+                    transaction.fingerprint for transaction in transactions_list
+                ]
+            ).values_list("fingerprint", flat=True)
+        )
+        new_transactions = [
+            transaction
+            for transaction in transactions_list
+            if transaction.fingerprint not in existing
+        ]
+        if new_transactions:
+            Transaction.apply_autotags(new_transactions)
         # Best-effort bill/loan tagging is applied by the caller (the upload
         # service) via api.services.tagging_services, keeping the models layer
         # free of service imports. Return the created objects so the caller can
         # tag them; callers wanting a count use len(...).
-        return created
+        return CSVImportBatch(
+            Transaction.objects.bulk_create(new_transactions),
+            len(transactions_list) - len(new_transactions),
+        )
 
     def _get_formatted_date(self, date_string):
         # Parse using the profile's input format and return a date object (not a
@@ -1131,32 +1876,40 @@ class CSVProfile(models.Model):
 
     def _clear_prepended_rows(self, csv_data):
         if not self.clear_prepended_until_value:
-            return csv_data
+            yield from csv_data
+            return
 
-        target_row_index = None
-        for i, row in enumerate(csv_data):
+        # Rows are held back only until the marker row shows up. A file
+        # without one in its first PREPENDED_ROWS_LIMIT rows is imported whole,
+        # so at most that many rows are ever held.
+        prepended = []
+        rows = iter(csv_data)
+        for row in rows:
             if self.clear_prepended_until_value in row:
-                target_row_index = i
+                yield row
                 break
-
-        if target_row_index is not None:
-            del csv_data[:target_row_index]
-
-        return csv_data
+            prepended.append(row)
+            if len(prepended) == self.PREPENDED_ROWS_LIMIT:
+                yield from prepended
+                break
+        else:
+            yield from prepended
+        yield from rows
 
     def _list_of_lists_to_list_of_dicts(self, list_of_lists):
-        column_headings = list_of_lists[0]
+        rows = iter(list_of_lists)
+        column_headings = next(rows, None)
+        if column_headings is None:
+            return
         trimmed_headings = [heading.strip() for heading in column_headings]
-        list_of_dicts = [dict(zip(trimmed_headings, row)) for row in list_of_lists[1:]]
-        return list_of_dicts
+        for row in rows:
+            yield dict(zip(trimmed_headings, row))
 
     def _clear_extraneous_rows(self, rows_list):
-        cleaned_rows = []
+        clear_pairs = list(self.clear_values_column_pairs.values_list("column", "value"))
         for row in rows_list:
             include_row = True
-            for key_clear_pair in self.clear_values_column_pairs.all():
-                column_name = key_clear_pair.column
-                clear_out_value = key_clear_pair.value
+            for column_name, clear_out_value in clear_pairs:
                 try:
                     if row[column_name] == clear_out_value:
                         include_row = False
@@ -1164,9 +1917,46 @@ class CSVProfile(models.Model):
                 except KeyError:
                     continue
             if include_row:
-                cleaned_rows.append(row)
+                yield row
+
+
+class TransactionImport(models.Model):
+    """A CSV upload imported in the background by a Celery worker.
+
+    The file is held in S3 between the upload request and the worker; the
+    counts are updated after every batch so the upload page can show progress.
+    """
 
-        return cleaned_rows
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        PROCESSING = "PROCESSING", "Processing"
+        COMPLETE = "COMPLETE", "Complete"
+        FAILED = "FAILED", "Failed"
+
+    account = models.ForeignKey("Account", on_delete=models.CASCADE)
+    user_filename = models.CharField(max_length=200)
+    s3_filename = models.CharField(max_length=200)
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    imported_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True, default="")
+    created = models.DateTimeField(auto_now_add=True)
+    completed = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return self.account.name + " " + self.user_filename
+
+    @property
+    def rows_processed(self):
+        return self.imported_count + self.skipped_count
+
+    @property
+    def is_active(self):
+        return self.status in (self.Status.PENDING, self.Status.PROCESSING)
 
 
 class UtilityBillRule(models.Model):
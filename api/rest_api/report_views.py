@@ -9,17 +9,22 @@ no business logic, and never write. They ride the global DRF API-key auth
 (``APIKeyAuthentication`` + ``IsAuthenticated``), so callers need ``LEDGER_API_KEY``.
 """
 
+import hashlib
+from abc import ABC, abstractmethod
 from datetime import date, datetime
 from typing import Optional, Tuple
 
+from django.utils.http import parse_etags
+from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from api import utils
+from api.models import LedgerVersion
 from api.rest_api import report_serializers
 from api.services import statement_services
-from api.statement import BalanceSheet, IncomeStatement, Trend
+from api.statement import statement_cache
 
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -51,15 +56,57 @@ def _date_range(request) -> Tuple[date, date]:
     return from_date, to_date
 
 
-class IncomeReportView(APIView):
+class StatementReportView(ABC, APIView):
+    """Base for reports computed only from the statement engine.
+
+    Such a report is fixed by its URL, the ledger version and (for defaulted
+    date ranges) today's date, so the response carries an ETag built from
+    those. A request whose ``If-None-Match`` still matches gets a 304 after a
+    single version lookup, without touching the statement engine. Subclasses
+    implement ``get_report`` instead of ``get``.
+
+    The detail reports are not conditional: their row labels fall back to
+    transaction descriptions, which the ledger version does not track.
+    """
+
+    def get_etag(self, request) -> str:
+        key = "|".join(
+            [
+                request.path,
+                str(sorted(request.query_params.lists())),
+                LedgerVersion.get_current(),
+                date.today().isoformat(),
+            ]
+        )
+        return f'"{hashlib.sha256(key.encode()).hexdigest()}"'
+
+    def get(self, request):
+        etag = self.get_etag(request)
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        response = self.get_report(request)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+        return response
+
+    @abstractmethod
+    def get_report(self, request):
+        """The report's Response; ``get`` adds the ETag to a 200."""
+
+
+class IncomeReportView(StatementReportView):
     """GET /api/v1/reports/income/ — income statement for a date range.
 
     ``?group_by=entity`` returns the by-entity breakdown instead of by-account.
     """
 
-    def get(self, request):
+    def get_report(self, request):
         from_date, to_date = _date_range(request)
-        income_statement = IncomeStatement(end_date=to_date, start_date=from_date)
+        income_statement = statement_cache.get_income_statement(to_date, from_date)
 
         payload = {
             "from_date": from_date,
@@ -85,12 +132,12 @@ class IncomeReportView(APIView):
         return Response(payload)
 
 
-class BalanceSheetReportView(APIView):
+class BalanceSheetReportView(StatementReportView):
     """GET /api/v1/reports/balance-sheet/ — point-in-time position at to_date."""
 
-    def get(self, request):
+    def get_report(self, request):
         _, to_date = _date_range(request)
-        balance_sheet = BalanceSheet(end_date=to_date)
+        balance_sheet = statement_cache.get_balance_sheet(to_date)
         summary = statement_services.build_statement_summary(balance_sheet)
 
         return Response(
@@ -104,10 +151,10 @@ class BalanceSheetReportView(APIView):
         )
 
 
-class CashFlowReportView(APIView):
+class CashFlowReportView(StatementReportView):
     """GET /api/v1/reports/cash-flow/ — cash flow metrics for a date range."""
 
-    def get(self, request):
+    def get_report(self, request):
         from_date, to_date = _date_range(request)
         metrics = statement_services.calculate_cash_flow_metrics(from_date, to_date)
 
@@ -120,12 +167,12 @@ class CashFlowReportView(APIView):
         )
 
 
-class SpendingByEntityReportView(APIView):
+class SpendingByEntityReportView(StatementReportView):
     """GET /api/v1/reports/spending-by-entity/ — income/expense by entity."""
 
-    def get(self, request):
+    def get_report(self, request):
         from_date, to_date = _date_range(request)
-        income_statement = IncomeStatement(end_date=to_date, start_date=from_date)
+        income_statement = statement_cache.get_income_statement(to_date, from_date)
         summary = statement_services.build_entity_income_summary(income_statement)
 
         return Response(
@@ -137,22 +184,20 @@ class SpendingByEntityReportView(APIView):
         )
 
 
-class TrendReportView(APIView):
+class TrendReportView(StatementReportView):
     """GET /api/v1/reports/trend/ — month-by-month balances for a date range."""
 
-    def get(self, request):
+    def get_report(self, request):
         from_date, to_date = _date_range(request)
         # Trend takes start_date as a string and end_date as a date object.
-        trend = Trend(
-            start_date=utils.format_datetime_to_string(from_date), end_date=to_date
+        balances = statement_cache.get_trend_balances(
+            utils.format_datetime_to_string(from_date), to_date
         )
         return Response(
             {
                 "from_date": from_date,
                 "to_date": to_date,
-                "balances": report_serializers.serialize_trend_balances(
-                    trend.get_balances()
-                ),
+                "balances": report_serializers.serialize_trend_balances(balances),
             }
         )
 
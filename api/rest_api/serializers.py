@@ -1,5 +1,6 @@
 from decimal import Decimal
 
+from django.conf import settings
 from rest_framework import serializers
 
 from api.models import Account, Entity, Transaction
@@ -28,6 +29,38 @@ class TransactionSerializer(serializers.ModelSerializer):
             "journal_entry_id",
         ]
 
+    # Relations each output field reads, so a projection joins only those.
+    RELATED_FIELDS = {
+        "account": "account",
+        "suggested_account": "suggested_account",
+        "suggested_entity": "suggested_entity",
+        "journal_entry_id": "journal_entry",
+    }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def get_columns(cls, fields):
+        """The ``only()`` columns and ``select_related()`` relations that
+        serializing ``fields`` needs."""
+        columns = {"id", "date"}
+        relations = []
+        for name in fields:
+            relation = cls.RELATED_FIELDS.get(name)
+            if relation is None:
+                columns.add(name)
+            elif relation == "journal_entry":
+                relations.append(relation)
+                columns.add("journal_entry__id")
+            else:
+                relations.append(relation)
+                columns.update([relation, f"{relation}__name"])
+        return sorted(columns), relations
+
     def get_suggested_account(self, obj) -> str | None:
         return obj.suggested_account.name if obj.suggested_account else None
 
@@ -39,6 +72,37 @@ class TransactionSerializer(serializers.ModelSerializer):
         return journal_entry.id if journal_entry else None
 
 
+class TransactionListQuerySerializer(serializers.Serializer):
+    """Paging, date-range and projection params for the transaction list."""
+
+    from_date = serializers.DateField(required=False)
+    to_date = serializers.DateField(required=False)
+    cursor = serializers.CharField(required=False)
+    page_size = serializers.IntegerField(
+        required=False, min_value=1, max_value=settings.LEDGER_API_MAX_PAGE_SIZE
+    )
+    include_count = serializers.BooleanField(required=False, allow_null=True, default=None)
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value):
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = set(fields) - set(TransactionSerializer.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown fields: {', '.join(sorted(unknown))}."
+            )
+        return fields
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Output format and filters for the streaming exports."""
+
+    file_format = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    from_date = serializers.DateField(required=False)
+    to_date = serializers.DateField(required=False)
+    account = serializers.CharField(required=False)
+
+
 class AccountSerializer(serializers.ModelSerializer):
     entity = serializers.SerializerMethodField()
 
@@ -12,6 +12,7 @@ from api.rest_api.report_views import (
 from api.rest_api.views import (
     AccountListView,
     EntityListView,
+    ExportView,
     JournalEntryCreateView,
     TransactionListView,
 )
@@ -23,6 +24,7 @@ urlpatterns = [
     path("accounts/", AccountListView.as_view(), name="accounts"),
     path("entities/", EntityListView.as_view(), name="entities"),
     path("journal-entries/", JournalEntryCreateView.as_view(), name="journal-entries"),
+    path("export/<str:export>/", ExportView.as_view(), name="export"),
     # Read-only reporting endpoints (wrap the statement engine).
     path("reports/income/", IncomeReportView.as_view(), name="reports-income"),
     path(
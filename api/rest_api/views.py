@@ -1,6 +1,12 @@
+import base64
+import binascii
+import datetime
 import logging
 
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -11,22 +17,52 @@ from api.rest_api.serializers import (
     AccountSerializer,
     BulkJournalEntryInputSerializer,
     EntitySerializer,
+    ExportQuerySerializer,
     JournalEntryInputSerializer,
+    TransactionListQuerySerializer,
     TransactionSerializer,
 )
+from api.services import export_services
 from api.services.rest_api_services import (
     bulk_create_journal_entries,
     create_journal_entry_from_api,
 )
 
 
+def _encode_cursor(transaction):
+    value = f"{transaction.date.isoformat()}_{transaction.pk}"
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """The (date, pk) an opaque page cursor points after."""
+    try:
+        date_str, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("_")
+        return datetime.date.fromisoformat(date_str), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
 class TransactionListView(APIView):
-    """GET /api/v1/transactions/ — list transactions with optional filters."""
+    """GET /api/v1/transactions/ — list transactions with optional filters.
+
+    Pages newest first with an opaque ``cursor`` (echo back ``next_cursor``),
+    ``page_size`` rows at a time. ``fields`` limits the output, and the joins,
+    to a comma-separated subset; ``include_count=false`` skips the total.
+    """
 
     def get(self, request):
-        queryset = Transaction.objects.select_related(
-            "account", "suggested_account", "suggested_entity"
-        ).order_by("-date")
+        params = TransactionListQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        options = params.validated_data
+
+        fields = options.get("fields") or TransactionSerializer.Meta.fields
+        columns, relations = TransactionSerializer.get_columns(fields)
+        queryset = (
+            Transaction.objects.select_related(*relations)
+            .only(*columns)
+            .order_by("-date", "-pk")
+        )
 
         # Filter by is_closed
         is_closed = request.query_params.get("is_closed")
@@ -49,9 +85,33 @@ class TransactionListView(APIView):
             has_linked = linked.lower() == "true"
             queryset = queryset.filter(linked_transaction__isnull=not has_linked)
 
-        serializer = TransactionSerializer(queryset, many=True)
+        # Filter by date range
+        if "from_date" in options:
+            queryset = queryset.filter(date__gte=options["from_date"])
+        if "to_date" in options:
+            queryset = queryset.filter(date__lte=options["to_date"])
+
+        include_count = options["include_count"]
+        if include_count is None:
+            include_count = settings.LEDGER_API_INCLUDE_COUNT
+        count = queryset.count() if include_count else None
+
+        if "cursor" in options:
+            queryset = queryset.before(*_decode_cursor(options["cursor"]))
+        page_size = options.get("page_size", settings.LEDGER_API_PAGE_SIZE)
+        transactions = list(queryset[: page_size + 1])
+        next_cursor = None
+        if len(transactions) > page_size:
+            transactions = transactions[:page_size]
+            next_cursor = _encode_cursor(transactions[-1])
+
+        serializer = TransactionSerializer(transactions, many=True, fields=fields)
         return Response(
-            {"count": len(serializer.data), "transactions": serializer.data}
+            {
+                "count": count,
+                "next_cursor": next_cursor,
+                "transactions": serializer.data,
+            }
         )
 
 
@@ -91,6 +151,46 @@ class EntityListView(APIView):
         )
 
 
+class ExportView(APIView):
+    """GET /api/v1/export/<export>/ — stream a whole table as NDJSON or CSV.
+
+    ``export`` is transactions, journal-entries or journal-entry-items.
+    ``file_format`` is ndjson (default) or csv; ``from_date``, ``to_date`` and
+    ``account`` (name) filter the rows. The response is written as the rows
+    are read, so large exports run in constant memory.
+    """
+
+    CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+    def get(self, request, export):
+        if export not in export_services.EXPORTS:
+            raise Http404
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        options = params.validated_data
+
+        rows = export_services.iter_export_rows(
+            export,
+            from_date=options.get("from_date"),
+            to_date=options.get("to_date"),
+            account=options.get("account"),
+        )
+        file_format = options["file_format"]
+        if file_format == "csv":
+            _, columns = export_services.EXPORTS[export]
+            content = export_services.iter_csv(rows, columns)
+        else:
+            content = export_services.iter_ndjson(rows)
+
+        response = StreamingHttpResponse(
+            content, content_type=self.CONTENT_TYPES[file_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{export}.{file_format}"'
+        )
+        return response
+
+
 class JournalEntryCreateView(APIView):
     """POST /api/v1/journal-entries/ — create single or bulk journal entries."""
 
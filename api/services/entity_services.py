@@ -11,10 +11,10 @@ from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
 from django.db import transaction as db_transaction
-from django.db.models import Case, Count, DecimalField, F, Max, Q, Sum, Value, When
+from django.db.models import Count, F, Max, Q, Sum
 from django.db.models.functions import Abs
 
-from api.models import Account, Entity, JournalEntryItem
+from api.models import Account, Entity, EntityReceivableBalance, JournalEntryItem
 from api.services import crud
 
 
@@ -64,6 +64,25 @@ class GroupedEntityBalances:
     zero_count: int  # number of $0-balance entities not in rows
 
 
+@dataclass
+class HistoryCursor:
+    """Keyset position in an entity history: the oldest item shown so far and
+    the balance just before it (the next page's closing balance)."""
+    date: date
+    pk: int
+    balance: Decimal
+
+    def encode(self) -> str:
+        return f"{self.date.isoformat()}_{self.pk}_{self.balance}"
+
+    @classmethod
+    def decode(cls, value: str) -> "HistoryCursor":
+        date_str, pk, balance = value.split("_")
+        return cls(
+            date=date.fromisoformat(date_str), pk=int(pk), balance=Decimal(balance)
+        )
+
+
 @dataclass
 class EntityHistoryItem:
     """A journal entry item with its running balance for display."""
@@ -73,57 +92,48 @@ class EntityHistoryItem:
 
 @dataclass
 class EntityHistoryData:
-    """Entity history with all items and running balances."""
+    """Entity history items (all, or one page) with running balances."""
     items: List[EntityHistoryItem]
     entity_id: int
     entity_name: str = ""
     account_name: Optional[str] = None
+    account_id: Optional[int] = None
+    older_cursor: Optional[HistoryCursor] = None
 
 
 @dataclass
 class UntaggedItemsData:
-    """Untagged journal entry items ready for entity assignment."""
+    """Untagged journal entry items (all, or one page) ready for entity assignment.
+
+    ``after`` is the cursor the page was read from and ``next_cursor`` the one
+    that reads the next page; both are item pks. ``count`` is the size of the
+    whole queue.
+    """
     items: List[JournalEntryItem]
     first_item: Optional[JournalEntryItem]
+    count: int = 0
+    after: Optional[int] = None
+    next_cursor: Optional[int] = None
 
 
 def get_entities_balances() -> List[EntityBalance]:
     """
     Gets aggregated balances for all entities with accounts receivable activity.
 
+    Reads the maintained EntityReceivableBalance rows rather than the items.
     Returns balances ordered by absolute balance (descending), then by
     most recent activity date.
     """
     entities_balances_qs = (
-        JournalEntryItem.objects.filter(RELEVANT_ITEMS_Q)
-        .exclude(entity__isnull=True)
-        .values("entity__id", "entity__name")
+        EntityReceivableBalance.objects.values("entity__id", "entity__name")
         .annotate(
-            total_debits=Sum(
-                Case(
-                    When(
-                        type=JournalEntryItem.JournalEntryType.DEBIT,
-                        then=F("amount"),
-                    ),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
-            total_credits=Sum(
-                Case(
-                    When(
-                        type=JournalEntryItem.JournalEntryType.CREDIT,
-                        then=F("amount"),
-                    ),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
+            total_debits=Sum("debit_total"),
+            total_credits=Sum("credit_total"),
             balance=F("total_credits") - F("total_debits"),
         )
         .annotate(
             abs_balance=Abs(F("balance")),
-            max_journalentry_date=Max("journal_entry__date"),
+            max_journalentry_date=Max("last_activity_date"),
         )
         .order_by("-abs_balance", "-max_journalentry_date")
     )
@@ -153,41 +163,20 @@ def get_grouped_entities_balances(hide_zero: bool = True) -> List[GroupedEntityB
     zero_eps = Decimal("0.005")
 
     qs = (
-        JournalEntryItem.objects.filter(RELEVANT_ITEMS_Q)
-        .exclude(entity__isnull=True)
-        .values(
+        EntityReceivableBalance.objects.values(
             "account__id",
             "account__name",
             "account__is_closed",
             "entity__id",
             "entity__name",
+            "debit_total",
+            "credit_total",
         )
         .annotate(
-            total_debits=Sum(
-                Case(
-                    When(
-                        type=JournalEntryItem.JournalEntryType.DEBIT,
-                        then=F("amount"),
-                    ),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
-            total_credits=Sum(
-                Case(
-                    When(
-                        type=JournalEntryItem.JournalEntryType.CREDIT,
-                        then=F("amount"),
-                    ),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
-            balance=F("total_credits") - F("total_debits"),
+            balance=F("credit_total") - F("debit_total"),
             abs_balance=Abs(F("balance")),
-            last_activity=Max("journal_entry__date"),
         )
-        .order_by("account__name", "-abs_balance", "-last_activity")
+        .order_by("account__name", "-abs_balance", "-last_activity_date")
     )
 
     raw_groups: dict = {}
@@ -201,9 +190,9 @@ def get_grouped_entities_balances(hide_zero: bool = True) -> List[GroupedEntityB
                 account_name=row["account__name"],
                 entity_id=row["entity__id"],
                 entity_name=row["entity__name"],
-                total_debits=row["total_debits"] or Decimal("0.00"),
-                total_credits=row["total_credits"] or Decimal("0.00"),
-                balance=row["balance"] or Decimal("0.00"),
+                total_debits=row["debit_total"],
+                total_credits=row["credit_total"],
+                balance=row["balance"],
             )
         )
 
@@ -235,26 +224,66 @@ def get_grouped_entities_balances(hide_zero: bool = True) -> List[GroupedEntityB
     return result
 
 
-def get_untagged_journal_entry_items() -> UntaggedItemsData:
+def get_untagged_journal_entry_items(
+    after: Optional[int] = None, limit: Optional[int] = None
+) -> UntaggedItemsData:
     """
     Gets journal entry items without an assigned entity.
 
     Filters to accounts receivable accounts and orders by account, then date.
     Returns items and the first item (for form pre-selection).
+
+    With a ``limit``, returns one keyset page of the queue: the items after the
+    item ``after`` in (account name, date, pk) order. The cursor item need not
+    still be untagged, so tagging it leaves the position intact.
     """
-    untagged_items = list(
-        JournalEntryItem.objects.filter(RELEVANT_ITEMS_Q, entity__isnull=True)
-        .select_related("journal_entry__transaction", "account")
-        .order_by("account__name", "journal_entry__date")
+    untagged = JournalEntryItem.objects.filter(RELEVANT_ITEMS_Q, entity__isnull=True)
+    queue = untagged.select_related("journal_entry__transaction", "account").order_by(
+        "account__name", "journal_entry__date", "pk"
     )
 
+    if after is not None:
+        position = (
+            JournalEntryItem.objects.filter(pk=after)
+            .values("account__name", "journal_entry__date")
+            .first()
+        )
+        if position is not None:
+            name = position["account__name"]
+            item_date = position["journal_entry__date"]
+            queue = queue.filter(
+                Q(account__name__gt=name)
+                | Q(account__name=name, journal_entry__date__gt=item_date)
+                | Q(account__name=name, journal_entry__date=item_date, pk__gt=after)
+            )
+
+    if limit is None:
+        untagged_items = list(queue)
+        count = len(untagged_items)
+        next_cursor = None
+    else:
+        # One extra row tells whether a next page exists.
+        rows = list(queue[: limit + 1])
+        untagged_items = rows[:limit]
+        count = untagged.count()
+        next_cursor = untagged_items[-1].pk if len(rows) > limit else None
+
     first_item = untagged_items[0] if untagged_items else None
 
-    return UntaggedItemsData(items=untagged_items, first_item=first_item)
+    return UntaggedItemsData(
+        items=untagged_items,
+        first_item=first_item,
+        count=count,
+        after=after,
+        next_cursor=next_cursor,
+    )
 
 
 def get_entity_history(
-    entity_id: int, account_id: Optional[int] = None
+    entity_id: int,
+    account_id: Optional[int] = None,
+    before: Optional[HistoryCursor] = None,
+    limit: Optional[int] = None,
 ) -> EntityHistoryData:
     """
     Gets the transaction history for an entity with running balances.
@@ -262,6 +291,13 @@ def get_entity_history(
     Scoped to accounts receivable accounts. When account_id is supplied, history
     is scoped to that account only. Returns items ordered by date with a
     calculated running balance.
+
+    With a ``limit``, returns only the latest ``limit`` items before the
+    ``before`` cursor (the newest page when omitted). Running balances are
+    worked backwards from the page's closing balance, which is the stored
+    receivable balance for the newest page and the cursor's opening balance
+    after that, so no page reads the history behind it. ``older_cursor`` pages
+    further back.
     """
     qs = JournalEntryItem.objects.filter(
         RELEVANT_ITEMS_Q,
@@ -269,20 +305,49 @@ def get_entity_history(
     )
     if account_id is not None:
         qs = qs.filter(account__pk=account_id)
-
-    journal_entry_items = list(
-        qs.select_related("journal_entry__transaction", "account", "entity")
-        .order_by("journal_entry__date")
-    )
+    qs = qs.select_related("journal_entry__transaction", "account", "entity")
+
+    older_cursor = None
+    if limit is None:
+        journal_entry_items = list(qs.order_by("journal_entry__date", "pk"))
+        opening_balance = Decimal("0.00")
+    else:
+        if before is None:
+            summary = EntityReceivableBalance.objects.filter(entity__pk=entity_id)
+            if account_id is not None:
+                summary = summary.filter(account__pk=account_id)
+            totals = summary.aggregate(
+                debits=Sum("debit_total"), credits=Sum("credit_total")
+            )
+            closing_balance = (totals["credits"] or Decimal("0.00")) - (
+                totals["debits"] or Decimal("0.00")
+            )
+        else:
+            qs = qs.filter(
+                Q(journal_entry__date__lt=before.date)
+                | Q(journal_entry__date=before.date, pk__lt=before.pk)
+            )
+            closing_balance = before.balance
+
+        # One extra row tells whether an older page exists.
+        page = list(qs.order_by("-journal_entry__date", "-pk")[: limit + 1])
+        has_older = len(page) > limit
+        journal_entry_items = page[:limit][::-1]
+        opening_balance = closing_balance - sum(
+            (_signed_receivable_amount(item) for item in journal_entry_items),
+            Decimal("0.00"),
+        )
+        if has_older:
+            oldest = journal_entry_items[0]
+            older_cursor = HistoryCursor(
+                date=oldest.journal_entry.date, pk=oldest.pk, balance=opening_balance
+            )
 
     history_items = []
-    balance = Decimal("0.00")
+    balance = opening_balance
 
     for item in journal_entry_items:
-        if item.type == JournalEntryItem.JournalEntryType.DEBIT:
-            balance -= item.amount
-        else:
-            balance += item.amount
+        balance += _signed_receivable_amount(item)
 
         history_items.append(
             EntityHistoryItem(
@@ -305,9 +370,18 @@ def get_entity_history(
         entity_id=entity_id,
         entity_name=entity_name,
         account_name=account_name,
+        account_id=account_id,
+        older_cursor=older_cursor,
     )
 
 
+def _signed_receivable_amount(item: JournalEntryItem) -> Decimal:
+    """An item's effect on a receivable balance: credits add, debits subtract."""
+    if item.type == JournalEntryItem.JournalEntryType.DEBIT:
+        return -item.amount
+    return item.amount
+
+
 @db_transaction.atomic
 def untag_journal_entry_item(journal_entry_item_id: int) -> Entity:
     """
@@ -315,7 +389,9 @@ def untag_journal_entry_item(journal_entry_item_id: int) -> Entity:
 
     Returns the entity that was removed (for UI state preservation).
     """
-    journal_entry_item = JournalEntryItem.objects.get(pk=journal_entry_item_id)
+    journal_entry_item = JournalEntryItem.objects.select_related(
+        "journal_entry", "entity"
+    ).get(pk=journal_entry_item_id)
     entity = journal_entry_item.entity
     journal_entry_item.remove_entity()
     return entity
@@ -326,7 +402,9 @@ def tag_journal_entry_item(journal_entry_item_id: int, entity_id: int) -> None:
     """
     Assigns an entity to a journal entry item.
     """
-    journal_entry_item = JournalEntryItem.objects.get(pk=journal_entry_item_id)
+    journal_entry_item = JournalEntryItem.objects.select_related(
+        "journal_entry"
+    ).get(pk=journal_entry_item_id)
     entity = Entity.objects.get(pk=entity_id)
     journal_entry_item.entity = entity
     journal_entry_item.save()
@@ -0,0 +1,165 @@
+"""
+Export service layer: streams ledger tables as NDJSON or CSV.
+
+Rows come from ``values()`` querysets read with ``iterator()``, and each is
+encoded as it is produced, so an export holds one chunk in memory however
+many years it covers.
+"""
+
+import csv
+import json
+from typing import Iterable, Iterator, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Exists, F, OuterRef
+
+from api.models import JournalEntry, JournalEntryItem, Transaction
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _transaction_rows(from_date, to_date, account):
+    queryset = Transaction.objects.all()
+    if from_date:
+        queryset = queryset.filter(date__gte=from_date)
+    if to_date:
+        queryset = queryset.filter(date__lte=to_date)
+    if account:
+        queryset = queryset.filter(account__name=account)
+    return queryset.values(
+        "id",
+        "date",
+        "amount",
+        "description",
+        "category",
+        "is_closed",
+        "date_closed",
+        "type",
+        "linked_transaction_id",
+        account_name=F("account__name"),
+    )
+
+
+def _journal_entry_rows(from_date, to_date, account):
+    queryset = JournalEntry.objects.all()
+    if from_date:
+        queryset = queryset.filter(date__gte=from_date)
+    if to_date:
+        queryset = queryset.filter(date__lte=to_date)
+    if account:
+        queryset = queryset.filter(
+            Exists(
+                JournalEntryItem.objects.filter(
+                    journal_entry=OuterRef("pk"), account__name=account
+                )
+            )
+        )
+    return queryset.values(
+        "id",
+        "date",
+        "description",
+        "transaction_id",
+        "created_by",
+        "cash_classification",
+    )
+
+
+def _journal_entry_item_rows(from_date, to_date, account):
+    queryset = JournalEntryItem.objects.all()
+    if from_date:
+        queryset = queryset.filter(journal_entry__date__gte=from_date)
+    if to_date:
+        queryset = queryset.filter(journal_entry__date__lte=to_date)
+    if account:
+        queryset = queryset.filter(account__name=account)
+    return queryset.values(
+        "id",
+        "journal_entry_id",
+        "type",
+        "amount",
+        date=F("journal_entry__date"),
+        account_name=F("account__name"),
+        entity_name=F("entity__name"),
+    )
+
+
+# Export name -> (row queryset builder, column order).
+EXPORTS = {
+    "transactions": (
+        _transaction_rows,
+        [
+            "id",
+            "date",
+            "account_name",
+            "amount",
+            "description",
+            "category",
+            "is_closed",
+            "date_closed",
+            "type",
+            "linked_transaction_id",
+        ],
+    ),
+    "journal-entries": (
+        _journal_entry_rows,
+        [
+            "id",
+            "date",
+            "description",
+            "transaction_id",
+            "created_by",
+            "cash_classification",
+        ],
+    ),
+    "journal-entry-items": (
+        _journal_entry_item_rows,
+        [
+            "id",
+            "journal_entry_id",
+            "date",
+            "type",
+            "amount",
+            "account_name",
+            "entity_name",
+        ],
+    ),
+}
+
+
+def iter_export_rows(
+    export: str,
+    from_date=None,
+    to_date=None,
+    account: Optional[str] = None,
+) -> Iterator[dict]:
+    """Yields the rows of ``export`` in pk order, one database chunk at a time.
+
+    Dates bound the transaction date, or the journal entry date for entries
+    and items. ``account`` is an account name: the transaction's account, an
+    item's account, or for entries any of their items' accounts.
+    """
+    build_rows, _ = EXPORTS[export]
+    return build_rows(from_date, to_date, account).order_by("pk").iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    """One JSON object per line; decimals and dates are written as strings."""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+class _Echo:
+    """File-like object that hands back what csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows: Iterable[dict], columns: list) -> Iterator[str]:
+    """A header line, then one CSV line per row."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([row[column] for column in columns])
@@ -9,8 +9,12 @@ from django.db.models import QuerySet
 from django.forms import BaseModelFormSet, modelformset_factory
 
 from api.forms import BaseJournalEntryItemFormset, JournalEntryItemForm
-from api.models import Account, Entity, JournalEntry, JournalEntryItem, Paystub, PaystubValue, Transaction
+from api.models import Account, AccountBalanceSnapshot, Entity, JournalEntry, JournalEntryItem, Paystub, PaystubValue, Transaction, defer_ledger_refresh
 from api.services.tagging_services import tag_transactions
+from api.services.transaction_services import (
+    TransactionCursor,
+    get_transaction_window,
+)
 
 
 # Cached formset factory - created once at module load
@@ -366,8 +370,9 @@ def save_journal_entry(
     2. Classify items as new vs existing
     3. Bulk update existing items
     4. Bulk create new items
-    5. Close transaction
-    6. Link paystub if provided
+    5. Refresh the balance snapshot cells the entry touched
+    6. Close transaction
+    7. Link paystub if provided
 
     All operations wrapped in atomic transaction.
     Returns SaveResult with journal_entry on success.
@@ -392,6 +397,10 @@ def save_journal_entry(
                 transaction=transaction_obj,
                 created_by=created_by
             )
+        # Cells the entry's current items sit in, before edits move them.
+        previous_account_months = AccountBalanceSnapshot.get_account_months(
+            journal_entry.journal_entry_items.all()
+        )
 
         # 2. Process debits and credits
         new_items = []
@@ -415,28 +424,40 @@ def save_journal_entry(
             if item:
                 (changed_items if item.pk else new_items).append(item)
 
-        # 3. Delete items that were removed (cleared by user)
-        kept_item_ids = {item.pk for item in changed_items}
-        JournalEntryItem.objects.filter(
-            journal_entry=journal_entry
-        ).exclude(
-            pk__in=kept_item_ids
-        ).delete()
-
-        # 4. Bulk operations
-        if changed_items:
-            JournalEntryItem.objects.bulk_update(
-                changed_items,
-                ['amount', 'account', 'entity']
+        # Steps 3-5 share one refresh: the deletes' signals are collected,
+        # and the bulk writes, which skip them, are added explicitly.
+        with defer_ledger_refresh() as deferred:
+            # 3. Delete items that were removed (cleared by user)
+            kept_item_ids = {item.pk for item in changed_items}
+            JournalEntryItem.objects.filter(
+                journal_entry=journal_entry
+            ).exclude(
+                pk__in=kept_item_ids
+            ).delete()
+
+            # 4. Bulk operations
+            if changed_items:
+                JournalEntryItem.objects.bulk_update(
+                    changed_items,
+                    ['amount', 'account', 'entity']
+                )
+
+            if new_items:
+                JournalEntryItem.objects.bulk_create(new_items)
+
+            # 5. Refresh the snapshot cells and the entry's cash classification
+            deferred.add(
+                previous_account_months
+                | AccountBalanceSnapshot.get_account_months(
+                    journal_entry.journal_entry_items.all()
+                ),
+                [journal_entry.pk],
             )
 
-        if new_items:
-            JournalEntryItem.objects.bulk_create(new_items)
-
-        # 5. Close transaction
+        # 6. Close transaction
         transaction_obj.close()
 
-        # 6. Link paystub if provided
+        # 7. Link paystub if provided
         if paystub_id:
             try:
                 paystub = Paystub.objects.get(pk=paystub_id)
@@ -491,49 +512,62 @@ class PostSaveContext:
     highlighted_index: int
     highlighted_transaction: Optional[Transaction]
     created_entities: List[Entity]
+    after: Optional[TransactionCursor] = None
+    next_cursor: Optional[TransactionCursor] = None
 
 
 def get_post_save_context(
     filter_form,
-    current_index: int,
+    saved_transaction: Transaction,
     debit_formset,
-    credit_formset
+    credit_formset,
+    after: Optional[TransactionCursor] = None,
+    limit: Optional[int] = None,
 ) -> PostSaveContext:
     """
     Builds context for rendering after successful save.
 
     Handles:
-    - Getting filtered transactions
-    - Determining next transaction to highlight
+    - Re-reading the table window that starts after ``after``
+    - Seeking the transaction after the saved one to highlight next
     - Extracting entities created during form cleaning
+
+    Both reads are bounded keyset queries, so a save costs the same however
+    many open transactions the filter matches.
     """
     if filter_form.is_valid():
-        transactions = list(filter_form.get_transactions())
+        queryset = filter_form.get_transactions()
     else:
         # Fallback to default filter
-        transactions = list(Transaction.objects.filter(
+        queryset = Transaction.objects.filter_for_table(
             is_closed=False,
-            type__in=[
+            transaction_types=[
                 Transaction.TransactionType.INCOME,
                 Transaction.TransactionType.PURCHASE
             ]
-        ))
-
-    # Get next transaction (handle index out of bounds)
-    if not transactions:
-        return PostSaveContext(
-            transactions=[],
-            highlighted_index=0,
-            highlighted_transaction=None,
-            created_entities=[]
         )
 
-    try:
-        highlighted_transaction = transactions[current_index]
-        highlighted_index = current_index
-    except IndexError:
-        highlighted_transaction = transactions[0]
+    window = get_transaction_window(queryset, after=after, limit=limit)
+    next_transaction = queryset.after(
+        saved_transaction.date, saved_transaction.account_id, saved_transaction.pk
+    ).first()
+
+    if next_transaction is not None and next_transaction not in window.transactions:
+        # The saved row ended its window, so move on to the one that follows.
+        window = get_transaction_window(
+            queryset, after=TransactionCursor.of(saved_transaction), limit=limit
+        )
+
+    # Get next transaction (wrap to the top of the window past the last one)
+    if not window.transactions:
+        highlighted_transaction = None
+        highlighted_index = 0
+    elif next_transaction is None:
+        highlighted_transaction = window.transactions[0]
         highlighted_index = 0
+    else:
+        highlighted_transaction = next_transaction
+        highlighted_index = window.transactions.index(next_transaction)
 
     # Extract created entities from formsets
     created_entities = []
@@ -543,26 +577,28 @@ def get_post_save_context(
                 created_entities.append(form.created_entity)
 
     return PostSaveContext(
-        transactions=transactions,
+        transactions=window.transactions,
         highlighted_index=highlighted_index,
         highlighted_transaction=highlighted_transaction,
-        created_entities=created_entities
+        created_entities=created_entities,
+        after=window.after,
+        next_cursor=window.next_cursor,
     )
 
 
 def apply_autotags_to_open_transactions() -> int:
     """
-    Applies autotags to all open transactions.
-    Returns count of updated transactions.
+    Applies autotags to all open transactions, writing only the rows whose
+    suggestion changed.
+    Returns count of open transactions.
     """
     open_transactions = list(Transaction.objects.filter(is_closed=False))
-    Transaction.apply_autotags(open_transactions)
-    Transaction.objects.bulk_update(
-        open_transactions,
-        ["suggested_account", "prefill", "type", "suggested_entity"],
-    )
+    changed = Transaction.apply_autotags(open_transactions)
+    Transaction.objects.bulk_update(changed, Transaction.AUTOTAG_FIELDS)
 
     # Also re-attempt utility-bill matches so newly-arrived bills get applied.
+    # This needs every open transaction, not just the re-tagged ones: a bill
+    # is only matched when exactly one transaction fits it.
     # Bills only: loan matching creates schedule rows and isn't safe to re-run on
     # already-matched transactions. Isolated so a matcher failure can't break the
     # re-tag (see api.services.tagging_services).
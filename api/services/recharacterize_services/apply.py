@@ -12,6 +12,8 @@ from django.db import transaction as db_transaction
 from django.utils import timezone
 
 from api.models import (
+    AccountBalanceSnapshot,
+    JournalEntry,
     JournalEntryItem,
     RecharacterizeChange,
     RecharacterizeChangeItem,
@@ -117,6 +119,7 @@ def apply_operation(operations: List[Dict[str, Any]], op_index: int) -> ApplyRes
     snapshot = list(evaluation.queryset.values("pk", "account_id", "entity_id"))
     change = _record_change(evaluation, snapshot)
     matched = JournalEntryItem.objects.filter(pk__in=[row["pk"] for row in snapshot])
+    previous_account_months = AccountBalanceSnapshot.get_account_months(matched)
 
     if evaluation.action_kind == ACTION_SET_ENTITY:
         updated_count = matched.update(entity=evaluation.target_entity)
@@ -127,6 +130,15 @@ def apply_operation(operations: List[Dict[str, Any]], op_index: int) -> ApplyRes
     else:  # pragma: no cover - mutation guard above keeps this unreachable
         return ApplyResult(success=False, error="This operation cannot be applied.")
 
+    # .update() skips the item signals; refresh the cells the items left and
+    # the ones they moved into, and reclassify their entries.
+    JournalEntry.classify(
+        JournalEntry.objects.filter(pk__in=matched.values("journal_entry_id"))
+    )
+    AccountBalanceSnapshot.refresh(
+        previous_account_months | AccountBalanceSnapshot.get_account_months(matched)
+    )
+
     return ApplyResult(
         success=True,
         updated_count=updated_count,
@@ -189,7 +201,22 @@ def revert_change(change_id: int) -> RevertResult:
         reverted += 1
 
     if to_update:
+        reverted_items = JournalEntryItem.objects.filter(
+            pk__in=[jei.pk for jei in to_update]
+        )
+        previous_account_months = AccountBalanceSnapshot.get_account_months(
+            reverted_items
+        )
         JournalEntryItem.objects.bulk_update(to_update, [field])
+        JournalEntry.classify(
+            JournalEntry.objects.filter(
+                pk__in=reverted_items.values("journal_entry_id")
+            )
+        )
+        AccountBalanceSnapshot.refresh(
+            previous_account_months
+            | AccountBalanceSnapshot.get_account_months(reverted_items)
+        )
 
     change.is_reverted = True
     change.reverted_at = timezone.now()
@@ -0,0 +1,178 @@
+"""
+Reconciliation service layer for business logic and database operations.
+
+Services are pure functions with no HTTP dependencies and return dataclass
+result objects.
+"""
+
+from dataclasses import dataclass
+from datetime import date as date_type
+from typing import Optional
+
+from django.db import transaction as db_transaction
+
+from api.models import (
+    Account,
+    JournalEntry,
+    JournalEntryItem,
+    Reconciliation,
+    Transaction,
+    defer_ledger_refresh,
+)
+
+
+@dataclass
+class PlugResult:
+    """Result of a bulk gain/loss plug."""
+    success: bool
+    plugged_count: int = 0
+    error: Optional[str] = None
+
+
+@db_transaction.atomic
+def plug_investment_reconciliations(date: date_type) -> PlugResult:
+    """Plugs the gain/loss for every investment reconciliation on ``date``.
+
+    Bulk equivalent of ``Reconciliation.plug_investment_change``: balances come
+    from one grouped aggregate, and the plug transactions, journal entries and
+    items are written with bulk queries in a single database transaction, with
+    one refresh of the derived ledger state. Reconciliations without an amount,
+    or in balance with no plug yet, are skipped.
+    """
+    reconciliations = list(
+        Reconciliation.objects.filter(
+            date=date,
+            account__sub_type__in=Account.INVESTMENT_SUB_TYPES,
+            amount__isnull=False,
+        ).select_related("account", "transaction")
+    )
+    if not reconciliations:
+        return PlugResult(success=True)
+
+    gain_loss_account = Account.objects.filter(
+        special_type=Account.SpecialType.UNREALIZED_GAINS_AND_LOSSES
+    ).first()
+    if gain_loss_account is None:
+        return PlugResult(
+            success=False,
+            error="No account is marked as the unrealized gains and losses "
+            "account, so gain/loss plugs have nowhere to post.",
+        )
+
+    balances = Account.get_balances(
+        [reconciliation.account for reconciliation in reconciliations], date
+    )
+
+    plugs = []
+    for reconciliation in reconciliations:
+        transaction_amount = (
+            reconciliation.transaction.amount
+            if reconciliation.transaction is not None
+            else 0
+        )
+        delta = reconciliation.amount - (
+            balances[reconciliation.account] - transaction_amount
+        )
+        # An existing plug is rewritten even at zero, so it stops double counting.
+        if delta != 0 or reconciliation.transaction is not None:
+            plugs.append((reconciliation, delta))
+    if not plugs:
+        return PlugResult(success=True)
+
+    today = date_type.today()
+    with defer_ledger_refresh() as deferred:
+        existing_transactions = []
+        new_transactions = []
+        for reconciliation, delta in plugs:
+            if reconciliation.transaction is not None:
+                plug_transaction = reconciliation.transaction
+                plug_transaction.amount = delta
+                plug_transaction.is_closed = True
+                plug_transaction.date_closed = today
+                existing_transactions.append(plug_transaction)
+            else:
+                reconciliation.transaction = Transaction(
+                    date=date,
+                    amount=delta,
+                    account=reconciliation.account,
+                    description=(
+                        str(date) + " Plug gain/loss for " + reconciliation.account.name
+                    ),
+                    is_closed=True,
+                    date_closed=today,
+                )
+                new_transactions.append(reconciliation)
+
+        Transaction.objects.bulk_update(
+            existing_transactions, ["amount", "is_closed", "date_closed"]
+        )
+        Transaction.objects.bulk_create(
+            [reconciliation.transaction for reconciliation in new_transactions]
+        )
+        for reconciliation in new_transactions:
+            # Reassign now the transaction has a pk, to set transaction_id.
+            reconciliation.transaction = reconciliation.transaction
+        Reconciliation.objects.bulk_update(new_transactions, ["transaction"])
+
+        journal_entries = {
+            journal_entry.transaction_id: journal_entry
+            for journal_entry in JournalEntry.objects.filter(
+                transaction__in=[
+                    reconciliation.transaction for reconciliation, _ in plugs
+                ]
+            )
+        }
+        # Re-plugs replace the items of their existing entry; the deferred
+        # refresh collects the deleted items' cells.
+        JournalEntryItem.objects.filter(
+            journal_entry__in=journal_entries.values()
+        ).delete()
+        missing_entries = [
+            JournalEntry(
+                date=date,
+                description=reconciliation.transaction.description,
+                transaction=reconciliation.transaction,
+            )
+            for reconciliation, _ in plugs
+            if reconciliation.transaction.pk not in journal_entries
+        ]
+        JournalEntry.objects.bulk_create(missing_entries)
+        for journal_entry in missing_entries:
+            journal_entries[journal_entry.transaction_id] = journal_entry
+
+        items = []
+        for reconciliation, delta in plugs:
+            if delta > 0:
+                gain_loss_entry_type = JournalEntryItem.JournalEntryType.CREDIT
+                account_entry_type = JournalEntryItem.JournalEntryType.DEBIT
+            else:
+                gain_loss_entry_type = JournalEntryItem.JournalEntryType.DEBIT
+                account_entry_type = JournalEntryItem.JournalEntryType.CREDIT
+            journal_entry = journal_entries[reconciliation.transaction.pk]
+            items.append(
+                JournalEntryItem(
+                    journal_entry=journal_entry,
+                    type=gain_loss_entry_type,
+                    amount=abs(delta),
+                    account=gain_loss_account,
+                    entity_id=reconciliation.account.entity_id,
+                )
+            )
+            items.append(
+                JournalEntryItem(
+                    journal_entry=journal_entry,
+                    type=account_entry_type,
+                    amount=abs(delta),
+                    account=reconciliation.account,
+                    entity_id=reconciliation.account.entity_id,
+                )
+            )
+        JournalEntryItem.objects.bulk_create(items)
+
+        # bulk_create skips the item signals, so add the new items' cells.
+        deferred.add(
+            {(item.account_id, date) for item in items},
+            [journal_entry.pk for journal_entry in journal_entries.values()],
+        )
+
+    return PlugResult(success=True, plugged_count=len(plugs))
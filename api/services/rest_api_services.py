@@ -1,9 +1,17 @@
+from datetime import date
 from decimal import Decimal
 from typing import Any, Dict, List
 
 from django.db import transaction as db_transaction
 
-from api.models import Account, Entity, JournalEntryItem, Transaction
+from api.models import (
+    Account,
+    Entity,
+    JournalEntry,
+    JournalEntryItem,
+    Transaction,
+    defer_ledger_refresh,
+)
 from api.services.journal_entry_services import (
     SaveResult,
     validate_journal_entry_balance,
@@ -119,27 +127,32 @@ def bulk_create_journal_entries(
     """
     Creates multiple journal entries atomically (all-or-nothing).
 
-    Pre-fetches account/entity maps once for the batch.
+    Every entry is resolved and validated before anything is written. The
+    transactions, accounts and entities are each fetched in one query, and
+    the entries, items and closed transactions are written in bulk, so the
+    query count does not grow with the batch (entities named for the first
+    time are still created one at a time).
     Raises ValueError on any failure to trigger rollback.
     """
     accounts_map = {a.name: a for a in Account.objects.all()}
     entities_map = {e.name: e for e in Entity.objects.all()}
+    transactions = Transaction.objects.select_related(
+        "account", "journal_entry"
+    ).in_bulk([entry_data["transaction_id"] for entry_data in entries_data])
     all_created_entities: List[str] = []
-    results = []
 
+    # 1. Resolve and validate every entry up front.
+    resolved_entries = []
+    closing_ids = set()
     for entry_data in entries_data:
         transaction_id = entry_data["transaction_id"]
-        created_by = entry_data.get("created_by", "user")
-
-        try:
-            transaction_obj = Transaction.objects.select_related("account").get(
-                pk=transaction_id
-            )
-        except Transaction.DoesNotExist:
+        transaction_obj = transactions.get(transaction_id)
+        if transaction_obj is None:
             raise ValueError(f"Transaction {transaction_id} not found.")
-
-        if transaction_obj.is_closed:
+        # An earlier entry in the batch closes it as well.
+        if transaction_obj.is_closed or transaction_id in closing_ids:
             raise ValueError(f"Transaction {transaction_id} is already closed.")
+        closing_ids.add(transaction_id)
 
         resolved_debits = resolve_names_to_objects(
             entry_data["debits"], accounts_map, entities_map, all_created_entities
@@ -157,27 +170,88 @@ def bulk_create_journal_entries(
             raise ValueError(
                 f"Transaction {transaction_id}: {'; '.join(validation.errors)}"
             )
-
-        result: SaveResult = save_journal_entry(
-            transaction_obj=transaction_obj,
-            debits_data=resolved_debits,
-            credits_data=resolved_credits,
-            created_by=created_by,
+        resolved_entries.append(
+            (
+                transaction_obj,
+                entry_data.get("created_by", "user"),
+                resolved_debits,
+                resolved_credits,
+            )
         )
 
-        if not result.success:
-            raise ValueError(
-                f"Transaction {transaction_id}: {result.error}"
-            )
+    # 2. Reuse the entries open transactions already have, replacing their
+    # items, and create the rest. Item signals only record their cells inside
+    # the deferred block, which refreshes derived state once on exit.
+    with defer_ledger_refresh() as deferred:
+        journal_entries = {}
+        new_journal_entries = []
+        for transaction_obj, created_by, _, _ in resolved_entries:
+            try:
+                journal_entry = transaction_obj.journal_entry
+            except JournalEntry.DoesNotExist:
+                journal_entry = JournalEntry(
+                    date=transaction_obj.date,
+                    transaction=transaction_obj,
+                    created_by=created_by,
+                )
+                new_journal_entries.append(journal_entry)
+            journal_entries[transaction_obj.pk] = journal_entry
+        JournalEntryItem.objects.filter(
+            journal_entry__in=[
+                journal_entry
+                for journal_entry in journal_entries.values()
+                if journal_entry.pk
+            ]
+        ).delete()
+        JournalEntry.objects.bulk_create(new_journal_entries)
+
+        # 3. Write every item, then close the transactions.
+        items = []
+        for transaction_obj, _, resolved_debits, resolved_credits in resolved_entries:
+            journal_entry = journal_entries[transaction_obj.pk]
+            for entry_type, items_data in (
+                (JournalEntryItem.JournalEntryType.DEBIT, resolved_debits),
+                (JournalEntryItem.JournalEntryType.CREDIT, resolved_credits),
+            ):
+                for item_data in items_data:
+                    if not item_data.get("amount") or not item_data.get("account"):
+                        continue
+                    items.append(
+                        JournalEntryItem(
+                            journal_entry=journal_entry,
+                            type=entry_type,
+                            amount=item_data["amount"],
+                            account=item_data["account"],
+                            entity=item_data.get("entity"),
+                        )
+                    )
+        JournalEntryItem.objects.bulk_create(items)
 
-        results.append(
-            {
-                "journal_entry_id": result.journal_entry.id,
-                "transaction_id": transaction_id,
-                "created_by": created_by,
-            }
+        today = date.today()
+        closed_transactions = [
+            transaction_obj for transaction_obj, _, _, _ in resolved_entries
+        ]
+        for transaction_obj in closed_transactions:
+            transaction_obj.is_closed = True
+            transaction_obj.date_closed = today
+        Transaction.objects.bulk_update(
+            closed_transactions, ["is_closed", "date_closed"]
         )
 
+        # 4. bulk_create skips the item signals, so add the new items' cells.
+        deferred.add(
+            {(item.account_id, item.journal_entry.date) for item in items},
+            [journal_entry.pk for journal_entry in journal_entries.values()],
+        )
+
+    results = [
+        {
+            "journal_entry_id": journal_entries[transaction_obj.pk].id,
+            "transaction_id": transaction_obj.pk,
+            "created_by": created_by,
+        }
+        for transaction_obj, created_by, _, _ in resolved_entries
+    ]
     return {
         "count": len(results),
         "journal_entries": results,
@@ -7,7 +7,7 @@ go through services with atomic transactions.
 """
 
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date
 from decimal import Decimal
 from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
@@ -16,10 +16,12 @@ from django.db.models import Case, DecimalField, F, Sum, When
 from api.models import Account, JournalEntry, JournalEntryItem
 from api.statement import (
     Balance,
-    BalanceSheet,
     CashFlowStatement,
+    DateRange,
     EntityBalance,
     IncomeStatement,
+    PeriodLedger,
+    statement_cache,
 )
 
 
@@ -443,8 +445,9 @@ def calculate_cash_flow_metrics(from_date: date, to_date: date) -> CashFlowMetri
     """
     Calculate all cash flow metrics for rendering.
 
-    Creates income statement, balance sheets, and cash flow statements
-    to extract all required metrics.
+    Builds the period cash flow statement and the global one behind the
+    discrepancy check from a single PeriodLedger read (one grouped query plus
+    the investing-exclusion query), and caches the result by ledger version.
 
     Args:
         from_date: Start date for the period
@@ -453,26 +456,22 @@ def calculate_cash_flow_metrics(from_date: date, to_date: date) -> CashFlowMetri
     Returns:
         CashFlowMetrics with all calculated values
     """
-    # Create statements for the period
-    income_statement = IncomeStatement(end_date=to_date, start_date=from_date)
-    end_balance_sheet = BalanceSheet(end_date=to_date)
-    start_balance_sheet = BalanceSheet(end_date=from_date + timedelta(days=-1))
-
-    cash_statement = CashFlowStatement(
-        income_statement=income_statement,
-        start_balance_sheet=start_balance_sheet,
-        end_balance_sheet=end_balance_sheet,
+    return statement_cache.get_or_build(
+        "CashFlowMetrics",
+        (from_date, to_date),
+        lambda: _build_cash_flow_metrics(from_date, to_date),
     )
 
-    # Create global cash flow statement for discrepancy check
-    global_end_date = "2500-01-01"
-    global_start_date = "1900-01-01"
-    global_cash_statement = CashFlowStatement(
-        income_statement=IncomeStatement(
-            end_date=global_end_date, start_date=global_start_date
-        ),
-        end_balance_sheet=BalanceSheet(end_date=global_end_date),
-        start_balance_sheet=BalanceSheet(end_date=global_start_date),
+
+def _build_cash_flow_metrics(from_date: date, to_date: date) -> CashFlowMetrics:
+    period = DateRange(start=from_date, end=to_date)
+    # The global statement spans the whole ledger, for the discrepancy check
+    everything = DateRange(start=date(1900, 1, 1), end=date(2500, 1, 1))
+    ledger = PeriodLedger([period, everything])
+
+    cash_statement = CashFlowStatement.from_ledger(ledger, period.start, period.end)
+    global_cash_statement = CashFlowStatement.from_ledger(
+        ledger, everything.start, everything.end
     )
 
     # Extract metrics from summaries
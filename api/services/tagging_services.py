@@ -10,6 +10,8 @@ isolation invariant in one place so every caller behaves the same.
 import logging
 from typing import Callable, Iterable, List
 
+from django.db import transaction as db_transaction
+
 from api.models import Transaction
 from api.services.bill_services import match_transactions_to_bills
 from api.services.loan_services import match_transactions_to_loans
@@ -21,9 +23,11 @@ Matcher = Callable[[Iterable[Transaction]], int]
 
 def _run_advisory(matcher: Matcher, transactions: Iterable[Transaction]) -> None:
     """Run one matcher, swallowing + logging any failure. Matching is
-    best-effort tagging and must never break its caller."""
+    best-effort tagging and must never break its caller. The savepoint keeps
+    a failed matcher from poisoning a caller's open database transaction."""
     try:
-        matcher(transactions)
+        with db_transaction.atomic():
+            matcher(transactions)
     except Exception:
         logger.exception(
             "Advisory matcher %s failed; tagging skipped.", matcher.__name__
@@ -24,11 +24,45 @@ class TransactionResult:
     error: Optional[str] = None
 
 
+@dataclass
+class TransactionCursor:
+    """Keyset position in filter_for_table's (date, account name, pk) order."""
+    date: datetime.date
+    account_id: int
+    pk: int
+
+    def encode(self) -> str:
+        return f"{self.date.isoformat()}_{self.account_id}_{self.pk}"
+
+    @classmethod
+    def decode(cls, value: str) -> "TransactionCursor":
+        date_str, account_id, pk = value.split("_")
+        return cls(
+            date=datetime.date.fromisoformat(date_str),
+            account_id=int(account_id),
+            pk=int(pk),
+        )
+
+    @classmethod
+    def of(cls, transaction: Transaction) -> "TransactionCursor":
+        return cls(
+            date=transaction.date,
+            account_id=transaction.account_id,
+            pk=transaction.pk,
+        )
+
+
 @dataclass
 class TransactionFilterResult:
-    """Result of transaction filtering."""
+    """Result of transaction filtering: every match, or one keyset window.
+
+    ``after`` is the cursor the window was read from and ``next_cursor`` the
+    one for the following window (None on the last).
+    """
     transactions: List[Transaction]
     count: int
+    after: Optional[TransactionCursor] = None
+    next_cursor: Optional[TransactionCursor] = None
 
 
 @dataclass
@@ -48,12 +82,15 @@ def filter_transactions(
     date_from: Optional[datetime.date] = None,
     date_to: Optional[datetime.date] = None,
     related_accounts: Optional[List[Account]] = None,
+    after: Optional[TransactionCursor] = None,
+    limit: Optional[int] = None,
 ) -> TransactionFilterResult:
     """
     Filters transactions based on criteria.
 
     Uses the Transaction.objects.filter_for_table() queryset method
-    with optimized select_related for performance.
+    with optimized select_related for performance. With a ``limit``, returns
+    the window of that many transactions after ``after``.
 
     Args:
         is_closed: Filter by closed status (True/False/None for all)
@@ -63,6 +100,8 @@ def filter_transactions(
         date_from: Start date (inclusive)
         date_to: End date (inclusive)
         related_accounts: Filter by related accounts in journal entries
+        after: Keyset position the window starts after (None for the start)
+        limit: Window size (None for every match)
 
     Returns:
         TransactionFilterResult with transactions and count
@@ -77,10 +116,39 @@ def filter_transactions(
         related_accounts=related_accounts,
     ).select_related("account", "suggested_account")
 
-    transactions = list(queryset)
+    return get_transaction_window(queryset, after=after, limit=limit)
+
+
+def get_transaction_window(
+    queryset: QuerySet,
+    after: Optional[TransactionCursor] = None,
+    limit: Optional[int] = None,
+) -> TransactionFilterResult:
+    """
+    Reads one keyset window of a filter_for_table() queryset.
+
+    Seeking past ``after`` keeps every window as cheap as the first, however
+    deep into the filter it starts. Without a ``limit`` every row is returned.
+    """
+    if after is not None:
+        queryset = queryset.after(after.date, after.account_id, after.pk)
+
+    if limit is None:
+        transactions = list(queryset)
+        next_cursor = None
+    else:
+        # One extra row tells whether a next window exists.
+        rows = list(queryset[: limit + 1])
+        transactions = rows[:limit]
+        next_cursor = (
+            TransactionCursor.of(transactions[-1]) if len(rows) > limit else None
+        )
+
     return TransactionFilterResult(
         transactions=transactions,
-        count=len(transactions)
+        count=len(transactions),
+        after=after,
+        next_cursor=next_cursor,
     )
 
 
@@ -245,7 +313,8 @@ def apply_autotags_to_transactions(
     Applies autotags to given transactions (or all open transactions).
 
     Autotags set suggested_account, prefill, type, and suggested_entity
-    based on pattern matching rules.
+    based on pattern matching rules. Only rows whose suggestion changed are
+    written.
 
     Args:
         transactions: QuerySet of transactions to tag (defaults to open transactions)
@@ -256,9 +325,6 @@ def apply_autotags_to_transactions(
     if transactions is None:
         transactions = Transaction.objects.filter(is_closed=False)
 
-    Transaction.apply_autotags(transactions)
-    Transaction.objects.bulk_update(
-        transactions,
-        ["suggested_account", "prefill", "type", "suggested_entity"],
-    )
+    changed = Transaction.apply_autotags(transactions)
+    Transaction.objects.bulk_update(changed, Transaction.AUTOTAG_FIELDS)
     return transactions.count()
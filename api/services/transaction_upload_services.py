@@ -1,17 +1,26 @@
 """
 Service functions for transaction CSV upload orchestration.
 
-Owns the import-and-tag unit of work: creates the transactions from the CSV, then
-runs best-effort bill/loan tagging. Parsing/import failures become clear,
+Owns the import-and-tag unit of work: streams the CSV into transactions in
+fixed-size batches, running best-effort bill/loan tagging on each batch. Large
+files can instead be stored in S3 and imported by a Celery worker
+(``start_transactions_import``), which records progress on a
+``TransactionImport``. Parsing/import failures become clear,
 user-facing errors instead of an unhandled 500. Mirrors the result-dataclass
 pattern used by ``api/services/paystub_upload_services.py``.
 """
+import codecs
+import csv
+import io
 import logging
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Iterable, Optional, Tuple
 
+from django.db import transaction as db_transaction
+
+from api.aws_services import upload_file_to_s3
 from api.forms import UploadTransactionsForm
-from api.models import Account
+from api.models import Account, CSVImportBatch, TransactionImport
 from api.services.tagging_services import tag_transactions
 
 logger = logging.getLogger(__name__)
@@ -21,42 +30,147 @@ logger = logging.getLogger(__name__)
 class TransactionsUploadResult:
     success: bool
     count: int = 0
+    skipped: int = 0
     account: Optional[Account] = None
     error: Optional[str] = None
+    transaction_import: Optional[TransactionImport] = None
+
+
+IMPORT_ERROR = (
+    "We couldn't read that file. Check that it's the CSV exported for "
+    "this account and try again."
+)
+QUEUE_ERROR = (
+    "We couldn't start the import. Please try uploading the file again in "
+    "a few minutes."
+)
+
+
+def _import_batches(
+    batches: Iterable[CSVImportBatch],
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[int, int]:
+    """Tags each created batch and returns the imported and skipped counts."""
+    count = 0
+    skipped = 0
+    for batch in batches:
+        if batch.transactions:
+            tag_transactions(batch.transactions)
+        count += len(batch.transactions)
+        skipped += batch.skipped
+        if on_progress is not None:
+            on_progress(count, skipped)
+    return count, skipped
 
 
 def import_transactions_from_csv(
     form: UploadTransactionsForm,
+    on_progress: Optional[Callable[[int, int], None]] = None,
 ) -> TransactionsUploadResult:
     """
-    Imports a validated ``UploadTransactionsForm``, then applies best-effort
-    bill/loan tagging to the created transactions.
+    Imports a validated ``UploadTransactionsForm`` batch by batch, applying
+    best-effort bill/loan tagging to each created batch.
 
     The form must already be validated by the caller. Any exception raised while
     parsing/importing the CSV (e.g. unexpected columns or unparseable dates) is
     logged and returned as a user-facing error, so the upload view can always
     render a clear success or error message instead of returning a 500. Tagging
-    runs after the import and isolates its own failures (see
+    runs per batch and isolates its own failures (see
     ``api.services.tagging_services``), so it never affects the returned count.
+    Rows already imported by an earlier upload are skipped and counted apart.
+
+    The whole import is one database transaction, so a bad row late in the file
+    leaves nothing behind. ``on_progress`` is called with the running imported
+    and skipped counts after each batch.
 
     Returns:
-        TransactionsUploadResult with the imported ``count`` and ``account`` on
-        success, or ``success=False`` and an ``error`` message on failure.
+        TransactionsUploadResult with the imported ``count``, ``skipped`` and
+        ``account`` on success, or ``success=False`` and an ``error`` message on failure.
     """
     account = form.cleaned_data["account"]
     try:
-        transactions = form.save()
+        with db_transaction.atomic():
+            count, skipped = _import_batches(form.iter_batches(), on_progress)
     except Exception:
         logger.exception("Failed to import transactions from CSV for account %s", account)
+        return TransactionsUploadResult(success=False, error=IMPORT_ERROR)
+
+    return TransactionsUploadResult(
+        success=True, count=count, skipped=skipped, account=account
+    )
+
+
+def _dispatch_transactions_import(transaction_import_pk: int) -> None:
+    """Dispatches the async CSV import task.
+
+    The import is local because api.tasks imports from this module.
+    """
+    from api.tasks import import_transactions_csv
+
+    import_transactions_csv.delay(transaction_import_pk)
+
+
+def start_transactions_import(
+    form: UploadTransactionsForm,
+) -> TransactionsUploadResult:
+    """
+    Stores a validated upload in S3 and queues it for the Celery worker.
+
+    Returns:
+        TransactionsUploadResult with the pending ``transaction_import`` on
+        success, or ``success=False`` and an ``error`` if the upload or the
+        dispatch failed (the import is then marked FAILED).
+    """
+    account = form.cleaned_data["account"]
+    file = form.cleaned_data["transaction_csv"]
+    file.seek(0)
+    unique_name = upload_file_to_s3(file=file)
+    if isinstance(unique_name, dict):
         return TransactionsUploadResult(
-            success=False,
-            error=(
-                "We couldn't read that file. Check that it's the CSV exported for "
-                "this account and try again."
-            ),
+            success=False, error=unique_name.get("message", "Upload failed")
         )
 
-    tag_transactions(transactions)
+    transaction_import = TransactionImport.objects.create(
+        account=account,
+        user_filename=file.name,
+        s3_filename=unique_name,
+    )
+    try:
+        _dispatch_transactions_import(transaction_import.pk)
+    except Exception as exc:
+        # Left PENDING, the upload page would poll an import no worker has.
+        logger.exception(
+            "Failed to queue TransactionImport pk=%s", transaction_import.pk
+        )
+        transaction_import.status = TransactionImport.Status.FAILED
+        transaction_import.error_message = str(exc)
+        transaction_import.save(update_fields=["status", "error_message"])
+        return TransactionsUploadResult(
+            success=False, error=QUEUE_ERROR, transaction_import=transaction_import
+        )
     return TransactionsUploadResult(
-        success=True, count=len(transactions), account=account
+        success=True, account=account, transaction_import=transaction_import
+    )
+
+
+def run_transactions_import(
+    transaction_import: TransactionImport, file_bytes: bytes
+) -> None:
+    """
+    Imports a stored upload on the worker, saving the counts after each batch.
+
+    Batches commit as they go so the upload page can poll the progress. If a
+    row fails part way, the rows already imported stay; uploading the file
+    again skips them by fingerprint and resumes from the failed row.
+    """
+    account = transaction_import.account
+    rows = csv.reader(codecs.iterdecode(io.BytesIO(file_bytes), "utf-8"))
+
+    def save_progress(count: int, skipped: int) -> None:
+        transaction_import.imported_count = count
+        transaction_import.skipped_count = skipped
+        transaction_import.save(update_fields=["imported_count", "skipped_count"])
+
+    _import_batches(
+        account.csv_profile.iter_transaction_batches(rows, account), save_progress
     )
@@ -0,0 +1,200 @@
+"""Keeps derived ledger state current as the ledger changes.
+
+That is AccountBalanceSnapshot (and the EntityReceivableBalance rows its
+refresh maintains), JournalEntry.cash_classification and LedgerVersion.
+
+Covers every write that goes through a model save or delete, including the
+cascade when a transaction or journal entry is deleted. Bulk writes
+(``bulk_create``, ``bulk_update``, ``QuerySet.update``) bypass these signals, so
+their callers refresh the snapshot and reclassify entries themselves (see
+save_journal_entry and the recharacterize apply/revert services); the refresh
+bumps the ledger version.
+
+A single item write applies its debit/credit delta to the cells it touches
+(AccountBalanceSnapshot.apply_deltas). Code that writes many items wraps them
+in ``defer_ledger_refresh()``, which collects the cells instead and
+recomputes them once on exit.
+"""
+
+from decimal import Decimal
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from api.models import (
+    Account,
+    AccountBalanceSnapshot,
+    Entity,
+    EntityReceivableBalance,
+    JournalEntry,
+    JournalEntryItem,
+    LedgerVersion,
+    get_deferred_refresh,
+)
+
+
+def _add_item_delta(deltas, cell, sign=1):
+    """Add an item's (account_id, entity_id, date, type, amount) to ``deltas``,
+    keyed by its snapshot cell; ``sign=-1`` takes it back out."""
+    account_id, entity_id, date, entry_type, amount = cell
+    key = (account_id, entity_id, AccountBalanceSnapshot.get_month_start(date))
+    debits, credits = deltas.get(key, (0, 0))
+    amount = sign * Decimal(str(amount))
+    if entry_type == JournalEntryItem.JournalEntryType.DEBIT:
+        debits += amount
+    else:
+        credits += amount
+    deltas[key] = (debits, credits)
+
+
+@receiver(pre_save, sender=JournalEntryItem)
+def remember_item_cell(sender, instance, raw=False, **kwargs):
+    # An edit takes the item's previous amount out of the cell it is leaving.
+    instance._previous_cell = None
+    if instance.pk and not raw:
+        instance._previous_cell = (
+            JournalEntryItem.objects.filter(pk=instance.pk)
+            .values_list(
+                "account_id", "entity_id", "journal_entry__date", "type", "amount"
+            )
+            .first()
+        )
+
+
+@receiver(post_save, sender=JournalEntryItem)
+def refresh_item_cell(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous_cell = getattr(instance, "_previous_cell", None)
+    cell = (
+        instance.account_id,
+        instance.entity_id,
+        instance.journal_entry.date,
+        instance.type,
+        instance.amount,
+    )
+    deferred = get_deferred_refresh()
+    if deferred is not None:
+        account_months = {(cell[0], cell[2])}
+        if previous_cell is not None:
+            account_months.add((previous_cell[0], previous_cell[2]))
+        deferred.add(account_months, [instance.journal_entry_id])
+        return
+    # Classify first: applying the deltas bumps the ledger version.
+    JournalEntry.classify(JournalEntry.objects.filter(pk=instance.journal_entry_id))
+    deltas = {}
+    if previous_cell is not None:
+        _add_item_delta(deltas, previous_cell, sign=-1)
+    _add_item_delta(deltas, cell)
+    AccountBalanceSnapshot.apply_deltas(deltas)
+
+
+@receiver(pre_delete, sender=JournalEntryItem)
+def remember_deleted_item_cell(sender, instance, **kwargs):
+    deferred = get_deferred_refresh()
+    if deferred is not None:
+        # Dated in one query on exit, rather than one per item here.
+        deferred.deleted_items.add((instance.account_id, instance.journal_entry_id))
+        deferred.journal_entry_ids.add(instance.journal_entry_id)
+        return
+    # Read the date now: in a cascade the journal entry is deleted next.
+    instance._previous_cell = (
+        instance.account_id,
+        instance.entity_id,
+        instance.journal_entry.date,
+        instance.type,
+        instance.amount,
+    )
+
+
+@receiver(post_delete, sender=JournalEntryItem)
+def refresh_deleted_item_cell(sender, instance, **kwargs):
+    if get_deferred_refresh() is not None:
+        return
+    JournalEntry.classify(JournalEntry.objects.filter(pk=instance.journal_entry_id))
+    deltas = {}
+    _add_item_delta(deltas, instance._previous_cell, sign=-1)
+    AccountBalanceSnapshot.apply_deltas(deltas)
+
+
+@receiver(pre_delete, sender=JournalEntry)
+def remember_deleted_journal_entry_date(sender, instance, **kwargs):
+    deferred = get_deferred_refresh()
+    if deferred is not None:
+        deferred.deleted_entry_dates[instance.pk] = instance.date
+
+
+@receiver(pre_save, sender=JournalEntry)
+def remember_journal_entry_date(sender, instance, raw=False, **kwargs):
+    instance._previous_date = None
+    if instance.pk and not raw:
+        instance._previous_date = (
+            JournalEntry.objects.filter(pk=instance.pk)
+            .values_list("date", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=JournalEntry)
+def refresh_redated_journal_entry(sender, instance, raw=False, **kwargs):
+    previous_date = getattr(instance, "_previous_date", None)
+    if raw or previous_date is None or previous_date == instance.date:
+        return
+    account_ids = set(
+        instance.journal_entry_items.values_list("account_id", flat=True)
+    )
+    account_months = {(account_id, previous_date) for account_id in account_ids} | {
+        (account_id, instance.date) for account_id in account_ids
+    }
+    deferred = get_deferred_refresh()
+    if deferred is not None:
+        deferred.add(account_months)
+        return
+    AccountBalanceSnapshot.refresh(account_months)
+
+
+@receiver(pre_save, sender=Account)
+def remember_account_classification(sender, instance, raw=False, **kwargs):
+    instance._previous_classification = None
+    if instance.pk and not raw:
+        instance._previous_classification = (
+            Account.objects.filter(pk=instance.pk)
+            .values_list("sub_type", "is_depreciation")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Account)
+def reclassify_account_entries(sender, instance, raw=False, **kwargs):
+    # An account turning into (or out of) cash, unrealized gains or
+    # depreciation changes the classification of every entry it appears in.
+    previous = getattr(instance, "_previous_classification", None)
+    if raw or previous is None:
+        return
+    if previous != (instance.sub_type, instance.is_depreciation):
+        JournalEntry.classify(
+            JournalEntry.objects.filter(
+                pk__in=JournalEntryItem.objects.filter(account=instance).values(
+                    "journal_entry_id"
+                )
+            )
+        )
+    # Turning into (or out of) a receivable adds or drops its receivable rows.
+    if previous[0] != instance.sub_type:
+        EntityReceivableBalance.objects.filter(account=instance).delete()
+        EntityReceivableBalance.objects.bulk_create(
+            EntityReceivableBalance.compute(
+                JournalEntryItem.objects.filter(account=instance)
+            )
+        )
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+@receiver(post_save, sender=Entity)
+@receiver(post_delete, sender=Entity)
+def bump_ledger_version(sender, raw=False, **kwargs):
+    # Statements show account and entity names, types and closed flags, so a
+    # change to either invalidates them even without an item write.
+    if not raw:
+        LedgerVersion.bump()
@@ -1,11 +1,22 @@
 import copy
 from collections import namedtuple
 from datetime import date, datetime, timedelta
+from decimal import Decimal
 
+import numpy as np
+import pandas as pd
 from dateutil.relativedelta import relativedelta
-from django.db.models import Case, DecimalField, Q, Sum, Value, When
-
-from api.models import Account, JournalEntryItem
+from django.core.cache import caches
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from api.models import (
+    Account,
+    AccountBalanceSnapshot,
+    JournalEntry,
+    JournalEntryItem,
+    LedgerVersion,
+    debit_credit_total_annotations,
+)
 
 
 def _tagged_balances(rows, origin):
@@ -25,9 +36,16 @@ def _tagged_balances(rows, origin):
 
 
 class Trend:
-    def __init__(self, start_date, end_date):
+    # "orm" groups in the database (PeriodLedger); "pandas" loads the items
+    # once and groups them in memory (FrameLedger).
+    BACKENDS = ("orm", "pandas")
+
+    def __init__(self, start_date, end_date, backend="orm"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown statement backend: {backend}")
         self.start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
         self.end_date = end_date
+        self.backend = backend
 
     def _get_month_ranges(self):
         current_date = self.start_date
@@ -48,19 +66,23 @@ class Trend:
 
     def get_balances(self):
         ranges = self._get_month_ranges()
+        if not ranges:
+            return []
+
+        # One read feeds every month's statements; see PeriodLedger and
+        # FrameLedger.
+        if self.backend == "pandas":
+            ledger = FrameLedger(end_date=ranges[-1].end)
+        else:
+            ledger = PeriodLedger(ranges)
 
         balances = []
         for range in ranges:
-            income_statement = IncomeStatement(
-                end_date=range.end, start_date=range.start
-            )
-            balance_sheet = BalanceSheet(end_date=range.end)
-
-            balance_sheet_start_date = range.start - timedelta(days=1)
-            balance_sheet_start = BalanceSheet(end_date=balance_sheet_start_date)
-            cash_flow_statement = CashFlowStatement(
-                income_statement, balance_sheet_start, balance_sheet
+            cash_flow_statement = CashFlowStatement.from_ledger(
+                ledger, range.start, range.end
             )
+            income_statement = cash_flow_statement.income_statement
+            balance_sheet = cash_flow_statement.end_balance_sheet
 
             # Tag each row with its originating statement so a consumer can pick
             # one statement's rows without double-counting the cash-flow
@@ -97,25 +119,233 @@ EntityBalance = namedtuple(
     "EntityBalance", ["entity_id", "name", "amount", "sub_type"]
 )
 
+DateRange = namedtuple("DateRange", ["start", "end"])
+
+
+def _sum_totals(target, totals):
+    """Add `totals` ({account_id: (debits, credits)}) into `target` in place."""
+    for account_id, (debits, credits) in totals.items():
+        if account_id in target:
+            target_debits, target_credits = target[account_id]
+            target[account_id] = (target_debits + debits, target_credits + credits)
+        else:
+            target[account_id] = (debits, credits)
+
+
+class LedgerTotals:
+    """Per-account debit/credit totals a Statement can balance from.
+
+    A Statement normally aggregates JournalEntryItem itself. Handing it a
+    LedgerTotals instead skips that query, so a caller that already holds the
+    totals (e.g. Trend, via PeriodLedger) can build many statements from one
+    read. Accounts missing from `totals` had no activity and balance to zero,
+    exactly as they do on the query path.
+    """
+
+    def __init__(self, accounts, totals):
+        self.accounts = accounts
+        self.totals = totals
+
+    @classmethod
+    def load(cls, account_types, end_date, start_date=None):
+        """Totals for `account_types` over the window, in one aggregate read.
 
-def _debit_credit_total_annotations():
-    """Aggregation kwargs summing a queryset's amounts into debit/credit totals."""
-    return {
-        "debit_total": Sum(
-            Case(
-                When(type="debit", then="amount"),
-                output_field=DecimalField(),
-                default=Value(0),
+        Whole months come from the balance snapshot; only the partial months
+        at the window's edges are summed from raw items.
+        """
+        return cls(
+            list(Account.objects.filter(type__in=account_types)),
+            AccountBalanceSnapshot.get_totals(account_types, end_date, start_date),
+        )
+
+    def get_accounts(self, account_types):
+        return [account for account in self.accounts if account.type in account_types]
+
+    def get_aggregates(self, account_types):
+        aggregates = []
+        for account in self.get_accounts(account_types):
+            debits, credits = self.totals.get(account.pk, (0, 0))
+            aggregates.append(
+                {"account": account, "debit_total": debits, "credit_total": credits}
             )
-        ),
-        "credit_total": Sum(
-            Case(
-                When(type="credit", then="amount"),
-                output_field=DecimalField(),
-                default=Value(0),
+        return aggregates
+
+
+class PeriodLedger:
+    """Debit/credit totals for a run of periods, read in one grouped query.
+
+    Every item up to the last period's end is bucketed by the period boundary
+    it falls under, so the query returns one row per (account, bucket) however
+    many periods are requested. Balance sheets are then running sums of the
+    buckets and income statements the sum of one period's buckets, all in
+    memory. A second grouped query does the same for the investing-section
+    items CashFlowStatement would otherwise select per statement.
+    """
+
+    def __init__(self, ranges):
+        cutoffs = set()
+        for range in ranges:
+            cutoffs.add(range.start - timedelta(days=1))
+            cutoffs.add(range.end)
+        self.cutoffs = sorted(cutoffs)
+        self._cutoff_index = {cutoff: i for i, cutoff in enumerate(self.cutoffs)}
+        self.accounts = list(Account.objects.all())
+
+        items = JournalEntryItem.objects.filter(
+            journal_entry__date__lte=self.cutoffs[-1]
+        )
+        self.buckets = self._get_bucketed_totals(items)
+
+        investing_items = JournalEntryItem.objects.filter(
+            journal_entry__date__gt=self.cutoffs[0],
+            journal_entry__date__lte=self.cutoffs[-1],
+            account__sub_type__in=Account.INVESTMENT_SUB_TYPES,
+        ).filter(CashFlowStatement.CASH_ENTRY)
+        self.investing_buckets = self._get_bucketed_totals(investing_items)
+
+        self.cumulative = []
+        running = {}
+        for bucket in self.buckets:
+            _sum_totals(running, bucket)
+            self.cumulative.append(dict(running))
+
+    def _get_bucketed_totals(self, journal_entry_items):
+        bucket = Case(
+            *[
+                When(journal_entry__date__lte=cutoff, then=Value(i))
+                for i, cutoff in enumerate(self.cutoffs)
+            ],
+            output_field=IntegerField(),
+        )
+        aggregates = (
+            journal_entry_items.annotate(bucket=bucket)
+            .values("account", "bucket")
+            .annotate(**debit_credit_total_annotations())
+            .order_by()
+        )
+
+        buckets = [{} for _ in self.cutoffs]
+        for aggregate in aggregates:
+            buckets[aggregate["bucket"]][aggregate["account"]] = (
+                aggregate["debit_total"],
+                aggregate["credit_total"],
             )
-        ),
-    }
+        return buckets
+
+    def _sum_buckets(self, buckets, after, through):
+        totals = {}
+        for i in range(self._cutoff_index[after] + 1, self._cutoff_index[through] + 1):
+            _sum_totals(totals, buckets[i])
+        return totals
+
+    def get_cumulative(self, end_date):
+        """Totals for every item dated on or before `end_date`."""
+        return LedgerTotals(
+            self.accounts, self.cumulative[self._cutoff_index[end_date]]
+        )
+
+    def get_flows(self, after, through):
+        """Totals for items dated after `after`, up to and including `through`."""
+        return LedgerTotals(
+            self.accounts, self._sum_buckets(self.buckets, after, through)
+        )
+
+    def get_investing_flows(self, after, through):
+        return self._sum_buckets(self.investing_buckets, after, through)
+
+
+def _to_date(value):
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    return value
+
+
+def _from_cents(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+class FrameLedger:
+    """Every journal entry item up to `end_date`, loaded once into columns.
+
+    The in-memory counterpart of PeriodLedger, answering the same questions
+    with vectorized pandas groupbys instead of database aggregates. Items are
+    sorted by date, so any window is a slice and its totals one groupby; unlike
+    PeriodLedger, the dates need not be known up front. Amounts are held as
+    integer cents, so sums are exact. Suited to heavy analytic calls that ask
+    many windows of one ledger: multi-year trends and the cash-flow discrepancy
+    bisection in diagnose_cash_flow_discrepancy.
+    """
+
+    COLUMNS = [
+        "date",
+        "account_id",
+        "type",
+        "amount",
+        "sub_type",
+        "cash_classification",
+    ]
+
+    def __init__(self, end_date=None):
+        self.accounts = list(Account.objects.all())
+        items = JournalEntryItem.objects.all()
+        if end_date is not None:
+            items = items.filter(journal_entry__date__lte=end_date)
+        rows = items.values_list(
+            "journal_entry__date",
+            "account_id",
+            "type",
+            "amount",
+            "account__sub_type",
+            "journal_entry__cash_classification",
+        ).order_by("journal_entry__date")
+        frame = pd.DataFrame.from_records(list(rows), columns=self.COLUMNS)
+
+        # datetime64[D] rather than pandas timestamps, which stop at 2262.
+        self.dates = np.array(frame["date"].tolist(), dtype="datetime64[D]")
+        cents = (frame["amount"].astype(float) * 100).round().astype("int64")
+        is_debit = frame["type"] == JournalEntryItem.JournalEntryType.DEBIT
+        frame["debit_cents"] = cents.where(is_debit, 0)
+        frame["credit_cents"] = cents.where(~is_debit, 0)
+
+        # CashFlowStatement.CASH_ENTRY
+        frame["is_investing"] = frame["sub_type"].isin(
+            Account.INVESTMENT_SUB_TYPES
+        ) & (frame["cash_classification"] == JournalEntry.CashClassification.CASH)
+        self.frame = frame
+
+    def _position(self, day):
+        """Index just past the last item dated on or before `day`."""
+        return self.dates.searchsorted(
+            np.datetime64(_to_date(day), "D"), side="right"
+        )
+
+    def _slice(self, after, through):
+        start = 0 if after is None else self._position(after)
+        return self.frame.iloc[start : self._position(through)]
+
+    @staticmethod
+    def _get_totals(frame):
+        sums = frame.groupby("account_id")[["debit_cents", "credit_cents"]].sum()
+        return {
+            account_id: (_from_cents(debits), _from_cents(credits))
+            for account_id, debits, credits in sums.itertuples()
+        }
+
+    def get_cumulative(self, end_date):
+        """Totals for every item dated on or before `end_date`."""
+        return LedgerTotals(
+            self.accounts, self._get_totals(self._slice(None, end_date))
+        )
+
+    def get_flows(self, after, through):
+        """Totals for items dated after `after`, up to and including `through`."""
+        return LedgerTotals(
+            self.accounts, self._get_totals(self._slice(after, through))
+        )
+
+    def get_investing_flows(self, after, through):
+        frame = self._slice(after, through)
+        return self._get_totals(frame[frame["is_investing"]])
 
 
 class Metric:
@@ -126,8 +356,11 @@ class Metric:
 
 
 class Statement:
-    def __init__(self, end_date):
+    _balance_index = None
+
+    def __init__(self, end_date, ledger_totals=None):
         self.end_date = end_date
+        self.ledger_totals = ledger_totals
 
     # TODO: Is there a reason this is a staticmethod?
     @staticmethod
@@ -151,55 +384,36 @@ class Statement:
     def get_balances(self):
         if isinstance(self, IncomeStatement):
             ACCOUNT_TYPES = ["income", "expense"]
-            aggregates = JournalEntryItem.objects.filter(
-                account__type__in=ACCOUNT_TYPES,
-                journal_entry__date__gte=self.start_date,
-                journal_entry__date__lte=self.end_date,
-            )
         else:
             ACCOUNT_TYPES = ["asset", "liability", "equity"]
-            aggregates = JournalEntryItem.objects.filter(
-                account__type__in=ACCOUNT_TYPES, journal_entry__date__lte=self.end_date
-            )
-
-        aggregates = list(
-            aggregates.values("account__name").annotate(
-                **_debit_credit_total_annotations()
-            )
-        )
-
-        # Convert to account objects and add accounts without any activity
-        type_objects = [
-            Account.Type[type_value.upper()] for type_value in ACCOUNT_TYPES
-        ]
-        eligible_accounts = Account.objects.filter(type__in=type_objects)
-        for account in eligible_accounts:
-            account_in_aggregates = False
-            for aggregate in aggregates:
-                if account.name == aggregate["account__name"]:
-                    aggregate["account"] = account
-                    account_in_aggregates = True
-                    break
-            if not account_in_aggregates:
-                aggregates.append(
-                    {
-                        "account": account,
-                        "account__name": account.name,
-                        "debit_total": 0,
-                        "credit_total": 0,
-                    }
-                )
 
         # TODO: Set this further up
         balance_type = "flow"
         if isinstance(self, BalanceSheet):
             balance_type = "stock"
 
+        ledger_totals = self.ledger_totals
+        if ledger_totals is None:
+            start_date = self.start_date if isinstance(self, IncomeStatement) else None
+            ledger_totals = LedgerTotals.load(ACCOUNT_TYPES, self.end_date, start_date)
+
         balances = self._get_balance_from_aggregates(
-            aggregates, self.end_date, balance_type
+            ledger_totals.get_aggregates(ACCOUNT_TYPES), self.end_date, balance_type
         )
         return balances
 
+    def get_balance_index(self):
+        """{account_id: Balance} over self.balances, built on first use.
+
+        Synthetic display rows (unsaved accounts) have no id and are left out.
+        """
+        if self._balance_index is None:
+            self._balance_index = {}
+            for balance in self.balances:
+                if balance.account.pk is not None:
+                    self._balance_index.setdefault(balance.account.pk, balance)
+        return self._balance_index
+
     def get_summaries(self):
         summary_metrics = {}
         for balance in self.balances:
@@ -219,10 +433,28 @@ class Statement:
 
 
 class CashFlowStatement(Statement):
-    def __init__(self, income_statement, start_balance_sheet, end_balance_sheet):
+    # Items of entries with no non-cash leg (an unrealized-gain mark or a
+    # depreciation drawdown). A real purchase or sale touches neither, so it
+    # stays in investing. See JournalEntry.classify.
+    CASH_ENTRY = Q(
+        journal_entry__cash_classification=JournalEntry.CashClassification.CASH
+    )
+
+    _deltas_by_sub_type = None
+
+    def __init__(
+        self,
+        income_statement,
+        start_balance_sheet,
+        end_balance_sheet,
+        investing_totals=None,
+    ):
         self.income_statement = income_statement
         self.start_balance_sheet = start_balance_sheet
         self.end_balance_sheet = end_balance_sheet
+        # Optional {account_id: (debits, credits)} of the investing items, as
+        # PeriodLedger supplies; None selects them from the database.
+        self.investing_totals = investing_totals
         self.balance_sheet_deltas = self.get_balance_sheet_account_deltas()
         self.net_income_less_gains_and_losses = (
             self.income_statement.net_income - self.income_statement.investment_gains
@@ -271,6 +503,30 @@ class CashFlowStatement(Statement):
             ),
         ]
 
+    @classmethod
+    def from_ledger(cls, ledger, start_date, end_date):
+        """The statement for [start_date, end_date], read entirely from `ledger`.
+
+        `ledger` is a PeriodLedger holding both window edges, or a FrameLedger;
+        no further queries are made.
+        """
+        start_balance_date = start_date - timedelta(days=1)
+        return cls(
+            income_statement=IncomeStatement(
+                end_date=end_date,
+                start_date=start_date,
+                ledger_totals=ledger.get_flows(start_balance_date, end_date),
+            ),
+            start_balance_sheet=BalanceSheet(
+                end_date=start_balance_date,
+                ledger_totals=ledger.get_cumulative(start_balance_date),
+            ),
+            end_balance_sheet=BalanceSheet(
+                end_date=end_date, ledger_totals=ledger.get_cumulative(end_date)
+            ),
+            investing_totals=ledger.get_investing_flows(start_balance_date, end_date),
+        )
+
     def get_cash_flow_discrepancy(self):
         cash_delta = self.get_cash_balance(
             self.end_balance_sheet
@@ -330,25 +586,19 @@ class CashFlowStatement(Statement):
         return levered_after_tax_cash_flow + restricted_cash_flow
 
     def get_balance_sheet_account_deltas(self):
-        accounts = Account.objects.filter(
-            type__in=[Account.Type.ASSET, Account.Type.LIABILITY, Account.Type.EQUITY]
-        )
+        account_types = [
+            Account.Type.ASSET,
+            Account.Type.LIABILITY,
+            Account.Type.EQUITY,
+        ]
+        if self.end_balance_sheet.ledger_totals is not None:
+            accounts = self.end_balance_sheet.ledger_totals.get_accounts(account_types)
+        else:
+            accounts = Account.objects.filter(type__in=account_types)
         account_deltas = []
         for account in accounts:
-            starting_balance = sum(
-                [
-                    balance.amount
-                    for balance in self.start_balance_sheet.balances
-                    if balance.account == account
-                ]
-            )
-            ending_balance = sum(
-                [
-                    balance.amount
-                    for balance in self.end_balance_sheet.balances
-                    if balance.account == account
-                ]
-            )
+            starting_balance = self.start_balance_sheet.get_balance(account)
+            ending_balance = self.end_balance_sheet.get_balance(account)
             delta = ending_balance - starting_balance
             if account.type == Account.Type.ASSET:
                 delta = delta * -1
@@ -360,6 +610,17 @@ class CashFlowStatement(Statement):
 
         return account_deltas
 
+    def get_deltas_by_sub_type(self, sub_type):
+        # Group the deltas in one pass; the operations and financing sections
+        # then pick their sub_types out of it.
+        if self._deltas_by_sub_type is None:
+            self._deltas_by_sub_type = {}
+            for balance in self.balance_sheet_deltas:
+                self._deltas_by_sub_type.setdefault(
+                    balance.account.sub_type, []
+                ).append(balance)
+        return list(self._deltas_by_sub_type.get(sub_type, []))
+
     def get_cash_from_operations_balances(self):
         realized_net_income_account = Account(
             name="Realized Net Income",
@@ -383,93 +644,66 @@ class CashFlowStatement(Statement):
             for balance in self.income_statement.balances
             if balance.account.is_depreciation
         ]
-        accounts_receivable_accounts = [
-            balance
-            for balance in self.balance_sheet_deltas
-            if balance.account.sub_type == Account.SubType.ACCOUNTS_RECEIVABLE
-        ]
-        short_term_debt_accounts = [
-            balance
-            for balance in self.balance_sheet_deltas
-            if balance.account.sub_type == Account.SubType.SHORT_TERM_DEBT
-        ]
-        taxes_payable_accounts = [
-            balance
-            for balance in self.balance_sheet_deltas
-            if balance.account.sub_type == Account.SubType.TAXES_PAYABLE
-        ]
-        prepaid_expenses_accounts = [
-            balance
-            for balance in self.balance_sheet_deltas
-            if balance.account.sub_type == Account.SubType.PREPAID_EXPENSES
-        ]
         return (
             net_income_less_gains_and_losses
-            + accounts_receivable_accounts
-            + prepaid_expenses_accounts
-            + short_term_debt_accounts
-            + taxes_payable_accounts
+            + self.get_deltas_by_sub_type(Account.SubType.ACCOUNTS_RECEIVABLE)
+            + self.get_deltas_by_sub_type(Account.SubType.PREPAID_EXPENSES)
+            + self.get_deltas_by_sub_type(Account.SubType.SHORT_TERM_DEBT)
+            + self.get_deltas_by_sub_type(Account.SubType.TAXES_PAYABLE)
             + depreciation
         )
 
     def get_cash_from_financing_balances(self):
-        long_term_debt = [
-            balance
-            for balance in self.balance_sheet_deltas
-            if balance.account.sub_type == Account.SubType.LONG_TERM_DEBT
-        ]
-        return long_term_debt
+        return self.get_deltas_by_sub_type(Account.SubType.LONG_TERM_DEBT)
+
+    @staticmethod
+    def _get_investing_adjustment(account, debits, credits):
+        if account.type in [Account.Type.LIABILITY, Account.Type.INCOME]:
+            return debits - credits
+        return credits - debits
 
     def get_cash_from_investing_balances(self):
-        start_date = self.income_statement.start_date
-        end_date = self.income_statement.end_date
-        account_sub_types = Account.INVESTMENT_SUB_TYPES
-        # Drop entries whose offsetting leg is non-cash: an unrealized-gain mark
-        # or a depreciation drawdown. A real purchase or sale touches neither,
-        # so it stays in investing. One .exclude() keeps it to a single subquery.
-        is_non_cash_offset = Q(
-            journal_entry__journal_entry_items__account__sub_type=Account.SubType.UNREALIZED_INVESTMENT_GAINS
-        ) | Q(journal_entry__journal_entry_items__account__is_depreciation=True)
-
-        # Use select_related to fetch related Account objects
-        journal_entry_items = (
-            JournalEntryItem.objects.filter(
-                journal_entry__date__gte=start_date,
-                journal_entry__date__lte=end_date,
-                account__sub_type__in=account_sub_types,
-            )
-            .exclude(is_non_cash_offset)
-            .select_related("account")
-        )
-
-        # Efficient processing of items
-        account_adjustments = {}
-        for item in journal_entry_items:
-            account = item.account
-            adjustment = (
-                item.amount
-                if account.type in [Account.Type.LIABILITY, Account.Type.INCOME]
-                else -item.amount
-            )
-            adjustment *= (
-                -1 if item.type == JournalEntryItem.JournalEntryType.CREDIT else 1
-            )
-            account_adjustments.setdefault(account, 0)
-            account_adjustments[account] += adjustment
+        investing_totals = self.investing_totals
+        if investing_totals is None:
+            investing_totals = self._select_investing_totals()
 
-        # Constructing balances
-        balances = [
-            Balance(account=key, amount=value, date=self.end_balance_sheet.end_date)
-            for key, value in account_adjustments.items()
-        ]
+        balances = []
+        for account in self.end_balance_sheet.ledger_totals.accounts:
+            if account.pk not in investing_totals:
+                continue
+            debits, credits = investing_totals[account.pk]
+            balances.append(
+                Balance(
+                    account=account,
+                    amount=self._get_investing_adjustment(account, debits, credits),
+                    date=self.end_balance_sheet.end_date,
+                )
+            )
         sorted_balances = sorted(balances, key=lambda k: k.account.name)
 
         return sorted_balances
 
+    def _select_investing_totals(self):
+        aggregates = (
+            JournalEntryItem.objects.filter(
+                self.CASH_ENTRY,
+                journal_entry__date__gte=self.income_statement.start_date,
+                journal_entry__date__lte=self.income_statement.end_date,
+                account__sub_type__in=Account.INVESTMENT_SUB_TYPES,
+            )
+            .values("account")
+            .annotate(**debit_credit_total_annotations())
+            .order_by()
+        )
+        return {
+            aggregate["account"]: (aggregate["debit_total"], aggregate["credit_total"])
+            for aggregate in aggregates
+        }
+
 
 class IncomeStatement(Statement):
-    def __init__(self, end_date, start_date):
-        super().__init__(end_date)
+    def __init__(self, end_date, start_date, ledger_totals=None):
+        super().__init__(end_date, ledger_totals)
         self.start_date = start_date
         self.balances = self.get_balances()
 
@@ -521,7 +755,7 @@ class IncomeStatement(Statement):
         ).values(
             "entity", "entity__name", "account__type", "account__sub_type"
         ).annotate(
-            **_debit_credit_total_annotations()
+            **debit_credit_total_annotations()
         )
 
         entity_balances = []
@@ -640,8 +874,13 @@ class IncomeStatement(Statement):
 
 
 class BalanceSheet(Statement):
-    def __init__(self, end_date):
-        super().__init__(end_date)
+    def __init__(self, end_date, ledger_totals=None):
+        # One read over every account type serves both the asset/liability/
+        # equity balances and the all-time income statement behind retained
+        # earnings and the unrealized-gains split.
+        if ledger_totals is None:
+            ledger_totals = LedgerTotals.load(list(Account.Type), end_date)
+        super().__init__(end_date, ledger_totals)
         self.balances = self.get_balances()
         investment_gains_losses, net_retained_earnings = (
             self.get_retained_earnings_values()
@@ -675,8 +914,12 @@ class BalanceSheet(Statement):
         self.metrics = self.get_metrics()
 
     def get_retained_earnings_values(self):
+        # The sheet's all-time totals already cover the income/expense history,
+        # so the retained-earnings income statement reads them too.
         income_statement = IncomeStatement(
-            end_date=self.end_date, start_date="1970-01-01"
+            end_date=self.end_date,
+            start_date="1970-01-01",
+            ledger_totals=self.ledger_totals,
         )
         retained_earnings = income_statement.get_net_income()
 
@@ -693,16 +936,11 @@ class BalanceSheet(Statement):
         return investment_gains_losses, net_retained_earnings
 
     def get_balance(self, account):
-        try:
-            balance = [
-                balance.amount
-                for balance in self.balances
-                if balance.account == account
-            ][0]
+        balance = self.get_balance_index().get(account.pk)
         # Need this when there is no balance for a given account
-        except IndexError:
-            balance = 0
-        return balance
+        if balance is None:
+            return 0
+        return balance.amount
 
     def get_metrics(self):
         metrics = [
@@ -784,3 +1022,67 @@ class BalanceSheet(Statement):
         if assets == 0:
             return None
         return liquid_assets / assets
+
+
+class StatementCache:
+    """Computed statements, keyed by (statement type, dates, ledger version).
+
+    The ledger changes far less often than statements are read, so the report
+    endpoints and statement pages fetch through here. Any write bumps
+    LedgerVersion, which moves every key; stale entries are never served and
+    simply age out of the backend's LRU. The backend is the "statements" entry
+    in settings.CACHES. Hit/miss counters are per process.
+    """
+
+    def __init__(self, alias="statements"):
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def get_key(name, args, version):
+        # Dates and their ISO strings must share a key.
+        return ":".join([name, *(str(arg) for arg in args), version])
+
+    def get_or_build(self, name, args, build):
+        """build(), or its cached result for ``name``/``args`` at this version."""
+        key = self.get_key(name, args, LedgerVersion.get_current())
+        result = self.cache.get(key)
+        if result is None:
+            self.misses += 1
+            result = build()
+            self.cache.set(key, result)
+        else:
+            self.hits += 1
+        return result
+
+    def get_income_statement(self, end_date, start_date):
+        return self.get_or_build(
+            "IncomeStatement",
+            (end_date, start_date),
+            lambda: IncomeStatement(end_date=end_date, start_date=start_date),
+        )
+
+    def get_balance_sheet(self, end_date):
+        return self.get_or_build(
+            "BalanceSheet", (end_date,), lambda: BalanceSheet(end_date=end_date)
+        )
+
+    def get_trend_balances(self, start_date, end_date):
+        return self.get_or_build(
+            "Trend",
+            (start_date, end_date),
+            lambda: Trend(start_date, end_date).get_balances(),
+        )
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+statement_cache = StatementCache()
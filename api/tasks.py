@@ -4,9 +4,10 @@ from celery import shared_task
 from django.utils import timezone
 
 from api.aws_services import download_file_from_s3, wait_for_textract_completion
-from api.models import S3File
+from api.models import S3File, TransactionImport
 from api.services.gemini_services import parse_paystub_with_gemini
 from api.services.paystub_upload_services import create_paystubs_from_data
+from api.services.transaction_upload_services import run_transactions_import
 
 logger = logging.getLogger(__name__)
 
@@ -50,3 +51,33 @@ def process_gemini_paystub(s3file_pk: int) -> None:
     s3file.status = S3File.Status.COMPLETE
     s3file.analysis_complete = timezone.now()
     s3file.save(update_fields=["status", "analysis_complete"])
+
+
+@shared_task
+def import_transactions_csv(transaction_import_pk: int) -> None:
+    """
+    Celery task: downloads a transaction CSV from S3 and imports it, recording
+    status and row progress on the TransactionImport.
+    """
+    transaction_import = TransactionImport.objects.select_related(
+        "account__csv_profile"
+    ).get(pk=transaction_import_pk)
+
+    transaction_import.status = TransactionImport.Status.PROCESSING
+    transaction_import.save(update_fields=["status"])
+
+    try:
+        file_bytes = download_file_from_s3(transaction_import.s3_filename)
+        run_transactions_import(transaction_import, file_bytes)
+    except Exception as exc:
+        logger.exception(
+            "CSV import failed for TransactionImport pk=%s", transaction_import_pk
+        )
+        transaction_import.status = TransactionImport.Status.FAILED
+        transaction_import.error_message = str(exc)
+        transaction_import.save(update_fields=["status", "error_message"])
+        raise
+
+    transaction_import.status = TransactionImport.Status.COMPLETE
+    transaction_import.completed = timezone.now()
+    transaction_import.save(update_fields=["status", "completed"])
@@ -71,6 +71,28 @@ class AccountModelTest(TestCase):
         balance = self.income_account.get_balance(end_date=self.income_statement_date, start_date=self.income_statement_date)
         self.assertEqual(balance, Decimal('50.00'), "Balance should be credits minus debits for income account")
 
+    def test_get_balances_in_one_query(self):
+        earlier = JournalEntryFactory(
+            date=self.income_statement_date - timezone.timedelta(days=40)
+        )
+        JournalEntryItemFactory(journal_entry=earlier, account=self.asset_account,
+                                type=JournalEntryItem.JournalEntryType.DEBIT, amount=Decimal('10.00'))
+        JournalEntryItemFactory(journal_entry=earlier, account=self.income_account,
+                                type=JournalEntryItem.JournalEntryType.CREDIT, amount=Decimal('10.00'))
+        accounts = [self.asset_account, self.income_account, self.account]
+
+        with self.assertNumQueries(1):
+            balances = Account.get_balances(
+                accounts,
+                end_date=self.income_statement_date,
+                start_date=self.income_statement_date - timezone.timedelta(days=5),
+            )
+
+        # The asset carries its whole history; the income account only the window
+        self.assertEqual(balances[self.asset_account], Decimal('60.00'))
+        self.assertEqual(balances[self.income_account], Decimal('50.00'))
+        self.assertEqual(balances[self.account], 0)
+
     def test_is_investment_true_for_investment_sub_types(self):
         for sub_type in Account.INVESTMENT_SUB_TYPES:
             account = AccountFactory(type=Account.Type.ASSET, sub_type=sub_type)
@@ -1,4 +1,8 @@
+import random
+import re
+
 from django.test import TestCase
+from api.models import AutoTagMatcher, AutoTagRule, Transaction
 from api.tests.testing_factories import AutoTagFactory, PrefillFactory, AccountFactory
 
 class AutoTagModelTest(TestCase):
@@ -28,3 +32,77 @@ class PrefillModelTest(TestCase):
         """Test the string representation of the Prefill model."""
         self.assertEqual(str(self.prefill), self.prefill.name, "String representation should be the name of the Prefill")
 
+
+
+class AutoTagMatcherTest(TestCase):
+    @staticmethod
+    def _first_match(rules, description):
+        # The pk-ordered first-match loop the matcher replaces.
+        cleaned = re.sub(" +", " ", description.strip().lower())
+        for rule in rules:
+            if rule.search_string.lower() in cleaned:
+                return rule
+        return None
+
+    def test_matches_first_match_loop(self):
+        random.seed(7)
+        alphabet = "abc "
+        rules = [
+            AutoTagRule(
+                pk,
+                "".join(random.choices(alphabet, k=random.randint(1, 4))),
+                None, "", None, None,
+            )
+            for pk in range(60)
+        ]
+        rules.append(AutoTagRule(60, "ABC", None, "", None, None))
+        matcher = AutoTagMatcher(rules)
+        for _ in range(500):
+            description = "".join(
+                random.choices(alphabet + "AB", k=random.randint(0, 20))
+            )
+            self.assertEqual(
+                matcher.match(description),
+                self._first_match(rules, description),
+                description,
+            )
+
+    def test_overlapping_patterns_keep_priority(self):
+        rules = [
+            AutoTagRule(1, "shell oil", None, "", None, None),
+            AutoTagRule(2, "hell", None, "", None, None),
+            AutoTagRule(3, "she", None, "", None, None),
+        ]
+        matcher = AutoTagMatcher(rules)
+        self.assertEqual(matcher.match("SHELL  OIL 1234").pk, 1)
+        self.assertEqual(matcher.match("shell gas").pk, 2)
+        self.assertEqual(matcher.match("she sells").pk, 3)
+        self.assertIsNone(matcher.match("amazon"))
+
+    def test_recompiles_when_an_autotag_changes(self):
+        tag = AutoTagFactory(search_string="coffee")
+        self.assertEqual(AutoTagMatcher.get_current().match("COFFEE shop").pk, tag.pk)
+        first = AutoTagMatcher.get_current()
+        self.assertIs(AutoTagMatcher.get_current(), first)
+
+        tag.search_string = "tea"
+        tag.save()
+        self.assertIsNone(AutoTagMatcher.get_current().match("COFFEE shop"))
+        tag.delete()
+        self.assertIsNone(AutoTagMatcher.get_current().match("tea house"))
+
+    def test_unchanged_table_is_checked_with_one_query(self):
+        for search_string in ["coffee", "tea", "rent"]:
+            AutoTagFactory(search_string=search_string)
+        first = AutoTagMatcher.get_current()
+        with self.assertNumQueries(1):
+            self.assertIs(AutoTagMatcher.get_current(), first)
+
+    def test_apply_autotags(self):
+        account = AccountFactory()
+        AutoTagFactory(search_string="grocer", account=account, prefill=None,
+                       entity=None, transaction_type="")
+        transaction = Transaction(description="  Local   GROCER #12 ", type="transfer")
+        Transaction.apply_autotags([transaction])
+        self.assertEqual(transaction.suggested_account, account)
+        self.assertEqual(transaction.type, Transaction.TransactionType.PURCHASE)
@@ -0,0 +1,285 @@
+import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.models import (
+    Account,
+    AccountBalanceSnapshot,
+    JournalEntryItem,
+    LedgerVersion,
+    defer_ledger_refresh,
+)
+from api.services.journal_entry_services import save_journal_entry
+from api.services.recharacterize_services import apply_operation, revert_change
+from api.services.transaction_services import delete_transaction
+from api.statement import BalanceSheet, IncomeStatement
+from api.tests.scenario_builders import create_closed_transaction_with_journal_entry
+from api.tests.testing_factories import (
+    AccountFactory,
+    EntityFactory,
+    JournalEntryFactory,
+    TransactionFactory,
+)
+
+
+def snapshot_cells():
+    """{(account_id, month): (debits, credits)} summed across entities."""
+    cells = {}
+    for snapshot in AccountBalanceSnapshot.objects.all():
+        key = (snapshot.account_id, snapshot.month)
+        debits, credits = cells.get(key, (0, 0))
+        cells[key] = (debits + snapshot.debit_total, credits + snapshot.credit_total)
+    return {key: value for key, value in cells.items() if value != (0, 0)}
+
+
+def recomputed_cells():
+    AccountBalanceSnapshot.rebuild()
+    return snapshot_cells()
+
+
+class AccountBalanceSnapshotTest(TestCase):
+    def setUp(self):
+        self.cash = AccountFactory(
+            name="1000-Cash", type=Account.Type.ASSET, sub_type=Account.SubType.CASH
+        )
+        self.groceries = AccountFactory(
+            name="5000-Groceries",
+            type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+        )
+        self.dining = AccountFactory(
+            name="5100-Dining",
+            type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+        )
+        self.salary = AccountFactory(
+            name="4000-Salary", type=Account.Type.INCOME, sub_type=Account.SubType.SALARY
+        )
+
+    def _entry(self, date, debit, credit, amount):
+        return create_closed_transaction_with_journal_entry(
+            date=date,
+            debit_account=debit,
+            credit_account=credit,
+            amount=Decimal(amount),
+            transaction_account=self.cash,
+        )
+
+    def assert_snapshot_current(self):
+        current = snapshot_cells()
+        self.assertEqual(current, recomputed_cells())
+
+    def test_created_items_land_in_their_month(self):
+        self._entry("2024-01-15", self.groceries, self.cash, "40")
+        self._entry("2024-01-20", self.groceries, self.cash, "10")
+        self._entry("2024-02-01", self.groceries, self.cash, "5")
+
+        cells = snapshot_cells()
+        self.assertEqual(
+            cells[(self.groceries.pk, datetime.date(2024, 1, 1))],
+            (Decimal("50"), Decimal("0")),
+        )
+        self.assertEqual(
+            cells[(self.cash.pk, datetime.date(2024, 2, 1))],
+            (Decimal("0"), Decimal("5")),
+        )
+
+    def test_save_journal_entry_moves_edited_items_between_cells(self):
+        transaction = TransactionFactory(
+            date=datetime.date(2024, 3, 10), account=self.cash, amount=Decimal("-25")
+        )
+        save_journal_entry(
+            transaction,
+            [{"account": self.groceries, "amount": Decimal("25")}],
+            [{"account": self.cash, "amount": Decimal("25")}],
+        )
+        debit = transaction.journal_entry.journal_entry_items.get(
+            type=JournalEntryItem.JournalEntryType.DEBIT
+        )
+        save_journal_entry(
+            transaction,
+            [{"id": debit, "account": self.dining, "amount": Decimal("25")}],
+            [{"account": self.cash, "amount": Decimal("25")}],
+        )
+
+        cells = snapshot_cells()
+        self.assertNotIn((self.groceries.pk, datetime.date(2024, 3, 1)), cells)
+        self.assertEqual(
+            cells[(self.dining.pk, datetime.date(2024, 3, 1))],
+            (Decimal("25"), Decimal("0")),
+        )
+        self.assert_snapshot_current()
+
+    def test_deleting_a_transaction_clears_its_cells(self):
+        entry = self._entry("2024-04-02", self.groceries, self.cash, "12")
+        delete_transaction(entry["transaction"].pk)
+        self.assertEqual(snapshot_cells(), {})
+
+    def test_single_item_writes_apply_deltas(self):
+        journal_entry = JournalEntryFactory(date=datetime.date(2024, 5, 10))
+
+        def assert_matches_items():
+            expected = {}
+            for row in AccountBalanceSnapshot.compute(JournalEntryItem.objects.all()):
+                if (row.debit_total, row.credit_total) != (0, 0):
+                    expected[(row.account_id, row.month)] = (
+                        row.debit_total,
+                        row.credit_total,
+                    )
+            self.assertEqual(snapshot_cells(), expected)
+
+        with patch.object(AccountBalanceSnapshot, "refresh") as refresh:
+            item = JournalEntryItem.objects.create(
+                journal_entry=journal_entry,
+                type=JournalEntryItem.JournalEntryType.DEBIT,
+                amount=Decimal("30"),
+                account=self.groceries,
+            )
+            assert_matches_items()
+            item.amount = Decimal("12.50")
+            item.account = self.dining
+            item.entity = EntityFactory()
+            item.save()
+            assert_matches_items()
+            item.delete()
+            assert_matches_items()
+        refresh.assert_not_called()
+
+    def test_deleting_an_entry_refreshes_once(self):
+        def count_queries(item_count, delete):
+            transaction = TransactionFactory(
+                date=datetime.date(2024, 8, 5), account=self.cash, amount=Decimal("-1")
+            )
+            journal_entry = JournalEntryFactory(
+                date=transaction.date, transaction=transaction
+            )
+            for _ in range(item_count):
+                JournalEntryItem.objects.create(
+                    journal_entry=journal_entry,
+                    type=JournalEntryItem.JournalEntryType.DEBIT,
+                    amount=Decimal("1"),
+                    account=self.groceries,
+                )
+            with patch.object(
+                LedgerVersion, "bump", wraps=LedgerVersion.bump
+            ) as bump, CaptureQueriesContext(connection) as queries:
+                delete(journal_entry)
+            bump.assert_called_once()
+            self.assert_snapshot_current()
+            return len(queries)
+
+        for delete in [
+            lambda journal_entry: journal_entry.delete(),
+            lambda journal_entry: delete_transaction(journal_entry.transaction_id),
+        ]:
+            self.assertEqual(count_queries(2, delete), count_queries(11, delete))
+
+    def test_deferred_refresh_runs_once_for_many_item_writes(self):
+        entries = [
+            self._entry(f"2024-06-0{day}", self.groceries, self.cash, "10")
+            for day in range(1, 6)
+        ]
+        with patch.object(
+            AccountBalanceSnapshot, "refresh", wraps=AccountBalanceSnapshot.refresh
+        ) as refresh:
+            with defer_ledger_refresh():
+                for entry in entries:
+                    entry["debit_item"].delete()
+                entries[0]["journal_entry"].delete()
+                JournalEntryItem.objects.create(
+                    journal_entry=entries[1]["journal_entry"],
+                    type=JournalEntryItem.JournalEntryType.DEBIT,
+                    amount=Decimal("10"),
+                    account=self.dining,
+                )
+        refresh.assert_called_once()
+        self.assert_snapshot_current()
+        self.assertEqual(
+            snapshot_cells()[(self.dining.pk, datetime.date(2024, 6, 1))],
+            (Decimal("10"), Decimal("0")),
+        )
+
+    def test_deferred_refresh_is_skipped_when_the_block_raises(self):
+        entry = self._entry("2024-07-01", self.groceries, self.cash, "10")
+        with patch.object(AccountBalanceSnapshot, "refresh") as refresh:
+            with self.assertRaises(ValueError):
+                with defer_ledger_refresh():
+                    entry["debit_item"].delete()
+                    raise ValueError
+        refresh.assert_not_called()
+
+    def test_save_journal_entry_refreshes_once(self):
+        transaction = TransactionFactory(
+            date=datetime.date(2024, 3, 10), account=self.cash, amount=Decimal("-25")
+        )
+        save_journal_entry(
+            transaction,
+            [
+                {"account": self.groceries, "amount": Decimal("20")},
+                {"account": self.dining, "amount": Decimal("5")},
+            ],
+            [{"account": self.cash, "amount": Decimal("25")}],
+        )
+        with patch.object(
+            AccountBalanceSnapshot, "refresh", wraps=AccountBalanceSnapshot.refresh
+        ) as refresh:
+            # Drops two of the three items.
+            save_journal_entry(
+                transaction,
+                [{"account": self.groceries, "amount": Decimal("25")}],
+                [{"account": self.cash, "amount": Decimal("25")}],
+            )
+        refresh.assert_called_once()
+        self.assert_snapshot_current()
+
+    def test_recharacterize_apply_and_revert_keep_snapshot_current(self):
+        self._entry("2024-05-05", self.groceries, self.cash, "30")
+        ops = [
+            {
+                "filter": {"account": "5000-Groceries"},
+                "action": {"type": "change_account", "to_account": "5100-Dining"},
+            }
+        ]
+        result = apply_operation(ops, 0)
+        self.assertTrue(result.success)
+        self.assertNotIn(
+            (self.groceries.pk, datetime.date(2024, 5, 1)), snapshot_cells()
+        )
+        self.assert_snapshot_current()
+
+        revert_change(result.change_id)
+        self.assertNotIn((self.dining.pk, datetime.date(2024, 5, 1)), snapshot_cells())
+        self.assert_snapshot_current()
+
+    def test_statements_combine_snapshot_months_with_raw_edges(self):
+        self._entry("2023-12-31", self.cash, self.salary, "1000")
+        self._entry("2024-01-10", self.groceries, self.cash, "100")
+        self._entry("2024-02-14", self.groceries, self.cash, "20")
+        self._entry("2024-02-20", self.groceries, self.cash, "7")
+        self._entry("2024-03-03", self.groceries, self.cash, "3")
+
+        # Mid-month window: Jan 10 is excluded, the Feb 14 and Mar 3 edges are
+        # read from raw items, the whole of February from the snapshot.
+        income_statement = IncomeStatement(
+            end_date=datetime.date(2024, 3, 5), start_date=datetime.date(2024, 1, 11)
+        )
+        groceries = [
+            b for b in income_statement.balances if b.account == self.groceries
+        ][0]
+        self.assertEqual(groceries.amount, Decimal("30"))
+
+        balance_sheet = BalanceSheet(end_date=datetime.date(2024, 2, 15))
+        self.assertEqual(balance_sheet.get_balance(self.cash), Decimal("880"))
+
+    def test_get_totals_ignores_stale_rows_outside_whole_months(self):
+        self._entry("2024-06-15", self.groceries, self.cash, "9")
+        # Partial-month windows never read the snapshot.
+        AccountBalanceSnapshot.objects.all().delete()
+        totals = AccountBalanceSnapshot.get_totals(
+            ["expense"], datetime.date(2024, 6, 20), datetime.date(2024, 6, 10)
+        )
+        self.assertEqual(totals[self.groceries.pk], (Decimal("9"), Decimal("0")))
@@ -87,7 +87,7 @@ class CSVProfileModelTest(TestCase):
     def test_clear_prepended_rows(self):
         copied_list = list(csv_data)
 
-        cleared_csv = self.csv_profile._clear_prepended_rows(copied_list)
+        cleared_csv = list(self.csv_profile._clear_prepended_rows(copied_list))
         self.assertEqual(len(cleared_csv),10)
         self.assertTrue('Total Value' not in cleared_csv[0])
         self.assertTrue('Trade Date' in cleared_csv[0])
@@ -95,7 +95,7 @@ class CSVProfileModelTest(TestCase):
         copied_list = list(csv_data)
         self.csv_profile.clear_prepended_until_value = ''
         self.csv_profile.save()
-        cleared_csv = self.csv_profile._clear_prepended_rows(copied_list)
+        cleared_csv = list(self.csv_profile._clear_prepended_rows(copied_list))
         self.assertEqual(len(cleared_csv),27)
         self.assertTrue('Total Value' in cleared_csv[0])
         self.assertTrue('Trade Date' not in cleared_csv[0])
@@ -104,7 +104,7 @@ class CSVProfileModelTest(TestCase):
         copied_list = list(csv_data)
 
         cleared_csv = self.csv_profile._clear_prepended_rows(copied_list)
-        list_of_dicts = self.csv_profile._list_of_lists_to_list_of_dicts(cleared_csv)
+        list_of_dicts = list(self.csv_profile._list_of_lists_to_list_of_dicts(cleared_csv))
         self.assertEqual(len(list_of_dicts),9)
         for row in list_of_dicts:
             self.assertTrue(isinstance(row, dict))
@@ -114,7 +114,7 @@ class CSVProfileModelTest(TestCase):
 
         cleared_csv = self.csv_profile._clear_prepended_rows(copied_list)
         list_of_dicts = self.csv_profile._list_of_lists_to_list_of_dicts(cleared_csv)
-        cleared_list = self.csv_profile._clear_extraneous_rows(list_of_dicts)
+        cleared_list = list(self.csv_profile._clear_extraneous_rows(list_of_dicts))
         self.assertEqual(len(cleared_list),3)
 
     def test_get_coalesced_amount(self):
@@ -203,6 +203,79 @@ class CSVProfileModelTest(TestCase):
         transaction = Transaction.objects.get(description='Dividends')
         self.assertEqual(transaction.type, Transaction.TransactionType.INCOME)
 
+    def test_transactions_created_in_batches_from_a_lazy_reader(self):
+        account = AccountFactory()
+        rows = iter(list(csv_data) + [{}])
+
+        with self.assertNumQueries(7):
+            # One clear-values query for the whole file, then a fingerprint
+            # lookup, an autotag rule lookup and an insert per batch of two.
+            batches = list(
+                self.csv_profile.iter_transaction_batches(rows, account, batch_size=2)
+            )
+
+        self.assertEqual([len(batch.transactions) for batch in batches], [2, 1])
+        self.assertEqual(Transaction.objects.filter(account=account).count(), 3)
+
+    def test_reimported_rows_are_skipped(self):
+        account = AccountFactory()
+        self.csv_profile.create_transactions_from_csv(list(csv_data), account)
+
+        with self.assertNumQueries(2):
+            batches = list(
+                self.csv_profile.iter_transaction_batches(list(csv_data), account)
+            )
+
+        self.assertEqual([batch.skipped for batch in batches], [3])
+        self.assertEqual(batches[0].transactions, [])
+        self.assertEqual(Transaction.objects.filter(account=account).count(), 3)
+
+    def test_repeated_rows_in_one_file_are_kept_apart(self):
+        account = AccountFactory()
+        data = list(csv_data) + [list(csv_data)[-1]]
+        created = self.csv_profile.create_transactions_from_csv(list(data), account)
+        self.assertEqual(len(created), 4)
+        self.assertEqual(len({transaction.fingerprint for transaction in created}), 4)
+
+        # An overlapping export holding one more copy of the repeat imports it
+        data.append(list(csv_data)[-1])
+        created = self.csv_profile.create_transactions_from_csv(data, account)
+        self.assertEqual([transaction.description for transaction in created], ['Brokerage Fee'])
+
+    def test_fingerprint_normalizes_description(self):
+        account = AccountFactory()
+        first = Transaction(
+            account=account, date=datetime.date(2024, 1, 2),
+            amount=Decimal('-4'), description=' Coffee   Shop',
+        )
+        second = Transaction(
+            account=account, date=datetime.date(2024, 1, 2),
+            amount=Decimal('-4.00'), description='coffee shop ',
+        )
+        self.assertEqual(first.get_fingerprint(), second.get_fingerprint())
+        self.assertNotEqual(first.get_fingerprint(), first.get_fingerprint(1))
+
+    def test_missing_prepended_marker_keeps_every_row(self):
+        self.csv_profile.clear_prepended_until_value = 'Not in the file'
+        cleared_csv = list(self.csv_profile._clear_prepended_rows(iter(csv_data)))
+        self.assertEqual(cleared_csv, csv_data)
+
+    def test_missing_prepended_marker_streams_large_files(self):
+        self.csv_profile.clear_prepended_until_value = 'Not in the file'
+        read = []
+
+        def rows():
+            for number in range(100_000):
+                row = ['2024-01-01', f'Row {number}', '1.00']
+                read.append(row)
+                yield row
+
+        cleared_csv = self.csv_profile._clear_prepended_rows(rows())
+        self.assertEqual(next(cleared_csv)[1], 'Row 0')
+        # Only the searched leading rows were read to produce the first one.
+        self.assertEqual(len(read), self.csv_profile.PREPENDED_ROWS_LIMIT)
+        self.assertEqual(sum(1 for _ in cleared_csv), 100_000 - 1)
+
 
     # search_string = models.CharField(max_length=20)
     # account = models.ForeignKey('Account',on_delete=models.CASCADE,null=True,blank=True)
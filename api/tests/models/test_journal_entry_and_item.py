@@ -46,3 +46,45 @@ class JournalEntryItemModelTest(TestCase):
         self.assertEqual(str(self.journal_entry_item), expected_representation, "String representation should be correct")
 
 
+
+
+class JournalEntryCashClassificationTest(TestCase):
+
+    def setUp(self):
+        self.cash = AccountFactory(type=Account.Type.ASSET, sub_type=Account.SubType.CASH)
+        self.brokerage = AccountFactory(
+            type=Account.Type.ASSET, sub_type=Account.SubType.SECURITIES_UNRESTRICTED
+        )
+        self.gains = AccountFactory(
+            type=Account.Type.INCOME, sub_type=Account.SubType.UNREALIZED_INVESTMENT_GAINS
+        )
+        self.depreciation = AccountFactory(
+            type=Account.Type.EXPENSE, sub_type=Account.SubType.OPERATING, is_depreciation=True
+        )
+
+    def _entry(self, *accounts):
+        journal_entry = JournalEntryFactory()
+        for account in accounts:
+            JournalEntryItemFactory(journal_entry=journal_entry, account=account)
+        journal_entry.refresh_from_db()
+        return journal_entry
+
+    def test_classifies_from_legs(self):
+        Classification = JournalEntry.CashClassification
+        self.assertEqual(self._entry(self.brokerage, self.cash).cash_classification, Classification.CASH)
+        self.assertEqual(self._entry(self.brokerage, self.gains).cash_classification, Classification.NON_CASH_MARK)
+        self.assertEqual(self._entry(self.depreciation, self.brokerage).cash_classification, Classification.DEPRECIATION)
+        self.assertEqual(self._entry(self.cash, self.brokerage, self.gains).cash_classification, Classification.MIXED)
+
+    def test_item_delete_reclassifies(self):
+        journal_entry = self._entry(self.brokerage, self.gains)
+        journal_entry.journal_entry_items.get(account=self.gains).delete()
+        journal_entry.refresh_from_db()
+        self.assertEqual(journal_entry.cash_classification, JournalEntry.CashClassification.CASH)
+
+    def test_account_change_reclassifies(self):
+        journal_entry = self._entry(self.brokerage, self.cash)
+        self.cash.sub_type = Account.SubType.UNREALIZED_INVESTMENT_GAINS
+        self.cash.save()
+        journal_entry.refresh_from_db()
+        self.assertEqual(journal_entry.cash_classification, JournalEntry.CashClassification.NON_CASH_MARK)
@@ -3,6 +3,7 @@ from decimal import Decimal
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
+from api.factories import ReconciliationFactory as ReconciliationRowFactory
 from api.models import Reconciliation, Account, JournalEntryItem
 from api.tests.testing_factories import AccountFactory, EntityFactory, TransactionFactory, JournalEntryFactory, JournalEntryItemFactory
 
@@ -149,4 +150,24 @@ class ReconciliationTests(TestCase):
         items = self._plug_items_for_account_entity(None)
         self.assertEqual(items.count(), 2)
         for item in items:
-            self.assertIsNone(item.entity)
\ No newline at end of file
+            self.assertIsNone(item.entity)
+
+    def test_create_bulk_reconciliations_is_idempotent(self):
+        today = datetime.date.today()
+        card = AccountFactory(name='card', type=Account.Type.LIABILITY, is_closed=False)
+        AccountFactory(name='checking', type=Account.Type.ASSET, is_closed=False)
+        AccountFactory(name='closed', type=Account.Type.ASSET, is_closed=True)
+        AccountFactory(name='salary', type=Account.Type.INCOME, is_closed=False)
+        Reconciliation.objects.create(account=card, date=today)
+
+        # One read of the missing accounts, one insert
+        with self.assertNumQueries(2):
+            ReconciliationRowFactory.create_bulk_reconciliations(today)
+        ReconciliationRowFactory.create_bulk_reconciliations(today)
+
+        self.assertCountEqual(
+            Reconciliation.objects.filter(date=today).values_list('account', flat=True),
+            Account.objects.filter(
+                type__in=[Account.Type.ASSET, Account.Type.LIABILITY], is_closed=False
+            ).values_list('pk', flat=True),
+        )
@@ -7,11 +7,13 @@ and validate required params.
 """
 
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 
 from api.models import Account, JournalEntry, JournalEntryItem, Transaction
+from api.statement import statement_cache
 from api.tests.testing_factories import (
     AccountFactory,
     EntityFactory,
@@ -84,9 +86,9 @@ class ReportEndpointsTest(TestCase):
             entity=self.whole_foods,
         )
 
-    def _get(self, path, **params):
+    def _get(self, path, headers=None, **params):
         query = {"from_date": FROM_DATE, "to_date": TO_DATE, **params}
-        return self.client.get(path, data=query)
+        return self.client.get(path, data=query, headers=headers)
 
     def test_income_by_account(self):
         response = self._get("/api/v1/reports/income/")
@@ -202,3 +204,36 @@ class ReportEndpointsTest(TestCase):
         client = APIClient()
         response = client.get("/api/v1/reports/income/")
         self.assertEqual(response.status_code, 403)
+
+    def test_report_carries_etag(self):
+        response = self._get("/api/v1/reports/income/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        # The same question gets the same validator; a different one doesn't.
+        self.assertEqual(self._get("/api/v1/reports/income/")["ETag"], response["ETag"])
+        self.assertNotEqual(
+            self._get("/api/v1/reports/income/", group_by="entity")["ETag"],
+            response["ETag"],
+        )
+
+    def test_if_none_match_returns_304_without_recomputing(self):
+        etag = self._get("/api/v1/reports/balance-sheet/")["ETag"]
+        with patch.object(statement_cache, "get_balance_sheet") as get_balance_sheet:
+            # Only the ledger version lookup.
+            with self.assertNumQueries(1):
+                response = self._get(
+                    "/api/v1/reports/balance-sheet/", headers={"If-None-Match": etag}
+                )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        get_balance_sheet.assert_not_called()
+
+    def test_ledger_write_changes_etag(self):
+        etag = self._get("/api/v1/reports/trend/")["ETag"]
+        _booked_entry(
+            account=self.cash, amount=Decimal("20.00"),
+            debit_account=self.groceries, credit_account=self.cash,
+        )
+        response = self._get("/api/v1/reports/trend/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
@@ -1,8 +1,19 @@
+import datetime
 from decimal import Decimal
 
+from django.db import connection
+from django.db.models import Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from api.models import Account, Entity, JournalEntry, JournalEntryItem, Transaction
+from api.models import (
+    Account,
+    AccountBalanceSnapshot,
+    Entity,
+    JournalEntry,
+    JournalEntryItem,
+    Transaction,
+)
 from api.services.rest_api_services import (
     bulk_create_journal_entries,
     create_journal_entry_from_api,
@@ -310,3 +321,110 @@ class BulkCreateJournalEntriesTest(TestCase):
         t1.refresh_from_db()
         self.assertFalse(t1.is_closed)
         self.assertEqual(JournalEntry.objects.count(), 0)
+
+    def _entry(self, transaction, amount):
+        return {
+            "transaction_id": transaction.id,
+            "debits": [{"account": "Groceries", "amount": amount}],
+            "credits": [{"account": "Checking", "amount": amount}],
+        }
+
+    def _open_purchase(self, amount):
+        return TransactionFactory(
+            account=self.checking,
+            date=datetime.date(2024, 1, 15),
+            amount=-Decimal(amount),
+            is_closed=False,
+            type=Transaction.TransactionType.PURCHASE,
+        )
+
+    def test_query_count_does_not_grow_with_batch(self):
+        def count_queries(size):
+            transactions = [self._open_purchase("10.00") for _ in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                bulk_create_journal_entries(
+                    [self._entry(t, "10.00") for t in transactions]
+                )
+            return len(queries)
+
+        self.assertEqual(count_queries(2), count_queries(20))
+
+    def _existing_entry(self, amount):
+        transaction = self._open_purchase(amount)
+        journal_entry = JournalEntry.objects.create(
+            date=transaction.date, transaction=transaction
+        )
+        for account in (self.groceries, self.checking):
+            JournalEntryItem.objects.create(
+                journal_entry=journal_entry,
+                type=JournalEntryItem.JournalEntryType.DEBIT,
+                amount=Decimal("99.00"),
+                account=account,
+            )
+        return transaction
+
+    def test_query_count_replacing_entries_does_not_grow_with_batch(self):
+        def count_queries(size):
+            transactions = [self._existing_entry("10.00") for _ in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                bulk_create_journal_entries(
+                    [self._entry(t, "10.00") for t in transactions]
+                )
+            return len(queries)
+
+        self.assertEqual(count_queries(2), count_queries(20))
+        # The replaced items are deleted without a refresh per item.
+        transactions = [self._existing_entry("10.00") for _ in range(5)]
+        with self.assertNumQueries(18):
+            bulk_create_journal_entries(
+                [self._entry(t, "10.00") for t in transactions]
+            )
+
+    def test_bulk_closes_transactions_and_refreshes_derived_state(self):
+        transactions = [self._open_purchase("10.00"), self._open_purchase("5.50")]
+        result = bulk_create_journal_entries(
+            [self._entry(transactions[0], "10.00"), self._entry(transactions[1], "5.50")]
+        )
+        for transaction, row in zip(transactions, result["journal_entries"]):
+            transaction.refresh_from_db()
+            self.assertTrue(transaction.is_closed)
+            self.assertIsNotNone(transaction.date_closed)
+            journal_entry = JournalEntry.objects.get(pk=row["journal_entry_id"])
+            self.assertEqual(journal_entry.transaction, transaction)
+            self.assertEqual(journal_entry.journal_entry_items.count(), 2)
+            self.assertEqual(
+                journal_entry.cash_classification,
+                JournalEntry.CashClassification.CASH,
+            )
+        self.assertEqual(
+            AccountBalanceSnapshot.objects.filter(account=self.groceries).aggregate(
+                total=Sum("debit_total")
+            )["total"],
+            Decimal("15.50"),
+        )
+
+    def test_bulk_rejects_duplicate_transaction(self):
+        transaction = self._open_purchase("10.00")
+        with self.assertRaisesMessage(ValueError, "is already closed"):
+            bulk_create_journal_entries(
+                [self._entry(transaction, "10.00"), self._entry(transaction, "10.00")]
+            )
+        self.assertEqual(JournalEntry.objects.count(), 0)
+
+    def test_bulk_replaces_items_of_existing_entry(self):
+        transaction = self._open_purchase("10.00")
+        journal_entry = JournalEntry.objects.create(
+            date=transaction.date, transaction=transaction
+        )
+        stale = JournalEntryItem.objects.create(
+            journal_entry=journal_entry,
+            type=JournalEntryItem.JournalEntryType.DEBIT,
+            amount=Decimal("99.00"),
+            account=self.groceries,
+        )
+        result = bulk_create_journal_entries([self._entry(transaction, "10.00")])
+        self.assertEqual(
+            result["journal_entries"][0]["journal_entry_id"], journal_entry.pk
+        )
+        self.assertFalse(JournalEntryItem.objects.filter(pk=stale.pk).exists())
+        self.assertEqual(journal_entry.journal_entry_items.count(), 2)
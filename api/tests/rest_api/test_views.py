@@ -73,6 +73,118 @@ class TransactionListViewTest(TestCase):
         response = client.get("/api/v1/transactions/")
         self.assertEqual(response.status_code, 403)
 
+    def test_pages_with_cursor(self):
+        transactions = [
+            TransactionFactory(account=self.account, date=f"2024-01-0{day}")
+            for day in (1, 2, 2, 3, 4)
+        ]
+        ids = []
+        cursor = None
+        while True:
+            params = {"page_size": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get("/api/v1/transactions/", params)
+            self.assertEqual(response.data["count"], 5)
+            ids += [row["id"] for row in response.data["transactions"]]
+            cursor = response.data["next_cursor"]
+            if cursor is None:
+                break
+        expected = sorted(
+            transactions, key=lambda t: (t.date, t.pk), reverse=True
+        )
+        self.assertEqual(ids, [t.pk for t in expected])
+
+    def test_invalid_cursor_returns_400(self):
+        response = self.client.get("/api/v1/transactions/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cursor", response.data)
+
+    @override_settings(LEDGER_API_PAGE_SIZE=1, LEDGER_API_INCLUDE_COUNT=False)
+    def test_page_size_and_count_settings(self):
+        TransactionFactory(account=self.account)
+        TransactionFactory(account=self.account)
+        response = self.client.get("/api/v1/transactions/")
+        self.assertEqual(len(response.data["transactions"]), 1)
+        self.assertIsNone(response.data["count"])
+        self.assertIsNotNone(response.data["next_cursor"])
+        response = self.client.get("/api/v1/transactions/?include_count=true")
+        self.assertEqual(response.data["count"], 2)
+
+    def test_filter_by_date_range(self):
+        TransactionFactory(account=self.account, date="2024-01-01")
+        inside = TransactionFactory(account=self.account, date="2024-02-15")
+        TransactionFactory(account=self.account, date="2024-03-01")
+        response = self.client.get(
+            "/api/v1/transactions/?from_date=2024-02-01&to_date=2024-02-29"
+        )
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["transactions"][0]["id"], inside.id)
+
+    def test_fields_projection(self):
+        TransactionFactory(account=self.account, amount=Decimal("12.50"))
+        response = self.client.get("/api/v1/transactions/?fields=id,amount,account")
+        self.assertEqual(
+            response.data["transactions"][0],
+            {
+                "id": response.data["transactions"][0]["id"],
+                "amount": "12.50",
+                "account": "Checking",
+            },
+        )
+
+    def test_unknown_field_returns_400(self):
+        response = self.client.get("/api/v1/transactions/?fields=id,secret")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.data)
+
+    def test_query_count_is_bounded(self):
+        for _ in range(5):
+            TransactionFactory(account=self.account)
+        # The total count, then one joined read for the page.
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/v1/transactions/")
+        self.assertEqual(len(response.data["transactions"]), 5)
+
+
+@override_settings(LEDGER_API_KEY=API_KEY)
+class ExportViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Api-Key {API_KEY}")
+        self.account = AccountFactory(name="Checking")
+        self.transaction = TransactionFactory(
+            account=self.account, date="2024-01-05", amount=Decimal("10.00")
+        )
+        TransactionFactory(account=AccountFactory(name="Savings"), date="2024-01-06")
+
+    def test_streams_ndjson(self):
+        response = self.client.get("/api/v1/export/transactions/?account=Checking")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["id"], self.transaction.id)
+
+    def test_streams_csv(self):
+        response = self.client.get(
+            "/api/v1/export/transactions/?file_format=csv&to_date=2024-01-05"
+        )
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="transactions.csv"', response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("id,date,account_name,amount"))
+
+    def test_unknown_export_returns_404(self):
+        response = self.client.get("/api/v1/export/users/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_format_returns_400(self):
+        response = self.client.get("/api/v1/export/transactions/?file_format=xml")
+        self.assertEqual(response.status_code, 400)
+
 
 @override_settings(LEDGER_API_KEY=API_KEY)
 class AccountListViewTest(TestCase):
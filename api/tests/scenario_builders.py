@@ -17,6 +17,7 @@ from api.models import (
     CSVProfile,
     Prefill,
     AutoTag,
+    defer_ledger_refresh,
 )
 
 
@@ -273,21 +274,22 @@ def create_closed_transaction_with_journal_entry(
         transaction=transaction,
     )
 
-    debit_item = JournalEntryItem.objects.create(
-        journal_entry=journal_entry,
-        type=JournalEntryItem.JournalEntryType.DEBIT,
-        amount=amount,
-        account=debit_account,
-        entity=debit_entity,
-    )
+    with defer_ledger_refresh():
+        debit_item = JournalEntryItem.objects.create(
+            journal_entry=journal_entry,
+            type=JournalEntryItem.JournalEntryType.DEBIT,
+            amount=amount,
+            account=debit_account,
+            entity=debit_entity,
+        )
 
-    credit_item = JournalEntryItem.objects.create(
-        journal_entry=journal_entry,
-        type=JournalEntryItem.JournalEntryType.CREDIT,
-        amount=amount,
-        account=credit_account,
-        entity=credit_entity,
-    )
+        credit_item = JournalEntryItem.objects.create(
+            journal_entry=journal_entry,
+            type=JournalEntryItem.JournalEntryType.CREDIT,
+            amount=amount,
+            account=credit_account,
+            entity=credit_entity,
+        )
 
     return {
         'transaction': transaction,
@@ -351,15 +353,16 @@ def create_multi_line_journal_entry(
     )
 
     items = []
-    for entry in entries:
-        item = JournalEntryItem.objects.create(
-            journal_entry=journal_entry,
-            type=entry['type'],
-            amount=Decimal(str(entry['amount'])),
-            account=entry['account'],
-            entity=entry.get('entity'),
-        )
-        items.append(item)
+    with defer_ledger_refresh():
+        for entry in entries:
+            item = JournalEntryItem.objects.create(
+                journal_entry=journal_entry,
+                type=entry['type'],
+                amount=Decimal(str(entry['amount'])),
+                account=entry['account'],
+                entity=entry.get('entity'),
+            )
+            items.append(item)
 
     return {
         'transaction': transaction,
@@ -3,13 +3,14 @@ from decimal import Decimal
 
 from django.test import TestCase
 
-from api.models import Account, Entity, JournalEntryItem
+from api.models import Account, Entity, EntityReceivableBalance, JournalEntryItem
 from api.services.entity_services import (
     TAG_USAGE_WINDOW_DAYS,
     EntityBalance,
     EntityHistoryData,
     EntityHistoryItem,
     GroupedEntityBalances,
+    HistoryCursor,
     UntaggedItemsData,
     get_entities,
     get_entities_balances,
@@ -475,6 +476,59 @@ class GetUntaggedJournalEntryItemsTest(TestCase):
         self.assertIsNone(result.first_item)
 
 
+class UntaggedQueuePaginationTest(TestCase):
+    """Keyset pages of get_untagged_journal_entry_items()."""
+
+    def setUp(self):
+        accounts = [
+            AccountFactory(
+                name=name,
+                type=Account.Type.ASSET,
+                sub_type=Account.SubType.ACCOUNTS_RECEIVABLE,
+            )
+            for name in ["Aardvark AR", "Zebra AR"]
+        ]
+        self.entity = EntityFactory()
+        # Two items per (account, date), so the cursor must break ties on pk.
+        for account in accounts:
+            for day in [1, 2]:
+                for _ in range(2):
+                    JournalEntryItemFactory(
+                        journal_entry__date=date(2026, 1, day),
+                        account=account,
+                        entity=None,
+                        type=JournalEntryItem.JournalEntryType.CREDIT,
+                        amount=Decimal("10.00"),
+                    )
+
+    def test_pages_cover_the_queue_in_order(self):
+        full = [item.pk for item in get_untagged_journal_entry_items().items]
+
+        paged = []
+        after = None
+        while True:
+            page = get_untagged_journal_entry_items(after=after, limit=3)
+            self.assertEqual(page.count, 8)
+            paged.extend(item.pk for item in page.items)
+            if page.next_cursor is None:
+                break
+            after = page.next_cursor
+
+        self.assertEqual(paged, full)
+
+    def test_tagging_the_cursor_item_keeps_the_position(self):
+        first_page = get_untagged_journal_entry_items(limit=3)
+        tag_journal_entry_item(first_page.next_cursor, self.entity.id)
+
+        second_page = get_untagged_journal_entry_items(
+            after=first_page.next_cursor, limit=3
+        )
+
+        full = [item.pk for item in get_untagged_journal_entry_items().items]
+        self.assertEqual([item.pk for item in second_page.items], full[2:5])
+        self.assertEqual(second_page.count, 7)
+
+
 class GetEntityHistoryTest(TestCase):
     """Tests for get_entity_history() function."""
 
@@ -627,6 +681,146 @@ class GetEntityHistoryTest(TestCase):
         self.assertIsInstance(result.items[0].running_balance, Decimal)
 
 
+class EntityReceivableBalanceTest(TestCase):
+    """The maintained receivable rows follow tagging and account changes."""
+
+    def setUp(self):
+        self.ar_account = AccountFactory(
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.ACCOUNTS_RECEIVABLE,
+        )
+        self.entity = EntityFactory()
+        self.item = JournalEntryItemFactory(
+            journal_entry=JournalEntryFactory(date=date(2023, 1, 5)),
+            account=self.ar_account,
+            entity=None,
+            type=JournalEntryItem.JournalEntryType.CREDIT,
+            amount=Decimal("100.00"),
+        )
+
+    def _rows(self):
+        return list(
+            EntityReceivableBalance.objects.values_list(
+                "account_id", "entity_id", "debit_total", "credit_total",
+                "last_activity_date",
+            )
+        )
+
+    def test_tag_and_untag_update_the_row(self):
+        self.assertEqual(self._rows(), [])
+
+        tag_journal_entry_item(self.item.id, self.entity.id)
+        self.assertEqual(
+            self._rows(),
+            [(self.ar_account.id, self.entity.id, Decimal("0"), Decimal("100"),
+              date(2023, 1, 5))],
+        )
+
+        untag_journal_entry_item(self.item.id)
+        self.assertEqual(self._rows(), [])
+
+    def test_account_leaving_receivables_drops_its_rows(self):
+        tag_journal_entry_item(self.item.id, self.entity.id)
+        self.ar_account.sub_type = Account.SubType.CASH
+        self.ar_account.save()
+        self.assertEqual(self._rows(), [])
+
+        self.ar_account.sub_type = Account.SubType.ACCOUNTS_RECEIVABLE
+        self.ar_account.save()
+        self.assertEqual(len(self._rows()), 1)
+
+    def test_refresh_leaves_other_entities_rows_alone(self):
+        other_entity = EntityFactory()
+        other_item = JournalEntryItemFactory(
+            journal_entry=JournalEntryFactory(date=date(2023, 1, 9)),
+            account=self.ar_account,
+            entity=None,
+            type=JournalEntryItem.JournalEntryType.DEBIT,
+            amount=Decimal("40.00"),
+        )
+        tag_journal_entry_item(other_item.id, other_entity.id)
+        other_row = EntityReceivableBalance.objects.get(entity=other_entity)
+
+        tag_journal_entry_item(self.item.id, self.entity.id)
+
+        # Recomputing every row of the account would have replaced this one.
+        self.assertTrue(EntityReceivableBalance.objects.filter(pk=other_row.pk).exists())
+        self.assertEqual(len(self._rows()), 2)
+
+    def test_retagging_moves_the_balance_between_entities(self):
+        other_entity = EntityFactory()
+        tag_journal_entry_item(self.item.id, self.entity.id)
+        tag_journal_entry_item(self.item.id, other_entity.id)
+        self.assertEqual(
+            self._rows(),
+            [(self.ar_account.id, other_entity.id, Decimal("0"), Decimal("100"),
+              date(2023, 1, 5))],
+        )
+
+    def test_rebuild_matches_maintained_rows(self):
+        tag_journal_entry_item(self.item.id, self.entity.id)
+        maintained = self._rows()
+        EntityReceivableBalance.rebuild()
+        self.assertEqual(self._rows(), maintained)
+
+
+class EntityHistoryPaginationTest(TestCase):
+    """Keyset pages of get_entity_history() match the full history."""
+
+    def setUp(self):
+        self.ar_account = AccountFactory(
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.ACCOUNTS_RECEIVABLE,
+        )
+        self.entity = EntityFactory()
+        # Two items share each date, so pages must break ties on pk.
+        for day in range(1, 6):
+            journal_entry = JournalEntryFactory(date=date(2023, 1, day))
+            for entry_type, amount in [
+                (JournalEntryItem.JournalEntryType.CREDIT, Decimal("100.00")),
+                (JournalEntryItem.JournalEntryType.DEBIT, Decimal(day)),
+            ]:
+                JournalEntryItemFactory(
+                    journal_entry=journal_entry,
+                    account=self.ar_account,
+                    entity=self.entity,
+                    type=entry_type,
+                    amount=amount,
+                )
+
+    def _rows(self, history):
+        return [
+            (item.journal_entry_item.id, item.running_balance)
+            for item in history.items
+        ]
+
+    def test_pages_match_full_history(self):
+        full = get_entity_history(self.entity.id, self.ar_account.id)
+
+        pages = []
+        before = None
+        while True:
+            page = get_entity_history(
+                self.entity.id, self.ar_account.id, before=before, limit=3
+            )
+            pages.insert(0, self._rows(page))
+            if page.older_cursor is None:
+                break
+            before = HistoryCursor.decode(page.older_cursor.encode())
+
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(
+            [row for page in pages for row in page], self._rows(full)
+        )
+
+    def test_newest_page_does_not_read_older_items(self):
+        with self.assertNumQueries(2):
+            page = get_entity_history(self.entity.id, limit=2)
+        # Closing balance comes from the stored receivable totals
+        self.assertEqual(page.items[-1].running_balance, Decimal("485.00"))
+        self.assertEqual(page.older_cursor.balance, Decimal("390.00"))
+
+
 class UntagJournalEntryItemTest(TestCase):
     """Tests for untag_journal_entry_item() function."""
 
@@ -0,0 +1,111 @@
+"""
+Tests for export_services.py
+"""
+
+import json
+from decimal import Decimal
+
+from django.test import TestCase
+
+from api.models import Account
+from api.services import export_services
+from api.tests.scenario_builders import create_closed_transaction_with_journal_entry
+from api.tests.testing_factories import AccountFactory, EntityFactory
+
+
+class ExportServicesTest(TestCase):
+    def setUp(self):
+        self.cash = AccountFactory(
+            name="1000-Cash", type=Account.Type.ASSET, sub_type=Account.SubType.CASH
+        )
+        self.groceries = AccountFactory(
+            name="5000-Groceries",
+            type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+        )
+        self.rent = AccountFactory(
+            name="5100-Rent",
+            type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+        )
+        self.january = create_closed_transaction_with_journal_entry(
+            date="2023-01-10",
+            debit_account=self.groceries,
+            credit_account=self.cash,
+            amount=Decimal("80.25"),
+            transaction_account=self.cash,
+            debit_entity=EntityFactory(name="Grocer"),
+        )
+        self.february = create_closed_transaction_with_journal_entry(
+            date="2023-02-01",
+            debit_account=self.rent,
+            credit_account=self.cash,
+            amount=Decimal("1500"),
+            transaction_account=self.cash,
+        )
+
+    def test_transaction_rows(self):
+        rows = list(export_services.iter_export_rows("transactions"))
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [self.january["transaction"].pk, self.february["transaction"].pk],
+        )
+        self.assertEqual(rows[0]["account_name"], "1000-Cash")
+        self.assertEqual(rows[0]["amount"], Decimal("80.25"))
+
+    def test_date_range(self):
+        rows = list(
+            export_services.iter_export_rows(
+                "journal-entries", from_date="2023-01-15", to_date="2023-02-28"
+            )
+        )
+        self.assertEqual(
+            [row["id"] for row in rows], [self.february["journal_entry"].pk]
+        )
+
+    def test_account_filter(self):
+        entries = list(
+            export_services.iter_export_rows("journal-entries", account="5100-Rent")
+        )
+        self.assertEqual(
+            [row["id"] for row in entries], [self.february["journal_entry"].pk]
+        )
+        items = list(
+            export_services.iter_export_rows(
+                "journal-entry-items", account="5000-Groceries"
+            )
+        )
+        self.assertEqual([row["id"] for row in items], [self.january["debit_item"].pk])
+        self.assertEqual(items[0]["entity_name"], "Grocer")
+        self.assertEqual(str(items[0]["date"]), "2023-01-10")
+
+    def test_ndjson(self):
+        lines = list(
+            export_services.iter_ndjson(
+                export_services.iter_export_rows("transactions", to_date="2023-01-31")
+            )
+        )
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row["amount"], "80.25")
+        self.assertEqual(row["date"], "2023-01-10")
+
+    def test_csv(self):
+        _, columns = export_services.EXPORTS["journal-entry-items"]
+        lines = list(
+            export_services.iter_csv(
+                export_services.iter_export_rows(
+                    "journal-entry-items", account="5100-Rent"
+                ),
+                columns,
+            )
+        )
+        self.assertEqual(
+            lines[0],
+            "id,journal_entry_id,date,type,amount,account_name,entity_name\r\n",
+        )
+        self.assertEqual(
+            lines[1],
+            f"{self.february['debit_item'].pk},{self.february['journal_entry'].pk},"
+            "2023-02-01,debit,1500.00,5100-Rent,\r\n",
+        )
@@ -1,3 +1,4 @@
+from datetime import date
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
@@ -656,57 +657,90 @@ class GetPostSaveContextTest(TestCase):
         # Create test transactions
         self.transaction1 = TransactionFactory(
             account=self.account,
+            date=date(2024, 1, 1),
             is_closed=False,
             type=Transaction.TransactionType.INCOME,
         )
         self.transaction2 = TransactionFactory(
             account=self.account,
+            date=date(2024, 1, 2),
             is_closed=False,
             type=Transaction.TransactionType.PURCHASE,
         )
         self.transaction3 = TransactionFactory(
-            account=self.account, is_closed=True
+            account=self.account, date=date(2024, 1, 3), is_closed=True
         )  # Closed, should be filtered out
 
-    def test_context_with_valid_filter(self):
-        """Test uses filtered transactions when form valid."""
-        # Create a valid filter form
+    def _filter_form(self, queryset):
         filter_form = Mock(spec=TransactionFilterForm)
         filter_form.is_valid.return_value = True
-        filter_form.get_transactions.return_value = [self.transaction1, self.transaction2]
+        filter_form.get_transactions.return_value = queryset
+        return filter_form
 
+    def _formsets(self, debit_forms=(), credit_forms=()):
         # Create mock formsets (make them iterable)
         debit_formset = Mock()
-        debit_formset.__iter__ = Mock(return_value=iter([]))
+        debit_formset.__iter__ = Mock(return_value=iter(debit_forms))
         credit_formset = Mock()
-        credit_formset.__iter__ = Mock(return_value=iter([]))
+        credit_formset.__iter__ = Mock(return_value=iter(credit_forms))
+        return debit_formset, credit_formset
+
+    def test_context_with_valid_filter(self):
+        """Test highlights the transaction after the saved one."""
+        filter_form = self._filter_form(
+            Transaction.objects.filter_for_table(is_closed=False)
+        )
+        debit_formset, credit_formset = self._formsets()
+
+        with self.assertNumQueries(2):
+            # One window read and one seek for the next transaction
+            context = get_post_save_context(
+                filter_form=filter_form,
+                saved_transaction=self.transaction1,
+                debit_formset=debit_formset,
+                credit_formset=credit_formset,
+                limit=100,
+            )
+
+        self.assertEqual(context.transactions, [self.transaction1, self.transaction2])
+        self.assertEqual(context.highlighted_transaction, self.transaction2)
+        self.assertEqual(context.highlighted_index, 1)
+        self.assertIsNone(context.next_cursor)
+
+    def test_context_follows_account_name_order(self):
+        """Test the next transaction on the same day is by account name."""
+        zeta = AccountFactory(name="Zeta")
+        alpha = AccountFactory(name="Alpha")
+        same_day = date(2024, 1, 1)
+        saved = TransactionFactory(account=alpha, date=same_day, is_closed=False)
+        following = TransactionFactory(account=zeta, date=same_day, is_closed=False)
+        filter_form = self._filter_form(
+            Transaction.objects.filter_for_table(
+                is_closed=False, accounts=[alpha, zeta]
+            )
+        )
+        debit_formset, credit_formset = self._formsets()
 
         context = get_post_save_context(
             filter_form=filter_form,
-            current_index=0,
+            saved_transaction=saved,
             debit_formset=debit_formset,
             credit_formset=credit_formset,
         )
 
-        self.assertEqual(len(context.transactions), 2)
-        self.assertEqual(context.highlighted_transaction, self.transaction1)
-        self.assertEqual(context.highlighted_index, 0)
+        self.assertEqual(context.transactions, [saved, following])
+        self.assertEqual(context.highlighted_transaction, following)
 
     def test_context_with_invalid_filter(self):
         """Test falls back to default filter when form invalid."""
         # Create an invalid filter form
         filter_form = Mock(spec=TransactionFilterForm)
         filter_form.is_valid.return_value = False
-
-        # Create mock formsets (make them iterable)
-        debit_formset = Mock()
-        debit_formset.__iter__ = Mock(return_value=iter([]))
-        credit_formset = Mock()
-        credit_formset.__iter__ = Mock(return_value=iter([]))
+        debit_formset, credit_formset = self._formsets()
 
         context = get_post_save_context(
             filter_form=filter_form,
-            current_index=0,
+            saved_transaction=self.transaction3,
             debit_formset=debit_formset,
             credit_formset=credit_formset,
         )
@@ -717,50 +751,60 @@ class GetPostSaveContextTest(TestCase):
         self.assertIn(self.transaction2, context.transactions)
         self.assertNotIn(self.transaction3, context.transactions)
 
-    def test_context_handles_index_out_of_bounds(self):
-        """Test resets to index 0 when current index invalid."""
-        filter_form = Mock(spec=TransactionFilterForm)
-        filter_form.is_valid.return_value = True
-        filter_form.get_transactions.return_value = [self.transaction1, self.transaction2]
-
-        # Create mock formsets (make them iterable)
-        debit_formset = Mock()
-        debit_formset.__iter__ = Mock(return_value=iter([]))
-        credit_formset = Mock()
-        credit_formset.__iter__ = Mock(return_value=iter([]))
+    def test_context_wraps_after_last_transaction(self):
+        """Test highlights the top of the window when nothing follows the save."""
+        self.transaction2.close()
+        filter_form = self._filter_form(
+            Transaction.objects.filter_for_table(is_closed=False)
+        )
+        debit_formset, credit_formset = self._formsets()
 
-        # Request index that doesn't exist
         context = get_post_save_context(
             filter_form=filter_form,
-            current_index=10,
+            saved_transaction=self.transaction2,
             debit_formset=debit_formset,
             credit_formset=credit_formset,
         )
 
-        # Should reset to 0
         self.assertEqual(context.highlighted_index, 0)
         self.assertEqual(context.highlighted_transaction, self.transaction1)
 
+    def test_context_moves_to_next_window(self):
+        """Test reads the following window when the saved row ended its own."""
+        self.transaction1.close()
+        filter_form = self._filter_form(Transaction.objects.filter_for_table())
+        debit_formset, credit_formset = self._formsets()
+
+        context = get_post_save_context(
+            filter_form=filter_form,
+            saved_transaction=self.transaction1,
+            debit_formset=debit_formset,
+            credit_formset=credit_formset,
+            limit=1,
+        )
+
+        self.assertEqual(context.transactions, [self.transaction2])
+        self.assertEqual(context.highlighted_transaction, self.transaction2)
+        self.assertEqual(context.highlighted_index, 0)
+        self.assertEqual(context.after.pk, self.transaction1.pk)
+        self.assertEqual(context.next_cursor.pk, self.transaction2.pk)
+
     def test_context_extracts_created_entities(self):
         """Test collects entities created during form cleaning."""
-        filter_form = Mock(spec=TransactionFilterForm)
-        filter_form.is_valid.return_value = True
-        filter_form.get_transactions.return_value = [self.transaction1]
+        filter_form = self._filter_form(
+            Transaction.objects.filter_for_table(is_closed=False)
+        )
 
         # Create mock formsets with created entities
         debit_form = Mock()
         debit_form.created_entity = self.entity
-        debit_formset = Mock()
-        debit_formset.__iter__ = Mock(return_value=iter([debit_form]))
-
         credit_form = Mock()
         delattr(credit_form, "created_entity")  # No created_entity attribute
-        credit_formset = Mock()
-        credit_formset.__iter__ = Mock(return_value=iter([credit_form]))
+        debit_formset, credit_formset = self._formsets([debit_form], [credit_form])
 
         context = get_post_save_context(
             filter_form=filter_form,
-            current_index=0,
+            saved_transaction=self.transaction1,
             debit_formset=debit_formset,
             credit_formset=credit_formset,
         )
@@ -770,19 +814,12 @@ class GetPostSaveContextTest(TestCase):
 
     def test_context_with_no_transactions(self):
         """Test handles empty transaction list."""
-        filter_form = Mock(spec=TransactionFilterForm)
-        filter_form.is_valid.return_value = True
-        filter_form.get_transactions.return_value = []
-
-        # Create mock formsets (make them iterable)
-        debit_formset = Mock()
-        debit_formset.__iter__ = Mock(return_value=iter([]))
-        credit_formset = Mock()
-        credit_formset.__iter__ = Mock(return_value=iter([]))
+        filter_form = self._filter_form(Transaction.objects.none())
+        debit_formset, credit_formset = self._formsets()
 
         context = get_post_save_context(
             filter_form=filter_form,
-            current_index=0,
+            saved_transaction=self.transaction1,
             debit_formset=debit_formset,
             credit_formset=credit_formset,
         )
@@ -0,0 +1,177 @@
+"""
+Tests for reconciliation_services.py
+"""
+
+import datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import F, Sum
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.models import (
+    Account,
+    AccountBalanceSnapshot,
+    JournalEntry,
+    JournalEntryItem,
+    Reconciliation,
+)
+from api.services.reconciliation_services import plug_investment_reconciliations
+from api.tests.scenario_builders import create_closed_transaction_with_journal_entry
+from api.tests.testing_factories import AccountFactory, EntityFactory
+
+
+class PlugInvestmentReconciliationsTest(TestCase):
+    def setUp(self):
+        self.date = datetime.date(2023, 1, 31)
+        self.gain_loss = AccountFactory(
+            name="4900-Unrealized",
+            type=Account.Type.INCOME,
+            sub_type=Account.SubType.UNREALIZED_INVESTMENT_GAINS,
+            special_type=Account.SpecialType.UNREALIZED_GAINS_AND_LOSSES,
+        )
+        self.cash = AccountFactory(
+            name="1000-Cash", type=Account.Type.ASSET, sub_type=Account.SubType.CASH
+        )
+        self.brokerages = [
+            AccountFactory(
+                name=f"150{number}-Brokerage",
+                type=Account.Type.ASSET,
+                sub_type=Account.SubType.SECURITIES_UNRESTRICTED,
+                entity=EntityFactory(name=f"Broker {number}"),
+            )
+            for number in range(3)
+        ]
+        for brokerage in self.brokerages:
+            create_closed_transaction_with_journal_entry(
+                date="2023-01-10",
+                debit_account=brokerage,
+                credit_account=self.cash,
+                amount=Decimal("100"),
+            )
+        self.reconciliations = [
+            Reconciliation.objects.create(
+                account=brokerage, date=self.date, amount=amount
+            )
+            for brokerage, amount in zip(
+                self.brokerages,
+                [Decimal("150.00"), Decimal("80.00"), Decimal("100.00")],
+            )
+        ]
+        # Not an investment: never plugged.
+        Reconciliation.objects.create(
+            account=self.cash, date=self.date, amount=Decimal("1.00")
+        )
+
+    def _plug_rows(self, reconciliation):
+        return sorted(
+            JournalEntryItem.objects.filter(
+                journal_entry__transaction=reconciliation.transaction
+            ).values_list("account__name", "type", "amount", "entity__name")
+        )
+
+    def test_matches_single_plug(self):
+        result = plug_investment_reconciliations(self.date)
+        self.assertTrue(result.success)
+        # The in-balance brokerage needs no plug
+        self.assertEqual(result.plugged_count, 2)
+
+        bulk_rows = []
+        for reconciliation in self.reconciliations[:2]:
+            reconciliation.refresh_from_db()
+            self.assertTrue(reconciliation.transaction.is_closed)
+            bulk_rows.append(
+                (reconciliation.transaction.amount, self._plug_rows(reconciliation))
+            )
+        self.assertIsNone(
+            Reconciliation.objects.get(pk=self.reconciliations[2].pk).transaction
+        )
+        self.assertEqual(
+            [brokerage.get_balance(self.date) for brokerage in self.brokerages],
+            [Decimal("150.00"), Decimal("80.00"), Decimal("100.00")],
+        )
+
+        # Re-plugging one at a time from the same state gives the same rows.
+        for reconciliation, (amount, rows) in zip(self.reconciliations, bulk_rows):
+            reconciliation.plug_investment_change()
+            self.assertEqual(reconciliation.transaction.amount, amount)
+            self.assertEqual(self._plug_rows(reconciliation), rows)
+
+    def test_replug_rewrites_existing_entries(self):
+        plug_investment_reconciliations(self.date)
+        Reconciliation.objects.filter(pk=self.reconciliations[0].pk).update(
+            amount=Decimal("90.00")
+        )
+        plug_investment_reconciliations(self.date)
+
+        reconciliation = Reconciliation.objects.get(pk=self.reconciliations[0].pk)
+        self.assertEqual(reconciliation.transaction.amount, Decimal("-10.00"))
+        self.assertEqual(self.brokerages[0].get_balance(self.date), Decimal("90.00"))
+        self.assertEqual(
+            JournalEntry.objects.filter(
+                transaction=reconciliation.transaction
+            ).count(),
+            1,
+        )
+
+    def test_keeps_derived_state_current(self):
+        plug_investment_reconciliations(self.date)
+        entry = JournalEntry.objects.get(
+            transaction__reconciliation=self.reconciliations[0]
+        )
+        self.assertEqual(
+            entry.cash_classification, JournalEntry.CashClassification.NON_CASH_MARK
+        )
+        totals = AccountBalanceSnapshot.objects.filter(
+            account=self.gain_loss, month=datetime.date(2023, 1, 1)
+        ).aggregate(debits=Sum("debit_total"), credits=Sum("credit_total"))
+        # 50 gain on the first brokerage, 20 loss on the second
+        self.assertEqual(totals["credits"] - totals["debits"], Decimal("30.00"))
+
+    def test_query_count_does_not_grow_with_accounts(self):
+        for number in range(3, 10):
+            brokerage = AccountFactory(
+                name=f"150{number}-Brokerage",
+                type=Account.Type.ASSET,
+                sub_type=Account.SubType.SECURITIES_UNRESTRICTED,
+            )
+            Reconciliation.objects.create(
+                account=brokerage, date=self.date, amount=Decimal("10.00")
+            )
+        # Reads, inserts and the snapshot refresh, regardless of how many
+        # reconciliations are plugged.
+        with self.assertNumQueries(17):
+            result = plug_investment_reconciliations(self.date)
+        self.assertEqual(result.plugged_count, 9)
+
+    def test_replug_query_count_does_not_grow_with_accounts(self):
+        def replug_queries():
+            # Plug twice so every reconciliation already has an entry to replace.
+            for _ in range(2):
+                plug_investment_reconciliations(self.date)
+                Reconciliation.objects.filter(date=self.date).update(
+                    amount=F("amount") + 1
+                )
+            with CaptureQueriesContext(connection) as queries:
+                plug_investment_reconciliations(self.date)
+            return len(queries)
+
+        few_accounts = replug_queries()
+        for number in range(3, 10):
+            brokerage = AccountFactory(
+                name=f"150{number}-Brokerage",
+                type=Account.Type.ASSET,
+                sub_type=Account.SubType.SECURITIES_UNRESTRICTED,
+            )
+            Reconciliation.objects.create(
+                account=brokerage, date=self.date, amount=Decimal("10.00")
+            )
+        self.assertEqual(replug_queries(), few_accounts)
+
+    def test_missing_gain_loss_account(self):
+        self.gain_loss.special_type = None
+        self.gain_loss.save()
+        result = plug_investment_reconciliations(self.date)
+        self.assertFalse(result.success)
+        self.assertIn("unrealized gains and losses", result.error)
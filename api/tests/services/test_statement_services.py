@@ -24,7 +24,13 @@ from api.services.statement_services import (
     get_statement_detail_items_by_entity,
     partition_income_balances,
 )
-from api.statement import Balance, IncomeStatement
+from api.statement import (
+    Balance,
+    BalanceSheet,
+    CashFlowStatement,
+    IncomeStatement,
+    statement_cache,
+)
 from api.tests.testing_factories import (
     AccountFactory,
     EntityFactory,
@@ -579,6 +585,66 @@ class CalculateCashFlowMetricsTest(TestCase):
         # Just verify we get a valid result
         self.assertIsInstance(result, CashFlowMetrics)
 
+    def _create_ledger(self):
+        cash = AccountFactory(type=Account.Type.ASSET, sub_type=Account.SubType.CASH)
+        brokerage = AccountFactory(
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.SECURITIES_UNRESTRICTED,
+        )
+        starting_equity = AccountFactory(
+            type=Account.Type.EQUITY,
+            sub_type=Account.SubType.RETAINED_EARNINGS,
+            special_type=Account.SpecialType.STARTING_EQUITY,
+        )
+        salary = AccountFactory(
+            type=Account.Type.INCOME, sub_type=Account.SubType.SALARY
+        )
+        for entry_date, debit, credit, amount in [
+            (date(2023, 12, 1), cash, starting_equity, Decimal("500")),
+            (date(2024, 3, 1), cash, salary, Decimal("1000")),
+            (date(2024, 6, 1), brokerage, cash, Decimal("300")),
+        ]:
+            entry = JournalEntryFactory(date=entry_date)
+            JournalEntryItemFactory(
+                journal_entry=entry, account=debit, amount=amount,
+                type=JournalEntryItem.JournalEntryType.DEBIT,
+            )
+            JournalEntryItemFactory(
+                journal_entry=entry, account=credit, amount=amount,
+                type=JournalEntryItem.JournalEntryType.CREDIT,
+            )
+
+    def test_matches_statement_computation(self):
+        self._create_ledger()
+        reference = CashFlowStatement(
+            income_statement=IncomeStatement(
+                end_date=date(2024, 12, 31), start_date=date(2024, 1, 1)
+            ),
+            start_balance_sheet=BalanceSheet(end_date=date(2023, 12, 31)),
+            end_balance_sheet=BalanceSheet(end_date=date(2024, 12, 31)),
+        )
+        result = calculate_cash_flow_metrics(
+            from_date=date(2024, 1, 1),
+            to_date=date(2024, 12, 31),
+        )
+
+        self.assertEqual(result.net_cash_flow, reference.net_cash_flow)
+        self.assertEqual(result.cash_from_investing, Decimal("-300"))
+        self.assertEqual(
+            result.levered_cash_flow, reference.get_levered_after_tax_cash_flow()
+        )
+        self.assertIsNone(result.cash_flow_discrepancy)
+
+    def test_reads_the_ledger_in_one_pass(self):
+        self._create_ledger()
+        statement_cache.clear()
+        # Ledger version, accounts, the grouped totals and the investing items
+        with self.assertNumQueries(4):
+            calculate_cash_flow_metrics(
+                from_date=date(2024, 1, 1),
+                to_date=date(2024, 12, 31),
+            )
+
 
 class BuildEntityIncomeSummaryTest(TestCase):
     """Tests for build_entity_income_summary()."""
@@ -5,6 +5,7 @@ These tests verify business logic and database operations in
 transaction_services.py, ensuring atomicity and correctness.
 """
 
+import datetime
 from decimal import Decimal
 from unittest.mock import patch
 
@@ -14,6 +15,7 @@ from django.utils import timezone
 from api.models import Account, Transaction
 from api.services.transaction_services import (
     LinkResult,
+    TransactionCursor,
     TransactionFilterResult,
     TransactionResult,
     apply_autotags_to_transactions,
@@ -23,7 +25,11 @@ from api.services.transaction_services import (
     link_transactions,
     update_transaction,
 )
-from api.tests.testing_factories import AccountFactory, TransactionFactory
+from api.tests.testing_factories import (
+    AccountFactory,
+    AutoTagFactory,
+    TransactionFactory,
+)
 
 
 class FilterTransactionsTest(TestCase):
@@ -145,6 +151,68 @@ class FilterTransactionsTest(TestCase):
         self.assertEqual(result.transactions[0], self.open_income)
 
 
+class TransactionWindowTest(TestCase):
+    """Tests for keyset windows over filter_for_table() ordering."""
+
+    def setUp(self):
+        accounts = [AccountFactory(), AccountFactory()]
+        # Same-day rows across both accounts exercise every tie-breaker
+        for day in [1, 1, 2, 2, 2, 3]:
+            for account in accounts:
+                TransactionFactory(
+                    account=account, date=datetime.date(2024, 1, day)
+                )
+
+    def test_windows_cover_the_filter_in_order(self):
+        expected = filter_transactions().transactions
+        seen = []
+        after = None
+        while True:
+            result = filter_transactions(after=after, limit=5)
+            seen.extend(result.transactions)
+            if result.next_cursor is None:
+                break
+            after = result.next_cursor
+
+        self.assertEqual(seen, expected)
+
+    def test_window_costs_one_query_however_deep(self):
+        last = filter_transactions().transactions[-3]
+        with self.assertNumQueries(1):
+            result = filter_transactions(after=TransactionCursor.of(last), limit=5)
+        self.assertEqual(len(result.transactions), 2)
+        self.assertIsNone(result.next_cursor)
+
+    def test_windows_follow_name_order_not_id_order(self):
+        Transaction.objects.all().delete()
+        # Created first, so the lower id sorts after the higher one by name.
+        zeta = AccountFactory(name="Zeta")
+        alpha = AccountFactory(name="Alpha")
+        same_day = datetime.date(2024, 2, 1)
+        expected = [
+            TransactionFactory(account=account, date=same_day)
+            for account in [alpha, alpha, zeta, zeta]
+        ]
+        self.assertLess(zeta.pk, alpha.pk)
+
+        seen = []
+        after = None
+        while True:
+            result = filter_transactions(after=after, limit=1)
+            seen.extend(result.transactions)
+            if result.next_cursor is None:
+                break
+            after = result.next_cursor
+
+        self.assertEqual(seen, expected)
+
+    def test_cursor_round_trips(self):
+        cursor = TransactionCursor(
+            date=datetime.date(2024, 1, 2), account_id=7, pk=42
+        )
+        self.assertEqual(TransactionCursor.decode(cursor.encode()), cursor)
+
+
 class CreateTransactionTest(TestCase):
     """Tests for create_transaction() function."""
 
@@ -513,6 +581,32 @@ class ApplyAutotagsToTransactionsTest(TestCase):
         self.assertIn("type", updated_fields)
         self.assertIn("suggested_entity", updated_fields)
 
+    def test_apply_autotags_writes_only_changed_rows(self):
+        autotag = AutoTagFactory(
+            search_string="grocer", account=self.account, entity=None, prefill=None,
+            transaction_type=Transaction.TransactionType.PURCHASE,
+        )
+        already_tagged = TransactionFactory(
+            account=self.account, is_closed=False, description="GROCER 1",
+            suggested_account=self.account, suggested_entity=None, prefill=None,
+            type=Transaction.TransactionType.PURCHASE,
+        )
+        stale = TransactionFactory(
+            account=self.account, is_closed=False, description="GROCER 2",
+            suggested_account=None, prefill=None,
+        )
+        TransactionFactory(account=self.account, is_closed=False, description="RENT")
+
+        with patch.object(
+            Transaction.objects, "bulk_update", wraps=Transaction.objects.bulk_update
+        ) as mock_bulk_update:
+            count = apply_autotags_to_transactions()
+
+        self.assertEqual(count, 3)
+        self.assertEqual(list(mock_bulk_update.call_args[0][0]), [stale])
+        stale.refresh_from_db()
+        self.assertEqual(stale.suggested_account, autotag.account)
+
     def test_apply_autotags_returns_zero_for_empty_set(self):
         """Test returns 0 when no transactions match."""
         # No open transactions
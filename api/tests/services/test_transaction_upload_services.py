@@ -4,8 +4,14 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 
 from api.forms import UploadTransactionsForm
-from api.services.transaction_upload_services import import_transactions_from_csv
-from api.tests.testing_factories import AccountFactory
+from api.celery import app as celery_app
+from api.models import CSVImportBatch, CSVProfile, Transaction, TransactionImport
+from api.services.transaction_upload_services import (
+    QUEUE_ERROR,
+    import_transactions_from_csv,
+    start_transactions_import,
+)
+from api.tests.testing_factories import AccountFactory, CSVProfileFactory
 
 
 class ImportTransactionsFromCsvTest(TestCase):
@@ -25,24 +31,27 @@ class ImportTransactionsFromCsvTest(TestCase):
         return form
 
     def test_successful_import_returns_count_and_account(self):
-        # form.save() returns the created transactions; the service counts them
+        # form.iter_batches() yields the created transactions; the service counts
         # and tags them (tagging is exercised in test_tagging_services).
         form = self._valid_form()
         created = [object(), object(), object(), object(), object()]
-        with patch.object(form, "save", return_value=created), patch(
+        with patch.object(
+            form, "iter_batches", return_value=[CSVImportBatch(created, 2)]
+        ), patch(
             "api.services.transaction_upload_services.tag_transactions"
         ) as mock_tag:
             result = import_transactions_from_csv(form)
 
         self.assertTrue(result.success)
         self.assertEqual(result.count, 5)
+        self.assertEqual(result.skipped, 2)
         self.assertEqual(result.account, self.account)
         self.assertIsNone(result.error)
         mock_tag.assert_called_once_with(created)
 
     def test_zero_rows_is_still_success(self):
         form = self._valid_form()
-        with patch.object(form, "save", return_value=[]), patch(
+        with patch.object(form, "iter_batches", return_value=[]), patch(
             "api.services.transaction_upload_services.tag_transactions"
         ):
             result = import_transactions_from_csv(form)
@@ -53,8 +62,186 @@ class ImportTransactionsFromCsvTest(TestCase):
 
     def test_exception_during_import_returns_error(self):
         form = self._valid_form()
-        with patch.object(form, "save", side_effect=Exception("bad columns")):
+        with patch.object(
+            form, "iter_batches", side_effect=Exception("bad columns")
+        ):
             result = import_transactions_from_csv(form)
 
         self.assertFalse(result.success)
         self.assertIsNotNone(result.error)
+
+
+class CSVUploadTestCase(TestCase):
+    """An account whose CSV profile reads a simple five-column export."""
+
+    def setUp(self):
+        self.account = AccountFactory(
+            csv_profile=CSVProfileFactory(
+                date="Date",
+                description="Description",
+                category="Category",
+                inflow="Inflow",
+                outflow="Outflow",
+                date_format="%Y-%m-%d",
+                clear_prepended_until_value="",
+            )
+        )
+
+    def _form(self, content):
+        upload = SimpleUploadedFile(
+            "transactions.csv", content, content_type="text/csv"
+        )
+        form = UploadTransactionsForm(
+            {"account": self.account.pk}, {"transaction_csv": upload}
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        return form
+
+
+class StreamingImportTest(CSVUploadTestCase):
+    def test_file_is_imported_in_batches_with_progress(self):
+        rows = "".join(
+            f"2024-01-{day:02d},Coffee {day},Food,,-{day}.50\r\n"
+            for day in range(1, 6)
+        )
+        form = self._form(
+            ("Date,Description,Category,Inflow,Outflow\r\n" + rows).encode()
+        )
+        progress = []
+        with patch.object(CSVProfile, "IMPORT_BATCH_SIZE", 2), patch(
+            "api.services.transaction_upload_services.tag_transactions"
+        ) as mock_tag:
+            result = import_transactions_from_csv(
+                form,
+                on_progress=lambda count, skipped: progress.append((count, skipped)),
+            )
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.count, 5)
+        self.assertEqual(progress, [(2, 0), (4, 0), (5, 0)])
+        self.assertEqual(mock_tag.call_count, 3)
+        self.assertEqual(
+            Transaction.objects.filter(account=self.account).count(), 5
+        )
+
+    def test_overlapping_upload_reports_skipped_rows(self):
+        header = b"Date,Description,Category,Inflow,Outflow\r\n"
+        january = b"2024-01-01,Coffee,Food,,-1\r\n2024-01-02,Coffee,Food,,-2\r\n"
+        february = b"2024-02-01,Coffee,Food,,-3\r\n"
+        import_transactions_from_csv(self._form(header + january))
+
+        result = import_transactions_from_csv(self._form(header + january + february))
+
+        self.assertEqual((result.count, result.skipped), (1, 2))
+        self.assertEqual(
+            Transaction.objects.filter(account=self.account).count(), 3
+        )
+
+    def test_bad_row_after_first_batch_imports_nothing(self):
+        form = self._form(
+            b"Date,Description,Category,Inflow,Outflow\r\n"
+            b"2024-01-01,Coffee,Food,,-1\r\n"
+            b"2024-01-02,Coffee,Food,,-2\r\n"
+            b"not a date,Coffee,Food,,-3\r\n"
+        )
+        with patch.object(CSVProfile, "IMPORT_BATCH_SIZE", 2):
+            result = import_transactions_from_csv(form)
+
+        self.assertFalse(result.success)
+        self.assertFalse(Transaction.objects.filter(account=self.account).exists())
+
+
+class AsyncImportTest(CSVUploadTestCase):
+    """Runs the Celery task eagerly in place of a broker and worker."""
+
+    def setUp(self):
+        super().setUp()
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
+        self.stored = {}
+
+        def upload(file):
+            self.stored["uuid.csv"] = file.read()
+            return "uuid.csv"
+
+        patcher = patch(
+            "api.services.transaction_upload_services.upload_file_to_s3",
+            side_effect=upload,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            "api.tasks.download_file_from_s3", side_effect=self.stored.__getitem__
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_queued_import_records_progress(self):
+        rows = "".join(
+            f"2024-01-{day:02d},Coffee {day},Food,,-{day}.50\r\n"
+            for day in range(1, 6)
+        )
+        form = self._form(
+            ("Date,Description,Category,Inflow,Outflow\r\n" + rows).encode()
+        )
+        with patch.object(CSVProfile, "IMPORT_BATCH_SIZE", 2), patch(
+            "api.services.transaction_upload_services.tag_transactions"
+        ) as mock_tag:
+            result = start_transactions_import(form)
+
+        self.assertTrue(result.success)
+        transaction_import = TransactionImport.objects.get()
+        self.assertEqual(result.transaction_import, transaction_import)
+        self.assertEqual(transaction_import.status, TransactionImport.Status.COMPLETE)
+        self.assertEqual(transaction_import.user_filename, "transactions.csv")
+        self.assertEqual(transaction_import.imported_count, 5)
+        self.assertIsNotNone(transaction_import.completed)
+        self.assertEqual(mock_tag.call_count, 3)
+        self.assertEqual(
+            Transaction.objects.filter(account=self.account).count(), 5
+        )
+
+    def test_failed_import_keeps_committed_batches(self):
+        form = self._form(
+            b"Date,Description,Category,Inflow,Outflow\r\n"
+            b"2024-01-01,Coffee,Food,,-1\r\n"
+            b"2024-01-02,Coffee,Food,,-2\r\n"
+            b"not a date,Coffee,Food,,-3\r\n"
+        )
+        with patch.object(CSVProfile, "IMPORT_BATCH_SIZE", 2):
+            start_transactions_import(form)
+
+        transaction_import = TransactionImport.objects.get()
+        self.assertEqual(transaction_import.status, TransactionImport.Status.FAILED)
+        self.assertIn("not a date", transaction_import.error_message)
+        self.assertEqual(transaction_import.imported_count, 2)
+        self.assertEqual(
+            Transaction.objects.filter(account=self.account).count(), 2
+        )
+
+    def test_s3_upload_failure(self):
+        form = self._form(b"Date,Description,Category,Inflow,Outflow\r\n")
+        with patch(
+            "api.services.transaction_upload_services.upload_file_to_s3",
+            return_value={"error": "Access Denied", "message": "Upload failed"},
+        ):
+            result = start_transactions_import(form)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "Upload failed")
+        self.assertFalse(TransactionImport.objects.exists())
+
+    def test_dispatch_failure_marks_the_import_failed(self):
+        form = self._form(b"Date,Description,Category,Inflow,Outflow\r\n")
+        with patch(
+            "api.tasks.import_transactions_csv.delay",
+            side_effect=ConnectionError("broker down"),
+        ):
+            result = start_transactions_import(form)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, QUEUE_ERROR)
+        transaction_import = TransactionImport.objects.get()
+        self.assertEqual(result.transaction_import, transaction_import)
+        self.assertEqual(transaction_import.status, TransactionImport.Status.FAILED)
+        self.assertEqual(transaction_import.error_message, "broker down")
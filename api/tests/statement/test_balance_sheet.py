@@ -1,5 +1,7 @@
 from decimal import Decimal
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from api.statement import BalanceSheet, IncomeStatement
 from api.models import Account, JournalEntryItem, JournalEntry, Transaction
 from api.tests.scenario_builders import (
@@ -213,6 +215,27 @@ class BalanceSheetTest(TestCase):
         self.assertEqual(investment_gains_losses, 50)
         self.assertEqual(net_retained_earnings, 340)
 
+    def test_retained_earnings_share_the_balance_sheet_aggregate(self):
+        # One aggregate read over every account type feeds the balances, the
+        # retained earnings and the unrealized-gains split. Mid-month, so the
+        # read includes the raw-item tail as well as the snapshot.
+        with CaptureQueriesContext(connection) as queries:
+            balance_sheet = BalanceSheet('2023-01-28')
+        item_scans = [
+            query for query in queries
+            if 'api_journalentryitem' in query['sql']
+        ]
+        snapshot_reads = [
+            query for query in queries
+            if 'api_accountbalancesnapshot' in query['sql']
+        ]
+        self.assertEqual(len(item_scans), 1)
+        self.assertEqual(len(snapshot_reads), 1)
+        self.assertEqual(
+            balance_sheet.get_retained_earnings_values(),
+            BalanceSheet('2023-01-31').get_retained_earnings_values(),
+        )
+
     def test_get_balance(self):
 
         balance_sheet = BalanceSheet('2023-01-31')
@@ -226,6 +249,14 @@ class BalanceSheetTest(TestCase):
         balance = balance_sheet.get_balance(fake_account)
         self.assertEqual(balance, 0)
 
+    def test_get_balance_index(self):
+        balance_sheet = BalanceSheet('2023-01-31')
+        balance_index = balance_sheet.get_balance_index()
+        self.assertEqual(balance_index[self.cash.pk].amount, 440)
+        # The synthetic retained-earnings rows are unsaved, so not indexed
+        self.assertEqual(len(balance_index), len(balance_sheet.balances) - 2)
+        self.assertIs(balance_sheet.get_balance_index(), balance_index)
+
     def test_get_cash_percent_assets(self):
         balance_sheet = BalanceSheet('2023-01-31')
         self.assertEqual(
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from django.test import TestCase
+from api.statement import (
+    BalanceSheet,
+    CashFlowStatement,
+    FrameLedger,
+    IncomeStatement,
+    LedgerTotals,
+)
+from api.models import Account, Entity
+from api.tests.scenario_builders import create_closed_transaction_with_journal_entry
+
+
+def _balance_rows(statement):
+    return [
+        (balance.account.name, balance.amount) for balance in statement.balances
+    ]
+
+
+class FrameLedgerParityTest(TestCase):
+    """The pandas backend must reproduce the ORM statements exactly."""
+
+    def setUp(self):
+        self.cash = Account.objects.create(
+            name='1000-Cash', type=Account.Type.ASSET,
+            sub_type=Account.SubType.CASH,
+        )
+        brokerage = Account.objects.create(
+            name='1500-Brokerage', type=Account.Type.ASSET,
+            sub_type=Account.SubType.SECURITIES_UNRESTRICTED,
+        )
+        Account.objects.create(
+            name='3000-Starting Equity', type=Account.Type.EQUITY,
+            sub_type=Account.SubType.RETAINED_EARNINGS,
+            special_type=Account.SpecialType.STARTING_EQUITY,
+        )
+        salary = Account.objects.create(
+            name='4000-Salary', type=Account.Type.INCOME,
+            sub_type=Account.SubType.SALARY,
+        )
+        gains = Account.objects.create(
+            name='4900-Unrealized', type=Account.Type.INCOME,
+            sub_type=Account.SubType.UNREALIZED_INVESTMENT_GAINS,
+        )
+        groceries = Account.objects.create(
+            name='5000-Groceries', type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+        )
+        employer = Entity.objects.create(name='Employer')
+        grocer = Entity.objects.create(name='Grocer')
+
+        entries = [
+            ('2022-12-20', self.cash, salary, '500', None, employer),
+            ('2023-01-05', self.cash, salary, '1000', None, employer),
+            ('2023-01-10', groceries, self.cash, '80.25', grocer, None),
+            ('2023-01-12', groceries, self.cash, '19.75', None, None),
+            ('2023-01-31', brokerage, self.cash, '300', None, None),
+            ('2023-02-15', brokerage, gains, '42.10', None, None),
+        ]
+        for txn_date, debit, credit, amount, debit_entity, credit_entity in entries:
+            create_closed_transaction_with_journal_entry(
+                date=txn_date,
+                debit_account=debit,
+                credit_account=credit,
+                amount=Decimal(amount),
+                debit_entity=debit_entity,
+                credit_entity=credit_entity,
+            )
+        self.ledger = FrameLedger()
+
+    def test_cumulative_totals_match_orm(self):
+        for end_date in ['2022-12-31', '2023-01-20', '2023-02-28', '2500-01-01']:
+            orm_totals = LedgerTotals.load(list(Account.Type), end_date)
+            frame_totals = self.ledger.get_cumulative(end_date)
+            self.assertEqual(
+                _balance_rows(BalanceSheet(end_date, ledger_totals=frame_totals)),
+                _balance_rows(BalanceSheet(end_date, ledger_totals=orm_totals)),
+            )
+
+    def test_income_statement_matches_orm(self):
+        orm = IncomeStatement('2023-01-31', '2023-01-01')
+        frame = IncomeStatement(
+            '2023-01-31',
+            '2023-01-01',
+            ledger_totals=self.ledger.get_flows('2022-12-31', '2023-01-31'),
+        )
+        self.assertEqual(_balance_rows(frame), _balance_rows(orm))
+
+    def test_investing_flows_match_orm(self):
+        orm = CashFlowStatement(
+            IncomeStatement('2023-02-28', '2023-01-01'),
+            BalanceSheet('2022-12-31'),
+            BalanceSheet('2023-02-28'),
+        )
+        frame = CashFlowStatement(
+            IncomeStatement(
+                '2023-02-28',
+                '2023-01-01',
+                ledger_totals=self.ledger.get_flows('2022-12-31', '2023-02-28'),
+            ),
+            BalanceSheet(
+                '2022-12-31', ledger_totals=self.ledger.get_cumulative('2022-12-31')
+            ),
+            BalanceSheet(
+                '2023-02-28', ledger_totals=self.ledger.get_cumulative('2023-02-28')
+            ),
+            investing_totals=self.ledger.get_investing_flows(
+                '2022-12-31', '2023-02-28'
+            ),
+        )
+        # The unrealized-gain mark is non-cash, so only the purchase shows.
+        self.assertEqual(
+            [(b.account.name, b.amount) for b in frame.cash_from_investing_balances],
+            [('1500-Brokerage', -300)],
+        )
+        self.assertEqual(
+            [(b.account.name, b.amount) for b in frame.get_balances()],
+            [(b.account.name, b.amount) for b in orm.get_balances()],
+        )
+
+    def test_empty_ledger(self):
+        ledger = FrameLedger(end_date='2000-01-01')
+        self.assertEqual(ledger.get_cumulative('2023-01-31').totals, {})
+        self.assertEqual(ledger.get_investing_flows('2022-12-31', '2023-01-31'), {})
@@ -0,0 +1,70 @@
+import time
+from decimal import Decimal
+from django.test import TestCase
+from api.statement import BalanceSheet, LedgerTotals, Statement
+from api.models import Account
+
+
+class LedgerTotalsMergeBenchmark(TestCase):
+    """Merging totals into balances stays linear in the chart of accounts."""
+
+    ACCOUNT_COUNT = 2000
+    # A name-matching merge needs ~4M comparisons at this size; the id-keyed
+    # join finishes in a few milliseconds, so this budget leaves headroom for
+    # slow CI machines while still catching a quadratic regression.
+    TIME_BUDGET_SECONDS = 0.5
+
+    @classmethod
+    def setUpTestData(cls):
+        Account.objects.bulk_create(
+            [
+                Account(
+                    name=f'{number:04d}-Asset',
+                    type=Account.Type.ASSET,
+                    sub_type=Account.SubType.CASH,
+                )
+                for number in range(cls.ACCOUNT_COUNT // 2)
+            ]
+            + [
+                Account(
+                    name=f'{number:04d}-Expense',
+                    type=Account.Type.EXPENSE,
+                    sub_type=Account.SubType.OPERATING,
+                )
+                for number in range(cls.ACCOUNT_COUNT // 2)
+            ]
+        )
+
+    def setUp(self):
+        accounts = list(Account.objects.all())
+        # Every other account has activity; the rest must zero-fill.
+        totals = {
+            account.pk: (Decimal('100'), Decimal('40'))
+            for account in accounts[::2]
+        }
+        self.ledger_totals = LedgerTotals(accounts, totals)
+
+    def test_merge_is_linear(self):
+        account_types = list(Account.Type)
+        started = time.perf_counter()
+        balances = Statement._get_balance_from_aggregates(
+            self.ledger_totals.get_aggregates(account_types), '2023-01-31', 'stock'
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(balances), self.ACCOUNT_COUNT)
+        self.assertLess(elapsed, self.TIME_BUDGET_SECONDS)
+
+    def test_balance_sheet_from_totals_is_linear(self):
+        started = time.perf_counter()
+        with self.assertNumQueries(0):
+            balance_sheet = BalanceSheet(
+                '2023-01-31', ledger_totals=self.ledger_totals
+            )
+        elapsed = time.perf_counter() - started
+
+        # Half the accounts are assets, plus the two synthetic equity rows
+        self.assertEqual(
+            len(balance_sheet.balances), self.ACCOUNT_COUNT // 2 + 2
+        )
+        self.assertLess(elapsed, self.TIME_BUDGET_SECONDS)
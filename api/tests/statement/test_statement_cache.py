@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from api.statement import statement_cache
+from api.models import Account, LedgerVersion
+from api.tests.scenario_builders import create_closed_transaction_with_journal_entry
+
+
+class StatementCacheTest(TestCase):
+
+    def setUp(self):
+        statement_cache.clear()
+        self.cash = Account.objects.create(
+            name='1000-Cash',
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.CASH
+        )
+        self.salary = Account.objects.create(
+            name='4000-Salary',
+            type=Account.Type.INCOME,
+            sub_type=Account.SubType.SALARY
+        )
+        create_closed_transaction_with_journal_entry(
+            date='2023-01-15',
+            debit_account=self.cash,
+            credit_account=self.salary,
+            amount=Decimal('100'),
+        )
+
+    def tearDown(self):
+        statement_cache.clear()
+
+    def test_repeat_read_is_served_from_cache(self):
+        first = statement_cache.get_balance_sheet('2023-01-31')
+        with CaptureQueriesContext(connection) as queries:
+            second = statement_cache.get_balance_sheet(date(2023, 1, 31))
+        # Only the version lookup; the date and its ISO string share a key.
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(second.get_balance(self.cash), first.get_balance(self.cash))
+        self.assertEqual((statement_cache.hits, statement_cache.misses), (1, 1))
+
+    def test_item_write_invalidates(self):
+        before = statement_cache.get_income_statement('2023-01-31', '2023-01-01')
+        create_closed_transaction_with_journal_entry(
+            date='2023-01-20',
+            debit_account=self.cash,
+            credit_account=self.salary,
+            amount=Decimal('50'),
+        )
+        after = statement_cache.get_income_statement('2023-01-31', '2023-01-01')
+        self.assertEqual(before.net_income, 100)
+        self.assertEqual(after.net_income, 150)
+        self.assertEqual(statement_cache.misses, 2)
+
+    def test_account_change_invalidates(self):
+        statement_cache.get_balance_sheet('2023-01-31')
+        self.cash.name = '1000-Checking'
+        self.cash.save()
+        balance_sheet = statement_cache.get_balance_sheet('2023-01-31')
+        self.assertIn(
+            '1000-Checking',
+            [balance.account.name for balance in balance_sheet.balances]
+        )
+
+    def test_version_changes_on_write(self):
+        version = LedgerVersion.get_current()
+        LedgerVersion.bump()
+        self.assertNotEqual(LedgerVersion.get_current(), version)
+
+    def test_trend_balances_are_cached(self):
+        first = statement_cache.get_trend_balances('2023-01-01', date(2023, 2, 28))
+        second = statement_cache.get_trend_balances('2023-01-01', date(2023, 2, 28))
+        self.assertEqual(len(first), len(second))
+        self.assertEqual((statement_cache.hits, statement_cache.misses), (1, 1))
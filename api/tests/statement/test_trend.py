@@ -1,7 +1,9 @@
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
+from django.db import connection
 from django.test import TestCase
-from api.statement import IncomeStatement, Trend
+from django.test.utils import CaptureQueriesContext
+from api.statement import BalanceSheet, CashFlowStatement, IncomeStatement, Trend
 from api.models import Account
 from api.tests.scenario_builders import (
     create_closed_transaction_with_journal_entry,
@@ -158,3 +160,131 @@ class TrendTest(TestCase):
             and b.account.type == Account.Type.EXPENSE
         )
         self.assertEqual(tagged_expense, engine_expense)
+
+
+def _row_key(balance):
+    return (
+        balance.statement,
+        balance.date,
+        balance.account.name,
+        balance.type,
+        balance.amount,
+    )
+
+
+def _per_month_reference(trend):
+    """The statements Trend used to build one month at a time, each with its
+    own queries. The single-pass engine must reproduce these rows exactly."""
+    rows = []
+    for month in trend._get_month_ranges():
+        income_statement = IncomeStatement(end_date=month.end, start_date=month.start)
+        balance_sheet = BalanceSheet(end_date=month.end)
+        balance_sheet_start = BalanceSheet(end_date=month.start - timedelta(days=1))
+        cash_flow = CashFlowStatement(
+            income_statement, balance_sheet_start, balance_sheet
+        )
+        for origin, balances in [
+            ('income_statement', income_statement.get_balances()),
+            ('balance_sheet', balance_sheet.balances),
+            ('cash_flow', cash_flow.get_balances()),
+        ]:
+            for balance in balances:
+                rows.append((origin, balance.date, balance.account.name,
+                             balance.type, balance.amount))
+    return rows
+
+
+class TrendEngineParityTest(TestCase):
+    def setUp(self):
+        cash = Account.objects.create(
+            name='1000-Cash', type=Account.Type.ASSET,
+            sub_type=Account.SubType.CASH,
+        )
+        brokerage = Account.objects.create(
+            name='1500-Brokerage', type=Account.Type.ASSET,
+            sub_type=Account.SubType.SECURITIES_UNRESTRICTED,
+        )
+        vehicle = Account.objects.create(
+            name='1700-Vehicle', type=Account.Type.ASSET,
+            sub_type=Account.SubType.VEHICLES,
+        )
+        card = Account.objects.create(
+            name='2000-Card', type=Account.Type.LIABILITY,
+            sub_type=Account.SubType.SHORT_TERM_DEBT,
+        )
+        mortgage = Account.objects.create(
+            name='2500-Mortgage', type=Account.Type.LIABILITY,
+            sub_type=Account.SubType.LONG_TERM_DEBT,
+        )
+        Account.objects.create(
+            name='3000-Starting Equity', type=Account.Type.EQUITY,
+            sub_type=Account.SubType.RETAINED_EARNINGS,
+            special_type=Account.SpecialType.STARTING_EQUITY,
+        )
+        salary = Account.objects.create(
+            name='4000-Salary', type=Account.Type.INCOME,
+            sub_type=Account.SubType.SALARY,
+        )
+        gains = Account.objects.create(
+            name='4900-Unrealized', type=Account.Type.INCOME,
+            sub_type=Account.SubType.UNREALIZED_INVESTMENT_GAINS,
+        )
+        groceries = Account.objects.create(
+            name='5000-Groceries', type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+        )
+        deprec = Account.objects.create(
+            name='5900-Depreciation', type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING, is_depreciation=True,
+        )
+
+        entries = [
+            ('2022-11-20', cash, salary, '500'),
+            ('2023-01-05', cash, salary, '1000'),
+            ('2023-01-10', groceries, card, '80.25'),
+            ('2023-01-31', brokerage, cash, '300'),
+            ('2023-02-14', card, cash, '80.25'),
+            ('2023-02-15', brokerage, gains, '42.10'),
+            ('2023-02-28', deprec, vehicle, '25'),
+            ('2023-03-01', vehicle, mortgage, '900'),
+            ('2023-03-17', cash, brokerage, '120'),
+            ('2023-04-30', groceries, cash, '15.50'),
+        ]
+        for txn_date, debit, credit, amount in entries:
+            create_closed_transaction_with_journal_entry(
+                date=txn_date,
+                debit_account=debit,
+                credit_account=credit,
+                amount=Decimal(amount),
+                transaction_account=cash,
+            )
+
+    def _assert_matches_reference(self, trend):
+        engine_rows = [_row_key(b) for b in trend.get_balances()]
+        self.assertEqual(engine_rows, _per_month_reference(trend))
+
+    def test_month_aligned_trend_matches_per_month_statements(self):
+        self._assert_matches_reference(Trend('2023-01-01', date(2023, 5, 31)))
+
+    def test_mid_month_start_and_end_match_per_month_statements(self):
+        self._assert_matches_reference(Trend('2023-01-15', date(2023, 4, 20)))
+
+    def test_query_count_is_independent_of_month_count(self):
+        with CaptureQueriesContext(connection) as short_run:
+            Trend('2023-01-01', date(2023, 2, 28)).get_balances()
+        with CaptureQueriesContext(connection) as long_run:
+            Trend('2021-01-01', date(2024, 12, 31)).get_balances()
+        self.assertEqual(len(short_run), len(long_run))
+        self.assertLessEqual(len(long_run), 3)
+
+    def test_pandas_backend_matches_per_month_statements(self):
+        self._assert_matches_reference(
+            Trend('2023-01-01', date(2023, 5, 31), backend='pandas')
+        )
+        self._assert_matches_reference(
+            Trend('2023-01-15', date(2023, 4, 20), backend='pandas')
+        )
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Trend('2023-01-01', date(2023, 5, 31), backend='numpy')
@@ -0,0 +1,160 @@
+"""Tests for the diagnose_cash_flow_discrepancy management command."""
+
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.management.commands.diagnose_cash_flow_discrepancy import (
+    Command,
+    DailyResiduals,
+)
+from api.models import Account
+from api.tests.scenario_builders import (
+    create_closed_transaction_with_journal_entry,
+    create_multi_line_journal_entry,
+)
+
+
+class DailyResidualsTest(TestCase):
+    def setUp(self):
+        cash = Account.objects.create(
+            name="1000-Cash", type=Account.Type.ASSET, sub_type=Account.SubType.CASH
+        )
+        brokerage = Account.objects.create(
+            name="1500-Brokerage",
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.SECURITIES_UNRESTRICTED,
+        )
+        vehicle = Account.objects.create(
+            name="1700-Vehicle",
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.VEHICLES,
+        )
+        card = Account.objects.create(
+            name="2000-Card",
+            type=Account.Type.LIABILITY,
+            sub_type=Account.SubType.SHORT_TERM_DEBT,
+        )
+        mortgage = Account.objects.create(
+            name="2500-Mortgage",
+            type=Account.Type.LIABILITY,
+            sub_type=Account.SubType.LONG_TERM_DEBT,
+        )
+        starting_equity = Account.objects.create(
+            name="3000-Starting Equity",
+            type=Account.Type.EQUITY,
+            sub_type=Account.SubType.RETAINED_EARNINGS,
+            special_type=Account.SpecialType.STARTING_EQUITY,
+        )
+        salary = Account.objects.create(
+            name="4000-Salary", type=Account.Type.INCOME, sub_type=Account.SubType.SALARY
+        )
+        gains = Account.objects.create(
+            name="4900-Unrealized",
+            type=Account.Type.INCOME,
+            sub_type=Account.SubType.UNREALIZED_INVESTMENT_GAINS,
+        )
+        groceries = Account.objects.create(
+            name="5000-Groceries",
+            type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+        )
+        depreciation = Account.objects.create(
+            name="5900-Depreciation",
+            type=Account.Type.EXPENSE,
+            sub_type=Account.SubType.OPERATING,
+            is_depreciation=True,
+        )
+
+        entries = [
+            ("2022-11-20", cash, starting_equity, "500"),
+            ("2023-01-05", cash, salary, "1000"),
+            ("2023-01-10", groceries, card, "80.25"),
+            ("2023-01-31", brokerage, cash, "300"),
+            ("2023-02-14", card, cash, "80.25"),
+            ("2023-02-15", brokerage, gains, "42.10"),
+            ("2023-02-28", depreciation, vehicle, "25"),
+            ("2023-03-01", vehicle, mortgage, "900"),
+            ("2023-03-17", cash, brokerage, "120"),
+        ]
+        for txn_date, debit, credit, amount in entries:
+            create_closed_transaction_with_journal_entry(
+                date=txn_date,
+                debit_account=debit,
+                credit_account=credit,
+                amount=Decimal(amount),
+                transaction_account=cash,
+            )
+        # A sale booked with its gain in one entry: the whole-entry non-cash
+        # exclusion drops the real cash leg, leaving a residual on this day.
+        create_multi_line_journal_entry(
+            date="2023-04-12",
+            entries=[
+                {"account": cash, "type": "debit", "amount": Decimal("200")},
+                {"account": brokerage, "type": "credit", "amount": Decimal("150")},
+                {"account": gains, "type": "credit", "amount": Decimal("50")},
+            ],
+        )
+
+    def test_matches_statement_residuals(self):
+        residuals = DailyResiduals()
+        command = Command()
+        periods = [
+            ("2022-01-01", "2022-12-31"),
+            ("2023-01-01", "2023-12-31"),
+            ("2023-01-15", "2023-03-20"),
+            ("2023-02-01", "2023-02-28"),
+            ("2023-04-12", "2023-04-12"),
+            ("2023-04-13", "2023-12-31"),
+        ]
+        for start, end in periods:
+            self.assertAlmostEqual(
+                residuals.get(start, end),
+                command._period_residual(start, end),
+                places=2,
+                msg=f"{start}..{end}",
+            )
+
+    def test_flags_the_dropped_cash_leg(self):
+        flagged = DailyResiduals().get_flagged_days()
+        self.assertEqual(
+            [(day, round(residual, 2)) for day, residual in flagged],
+            [(datetime.date(2023, 4, 12), Decimal("200.00"))],
+        )
+
+    def test_batch_localization_reports_flagged_days(self):
+        out = StringIO()
+        Command(stdout=out)._localize_in_batch()
+        output = out.getvalue()
+        self.assertIn("  2023: 200", output)
+        self.assertIn("    2023-04: 200", output)
+        self.assertIn("      2023-04-12: 200", output)
+        self.assertIn("JE", output)
+
+    def test_batch_option(self):
+        out = StringIO()
+        call_command("diagnose_cash_flow_discrepancy", batch=True, stdout=out)
+        self.assertIn("Cash-flow discrepancy: 200", out.getvalue())
+        # The mixed sale entry is flagged as a dropped cash leg
+        self.assertIn("net cash dropped: 200.00", out.getvalue())
+
+    def test_time_localization_reports_the_flagged_day(self):
+        out = StringIO()
+        Command(stdout=out)._localize_in_time()
+        output = out.getvalue()
+        self.assertIn("  2023: 200", output)
+        self.assertIn("    2023-04: 200", output)
+        self.assertIn("      2023-04-12: 200", output)
+
+    def test_period_residuals_read_the_loaded_ledger(self):
+        command = Command()
+        command.ledger
+        with self.assertNumQueries(0):
+            for start, end in [
+                ("2023-01-01", "2023-12-31"),
+                ("2023-04-12", "2023-04-12"),
+            ]:
+                command._period_residual(start, end)
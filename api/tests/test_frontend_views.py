@@ -1,8 +1,11 @@
 from datetime import date
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, RequestFactory
 from django.urls import reverse
 from django.contrib.auth.models import User
-from api.models import TaxCharge, Transaction, Account
+from api.models import TaxCharge, Transaction, TransactionImport, Account
+from api.tests.testing_factories import AccountFactory
 from api import utils
 
 
@@ -121,3 +124,32 @@ class UploadTransactionsViewTest(TestCase):
         """POST with neither 'transactions' nor 'paystubs' should return 400."""
         response = self.client.post(reverse('upload-transactions'), {"other": "data"})
         self.assertEqual(response.status_code, 400)
+
+    @patch("api.views.frontend_views.ASYNC_IMPORT_MIN_SIZE", 1)
+    @patch("api.tasks.import_transactions_csv")
+    @patch("api.services.transaction_upload_services.upload_file_to_s3")
+    def test_large_upload_is_queued_and_polled(self, mock_upload, mock_task):
+        mock_upload.return_value = "uuid.csv"
+        account = AccountFactory()
+        upload = SimpleUploadedFile(
+            "transactions.csv", b"date,amount\n", content_type="text/csv"
+        )
+        response = self.client.post(
+            reverse('upload-transactions'),
+            {"transactions": "", "account": account.pk, "transaction_csv": upload},
+        )
+
+        transaction_import = TransactionImport.objects.get()
+        mock_task.delay.assert_called_once_with(transaction_import.pk)
+        status_url = reverse('transaction-import-status', args=[transaction_import.pk])
+        self.assertContains(response, "is queued for import")
+        self.assertContains(response, status_url)
+
+        # The poller stops once the worker has finished
+        transaction_import.status = TransactionImport.Status.COMPLETE
+        transaction_import.imported_count = 1200
+        transaction_import.save()
+        self.client.force_login(User.objects.create_user(username='poller'))
+        response = self.client.get(status_url)
+        self.assertContains(response, "Uploaded 1,200 transactions")
+        self.assertNotContains(response, "every 2s")
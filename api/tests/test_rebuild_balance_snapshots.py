@@ -0,0 +1,50 @@
+"""Tests for the rebuild_balance_snapshots management command."""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from api.models import Account, AccountBalanceSnapshot
+from api.tests.scenario_builders import create_closed_transaction_with_journal_entry
+from api.tests.testing_factories import AccountFactory
+
+
+class RebuildBalanceSnapshotsTest(TestCase):
+    def setUp(self):
+        cash = AccountFactory(type=Account.Type.ASSET, sub_type=Account.SubType.CASH)
+        groceries = AccountFactory(
+            type=Account.Type.EXPENSE, sub_type=Account.SubType.OPERATING
+        )
+        create_closed_transaction_with_journal_entry(
+            date="2024-01-15",
+            debit_account=groceries,
+            credit_account=cash,
+            amount=Decimal("40"),
+        )
+
+    def _run(self, **kwargs):
+        out = StringIO()
+        call_command("rebuild_balance_snapshots", stdout=out, **kwargs)
+        return out.getvalue()
+
+    def test_verify_passes_on_a_maintained_snapshot(self):
+        output = self._run(verify=True)
+        self.assertIn("Snapshot matches the ledger", output)
+
+    def test_verify_reports_drift_without_writing(self):
+        AccountBalanceSnapshot.objects.update(debit_total=Decimal("1"))
+        with self.assertRaises(CommandError):
+            self._run(verify=True)
+        self.assertEqual(
+            AccountBalanceSnapshot.objects.filter(debit_total=Decimal("1")).count(),
+            2,
+        )
+
+    def test_rebuild_repairs_drift(self):
+        AccountBalanceSnapshot.objects.all().delete()
+        self._run()
+        self.assertEqual(AccountBalanceSnapshot.objects.count(), 2)
+        self.assertIn("Snapshot matches the ledger", self._run(verify=True))
@@ -3,6 +3,7 @@
 The command maps by numeric prefix only, so these use synthetic labels.
 """
 
+from decimal import Decimal
 from io import StringIO
 
 from django.core.management import call_command
@@ -10,6 +11,8 @@ from django.core.management.base import CommandError
 from django.test import TestCase
 
 from api.models import Account
+from api.statement import statement_cache
+from api.tests.scenario_builders import create_closed_transaction_with_journal_entry
 from api.tests.testing_factories import AccountFactory
 
 
@@ -77,3 +80,32 @@ class RenumberAccountsTest(TestCase):
         self.assertEqual(account.name, "1000-Checking Account")
         self.assertIn("Dry run", output)
         self.assertIn("1000-Checking Account  ->  1010-Checking Account", output)
+
+    def test_invalidates_cached_statements(self):
+        cash = AccountFactory(
+            name="1000-Checking Account",
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.CASH,
+        )
+        salary = AccountFactory(
+            name="4000-Salary",
+            type=Account.Type.INCOME,
+            sub_type=Account.SubType.SALARY,
+        )
+        create_closed_transaction_with_journal_entry(
+            date="2023-01-15",
+            debit_account=cash,
+            credit_account=salary,
+            amount=Decimal("100"),
+        )
+        statement_cache.clear()
+        self.addCleanup(statement_cache.clear)
+        statement_cache.get_balance_sheet("2023-01-31")
+
+        self._run()
+
+        balance_sheet = statement_cache.get_balance_sheet("2023-01-31")
+        self.assertIn(
+            "1010-Checking Account",
+            [balance.account.name for balance in balance_sheet.balances],
+        )
@@ -0,0 +1,100 @@
+"""Tests for the payables/receivables tagging HTMX views."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.urls import reverse
+
+from api.models import Account, JournalEntryItem
+from api.tests.test_helpers import HTMXViewTestCase
+from api.tests.testing_factories import (
+    AccountFactory,
+    EntityFactory,
+    JournalEntryItemFactory,
+)
+
+
+@patch("api.views.entity_views.UNTAGGED_PAGE_SIZE", 2)
+class UntaggedQueueViewTest(HTMXViewTestCase):
+    def setUp(self):
+        super().setUp()
+        account = AccountFactory(
+            name="Receivable",
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.ACCOUNTS_RECEIVABLE,
+        )
+        self.entity = EntityFactory()
+        self.items = [
+            JournalEntryItemFactory(
+                journal_entry__date=date(2026, 1, day),
+                account=account,
+                entity=None,
+                type=JournalEntryItem.JournalEntryType.CREDIT,
+                amount=Decimal("10.00"),
+            )
+            for day in range(1, 6)
+        ]
+
+    def _rendered_item_ids(self, response):
+        return [
+            item.pk
+            for item in self.items
+            if f"tag/form/{item.pk}/" in response.content.decode()
+        ]
+
+    def test_next_page(self):
+        response = self.client.get(
+            reverse("untagged-items"), {"after": self.items[1].pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "5 untagged")
+        self.assertEqual(
+            self._rendered_item_ids(response), [self.items[2].pk, self.items[3].pk]
+        )
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        response = self.client.get(reverse("untagged-items"), {"after": "garbage"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self._rendered_item_ids(response), [self.items[0].pk, self.items[1].pk]
+        )
+
+    def test_tagging_resumes_from_the_cursor(self):
+        response = self.client.post(
+            reverse("tag-entities-form", args=[self.items[2].pk]),
+            {"entity": self.entity.pk, "after": self.items[1].pk},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "4 untagged")
+        self.assertEqual(
+            self._rendered_item_ids(response), [self.items[3].pk, self.items[4].pk]
+        )
+
+
+class EntityHistoryViewTest(HTMXViewTestCase):
+    def setUp(self):
+        super().setUp()
+        account = AccountFactory(
+            name="Receivable",
+            type=Account.Type.ASSET,
+            sub_type=Account.SubType.ACCOUNTS_RECEIVABLE,
+        )
+        self.entity = EntityFactory()
+        self.item = JournalEntryItemFactory(
+            journal_entry__date=date(2026, 1, 1),
+            account=account,
+            entity=self.entity,
+            type=JournalEntryItem.JournalEntryType.CREDIT,
+            amount=Decimal("10.00"),
+        )
+
+    def test_malformed_cursor_falls_back_to_newest_page(self):
+        for before in ["garbage", "2026-01-01_1_notanumber", "2026-13-01_1_0"]:
+            with self.subTest(before=before):
+                response = self.client.get(
+                    reverse("entity-history", args=[self.entity.pk]),
+                    {"before": before},
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, f'id="row-{self.item.pk}"')
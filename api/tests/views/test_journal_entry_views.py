@@ -6,7 +6,9 @@ ensuring views, services, and helpers work together correctly.
 """
 
 import re
+from datetime import date
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth.models import User
 from django.test import Client, TestCase
@@ -403,6 +405,35 @@ class JournalEntryTableViewTest(TestCase):
         # Should NOT contain closed purchase transaction
         self.assertNotContains(response, str(self.closed_transaction.amount))
 
+    @patch("api.views.transaction_helpers.TRANSACTION_PAGE_SIZE", 1)
+    def test_table_is_served_in_windows(self):
+        """Test the table shows one window and links the next by cursor."""
+        self.open_transaction.date = date(2024, 1, 1)
+        self.open_transaction.save()
+        later = TransactionFactory(
+            account=self.account,
+            date=date(2024, 2, 1),
+            type=Transaction.TransactionType.INCOME,
+            is_closed=False,
+        )
+        url = reverse("journal-entries-table")
+        filters = {
+            "filter-is_closed": "False",
+            "filter-transaction_type": [Transaction.TransactionType.INCOME],
+        }
+
+        response = self.client.get(url, filters)
+        html = response.content.decode()
+        self.assertIn(f'data-transaction-id="{self.open_transaction.pk}"', html)
+        self.assertNotIn(f'data-transaction-id="{later.pk}"', html)
+        next_window = re.search(r'"window": "([^"]+)"', html).group(1)
+
+        response = self.client.get(url, {**filters, "window": next_window})
+        html = response.content.decode()
+        self.assertIn(f'data-transaction-id="{later.pk}"', html)
+        self.assertNotIn(f'data-transaction-id="{self.open_transaction.pk}"', html)
+        self.assertIn(f'value="{next_window}"', html)
+
 
 class JournalEntryFormViewTest(TestCase):
     """Tests for JournalEntryFormView (loading form for specific transaction)."""
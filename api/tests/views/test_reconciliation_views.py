@@ -3,10 +3,14 @@
 Covers the two UI-facing follow-ups to the unrealized-gains guard:
 - F3: a rejected gain/loss plug re-renders the table (200) with an inline alert.
 - F4: the Plug button only renders for investment accounts.
+- Plug all plugs every investment reconciliation for the date in one post.
+- The table loads in a constant number of queries, however many accounts exist.
 """
 from decimal import Decimal
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from api import utils
@@ -74,3 +78,75 @@ class ReconciliationPlugViewTest(HTMXViewTestCase):
 
         self.assertTrue(rows_with_plug[str(self.investment_account)])
         self.assertFalse(rows_with_plug[str(self.receivable_account)])
+
+    def test_plug_all_plugs_investments_in_one_post(self):
+        AccountFactory(
+            name="unrealized",
+            type=Account.Type.INCOME,
+            special_type=Account.SpecialType.UNREALIZED_GAINS_AND_LOSSES,
+        )
+        response = self.client.post(
+            reverse("reconciliation"),
+            {
+                "plug_all": str(self.date),
+                "date": str(self.date),
+                "form-TOTAL_FORMS": "0",
+                "form-INITIAL_FORMS": "0",
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "alert-danger")
+        self.investment_recon.refresh_from_db()
+        self.assertEqual(self.investment_recon.transaction.amount, Decimal("200.00"))
+        # Only the investment account is plugged
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_plug_all_skips_invalid_formset(self):
+        response = self.client.post(
+            reverse("reconciliation"),
+            {
+                "plug_all": str(self.date),
+                "date": str(self.date),
+                "form-TOTAL_FORMS": "1",
+                "form-INITIAL_FORMS": "1",
+                "form-0-id": "999999",
+                "form-0-amount": "250.00",
+            },
+        )
+
+        self.assertContains(response, "Fix the reconciliation amounts")
+        self.assertEqual(Transaction.objects.count(), 0)
+
+
+class ReconciliationTableQueryCountTest(HTMXViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.date = utils.get_last_day_of_last_month()
+        self._create_accounts(0, 3)
+
+    def _create_accounts(self, start, stop):
+        for number in range(start, stop):
+            AccountFactory(
+                name=f"10{number:02d}-Checking",
+                type=Account.Type.ASSET,
+                sub_type=Account.SubType.CASH,
+                is_closed=False,
+            )
+
+    def _load_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("reconciliation-table"), {"date": str(self.date)}
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_constant(self):
+        # Both loads create rows for every account that lacks one.
+        few = self._load_table()
+        self._create_accounts(3, 12)
+        many = self._load_table()
+
+        self.assertEqual(many, few)
+        self.assertEqual(Reconciliation.objects.filter(date=self.date).count(), 12)
@@ -14,21 +14,27 @@ from api.models import Entity, JournalEntryItem
 from api.services.entity_services import (
     EntityHistoryData,
     GroupedEntityBalances,
+    UntaggedItemsData,
 )
 
 
-def render_untagged_entries_table(items: List[JournalEntryItem]) -> Optional[str]:
+def render_untagged_entries_table(untagged: UntaggedItemsData) -> Optional[str]:
     """
-    Renders the untagged journal entries table HTML.
+    Renders one page of the untagged journal entries table HTML.
 
     Returns None if there are no items to display.
     """
-    if not items:
+    if not untagged.items:
         return None
 
     return render_to_string(
         "api/tables/payables-receivables-table.html",
-        {"payables_receivables": items},
+        {
+            "payables_receivables": untagged.items,
+            "count": untagged.count,
+            "after": untagged.after,
+            "next_cursor": untagged.next_cursor,
+        },
     )
 
 
@@ -79,6 +85,13 @@ def render_entity_history_table(history_data: EntityHistoryData) -> str:
             "entity_name": history_data.entity_name,
             "account_name": history_data.account_name,
             "final_balance": final_balance,
+            "entity_id": history_data.entity_id,
+            "account_id": history_data.account_id,
+            "older_cursor": (
+                history_data.older_cursor.encode()
+                if history_data.older_cursor
+                else None
+            ),
         },
     )
 
@@ -5,6 +5,8 @@ These views handle HTTP orchestration, delegating business logic to services
 and rendering to helpers.
 """
 
+from decimal import InvalidOperation
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
@@ -16,12 +18,53 @@ from api.services import entity_services
 from api.views import entity_helpers
 from api.views.page_utils import render_full_page
 
+# Entity history rows per page; older rows load on demand.
+HISTORY_PAGE_SIZE = 100
+# Untagged queue rows per page.
+UNTAGGED_PAGE_SIZE = 50
+
+
+def _get_untagged_page(after=None):
+    """One page of the untagged queue, falling back to the first page once the
+    cursor runs past the end (e.g. after tagging the last items)."""
+    untagged = entity_services.get_untagged_journal_entry_items(
+        after=after, limit=UNTAGGED_PAGE_SIZE
+    )
+    if not untagged.items and after is not None:
+        untagged = entity_services.get_untagged_journal_entry_items(
+            limit=UNTAGGED_PAGE_SIZE
+        )
+    return untagged
+
+
+def _parse_cursor(value):
+    """Decodes an untagged-queue cursor; a missing or bad one reads as the
+    first page."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _parse_history_cursor(value):
+    """Decodes an entity history cursor; a missing or bad one reads as the
+    newest page."""
+    if not value:
+        return None
+    try:
+        return entity_services.HistoryCursor.decode(value)
+    except (InvalidOperation, ValueError):
+        return None
+
 
 def _render_full_page(
     is_initial_load: bool = False,
     preloaded_entity=None,
     preselected_entity=None,
     hide_zero: bool = True,
+    after=None,
 ) -> str:
     """
     Helper to render the full entities page.
@@ -31,9 +74,11 @@ def _render_full_page(
         preloaded_entity: Entity to pre-select in the form dropdown
         preselected_entity: Entity to highlight in the balances table
         hide_zero: Whether to hide $0-balance entities in the grouped view
+        after: Untagged-queue cursor to resume from, so tagging keeps the
+            user's place
     """
     # Get data via services
-    untagged = entity_services.get_untagged_journal_entry_items()
+    untagged = _get_untagged_page(after)
     grouped_balances = entity_services.get_grouped_entities_balances(
         hide_zero=hide_zero
     )
@@ -41,11 +86,13 @@ def _render_full_page(
     # Get history if entity selected
     history_html = ""
     if preselected_entity:
-        history_data = entity_services.get_entity_history(preselected_entity.id)
+        history_data = entity_services.get_entity_history(
+            preselected_entity.id, limit=HISTORY_PAGE_SIZE
+        )
         history_html = entity_helpers.render_entity_history_table(history_data)
 
     # Render via helpers
-    table_html = entity_helpers.render_untagged_entries_table(untagged.items)
+    table_html = entity_helpers.render_untagged_entries_table(untagged)
 
     form_html = None
     if untagged.first_item:
@@ -83,7 +130,10 @@ class EntityHistoryTable(LoginRequiredMixin, View):
     def get(self, request, entity_id):
         account_id_str = request.GET.get("account")
         account_id = int(account_id_str) if account_id_str else None
-        history_data = entity_services.get_entity_history(entity_id, account_id)
+        before = _parse_history_cursor(request.GET.get("before"))
+        history_data = entity_services.get_entity_history(
+            entity_id, account_id, before=before, limit=HISTORY_PAGE_SIZE
+        )
         html = entity_helpers.render_entity_history_table(history_data)
         return HttpResponse(html)
 
@@ -110,7 +160,22 @@ class TagEntitiesForm(LoginRequiredMixin, View):
         if form.is_valid():
             form.save()
 
-        html = _render_full_page(preloaded_entity=form.cleaned_data["entity"])
+        html = _render_full_page(
+            preloaded_entity=form.cleaned_data["entity"],
+            after=_parse_cursor(request.POST.get("after")),
+        )
+        return HttpResponse(html)
+
+
+class UntaggedItemsTable(LoginRequiredMixin, View):
+    """Returns one page of the untagged items table."""
+
+    login_url = "/login/"
+    redirect_field_name = "next"
+
+    def get(self, request):
+        untagged = _get_untagged_page(_parse_cursor(request.GET.get("after")))
+        html = entity_helpers.render_untagged_entries_table(untagged) or ""
         return HttpResponse(html)
 
 
@@ -2,15 +2,19 @@ import csv
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponse
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.template.loader import render_to_string
 from django.views import View
 
 from api import utils
 from api.forms import DocumentForm, UploadTransactionsForm, WalletForm
+from api.models import TransactionImport
 from api.services.paystub_services import get_paystubs_table_data
 from api.services.paystub_upload_services import process_paystub_upload
-from api.services.transaction_upload_services import import_transactions_from_csv
+from api.services.transaction_upload_services import (
+    import_transactions_from_csv,
+    start_transactions_import,
+)
 from api.statement import Trend
 from api.views.journal_entry_helpers import (
     render_paystubs_table,
@@ -28,6 +32,18 @@ def _flatten_form_errors(form) -> str:
     return " ".join(messages) or "Please correct the highlighted fields."
 
 
+# Uploads at least this large are imported by the Celery worker rather than
+# in the request, which gunicorn times out after 20 seconds.
+ASYNC_IMPORT_MIN_SIZE = 256 * 1024
+
+
+def render_transaction_import_status(transaction_import: TransactionImport) -> str:
+    return render_to_string(
+        "api/entry_forms/transaction-import-status.html",
+        {"transaction_import": transaction_import},
+    )
+
+
 class UploadTransactionsView(View):
 
     def get_textract_form_html(self, filename=None, error=None):
@@ -35,7 +51,14 @@ class UploadTransactionsView(View):
         template = "api/entry_forms/textract-form.html"
         return render_to_string(template, {"form": form, "filename": filename, "error": error})
 
-    def get_csv_form_html(self, transactions_count=None, account=None, error=None):
+    def get_csv_form_html(
+        self,
+        transactions_count=None,
+        account=None,
+        error=None,
+        skipped_count=0,
+        transaction_import=None,
+    ):
         form = UploadTransactionsForm()
         template = "api/entry_forms/upload-form.html"
         return render_to_string(
@@ -43,6 +66,8 @@ class UploadTransactionsView(View):
             {
                 "form": form,
                 "count": transactions_count,
+                "skipped": skipped_count,
+                "transaction_import": transaction_import,
                 "account": account,
                 "error": error,
             },
@@ -70,11 +95,21 @@ class UploadTransactionsView(View):
         if not form.is_valid():
             return self.get_csv_form_html(error=_flatten_form_errors(form))
 
+        if form.cleaned_data["transaction_csv"].size >= ASYNC_IMPORT_MIN_SIZE:
+            result = start_transactions_import(form)
+            if not result.success:
+                return self.get_csv_form_html(error=result.error)
+            return self.get_csv_form_html(
+                transaction_import=result.transaction_import
+            )
+
         result = import_transactions_from_csv(form)
         if not result.success:
             return self.get_csv_form_html(error=result.error)
         return self.get_csv_form_html(
-            transactions_count=result.count, account=result.account
+            transactions_count=result.count,
+            account=result.account,
+            skipped_count=result.skipped,
         )
 
     def handle_paystubs_form(self, request):
@@ -109,6 +144,15 @@ class UploadTransactionsView(View):
 # ------------------Wallet Transactions View-----------------------
 
 
+class TransactionImportStatusView(LoginRequiredMixin, View):
+    def get(self, request, transaction_import_id):
+        transaction_import = get_object_or_404(
+            TransactionImport.objects.select_related("account"),
+            pk=transaction_import_id,
+        )
+        return HttpResponse(render_transaction_import_status(transaction_import))
+
+
 class IndexView(LoginRequiredMixin, View):
     login_url = "/login/"
     redirect_field_name = "next"
@@ -146,7 +190,8 @@ class TrendView(LoginRequiredMixin, View):
         start_date = "2022-12-01"
         end_date = utils.get_last_day_of_last_month()
 
-        trends = Trend(start_date, end_date).get_balances()
+        # Every month since the start date: load the ledger once, in memory.
+        trends = Trend(start_date, end_date, backend="pandas").get_balances()
 
         trends_csv = [
             ["Date", "Account", "Type", "Amount", "Account Type", "Account Sub-type"]
@@ -24,6 +24,7 @@ from api.services.paystub_services import (
     get_paystubs_table_data,
 )
 from api.services.paystub_upload_services import retry_paystub_processing
+from api.services.transaction_services import get_transaction_window
 from api.views.journal_entry_helpers import (
     render_journal_entry_form,
     render_paystub_detail,
@@ -50,9 +51,18 @@ class JournalEntryTableView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         form = TransactionFilterForm(request.GET, prefix="filter")
         if form.is_valid():
-            transactions = form.get_transactions()
+            window = get_transaction_window(
+                form.get_transactions(),
+                after=transaction_helpers.parse_window(request.GET.get("window")),
+                limit=transaction_helpers.TRANSACTION_PAGE_SIZE,
+            )
+            transactions = window.transactions
             table_html = transaction_helpers.render_transaction_table(
-                transactions=transactions, row_url=reverse("journal-entries")
+                transactions=transactions,
+                row_url=reverse("journal-entries"),
+                after=window.after,
+                next_cursor=window.next_cursor,
+                page_url=reverse("journal-entries-table"),
             )
             try:
                 transaction = transactions[0]
@@ -134,6 +144,7 @@ class JournalEntryView(LoginRequiredMixin, View):
                 Transaction.TransactionType.INCOME,
                 Transaction.TransactionType.PURCHASE,
             ],
+            limit=transaction_helpers.TRANSACTION_PAGE_SIZE,
         )
         transactions = filter_result.transactions
 
@@ -146,7 +157,10 @@ class JournalEntryView(LoginRequiredMixin, View):
             get_url=reverse("journal-entries-table"),
         )
         table_html = transaction_helpers.render_transaction_table(
-            transactions=transactions, row_url=reverse("journal-entries")
+            transactions=transactions,
+            row_url=reverse("journal-entries"),
+            next_cursor=filter_result.next_cursor,
+            page_url=reverse("journal-entries-table"),
         )
         try:
             transaction = transactions[0]
@@ -267,13 +281,14 @@ class JournalEntryView(LoginRequiredMixin, View):
 
         # 5. Build response context via service
         filter_form = TransactionFilterForm(request.POST, prefix="filter")
-        current_index = metadata_form.cleaned_data["index"]
 
         context = get_post_save_context(
             filter_form=filter_form,
-            current_index=current_index,
+            saved_transaction=transaction,
             debit_formset=debit_formset,
             credit_formset=credit_formset,
+            after=transaction_helpers.parse_window(request.POST.get("window")),
+            limit=transaction_helpers.TRANSACTION_PAGE_SIZE,
         )
 
         # 6. Render response via helpers
@@ -290,6 +305,9 @@ class JournalEntryView(LoginRequiredMixin, View):
             transactions=context.transactions,
             index=context.highlighted_index,
             row_url=reverse("journal-entries"),
+            after=context.after,
+            next_cursor=context.next_cursor,
+            page_url=reverse("journal-entries-table"),
         )
         paystubs_table_data = get_paystubs_table_data()
         paystubs_table_html = render_paystubs_table(paystubs_table_data)
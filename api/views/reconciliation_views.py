@@ -1,3 +1,5 @@
+import datetime
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ValidationError
 from django.forms import modelformset_factory
@@ -10,6 +12,7 @@ from api import utils
 from api.factories import ReconciliationFactory
 from api.forms import ReconciliationFilterForm, ReconciliationForm
 from api.models import Reconciliation
+from api.services.reconciliation_services import plug_investment_reconciliations
 from api.statement import BalanceSheet
 from api.views.page_utils import render_full_page
 
@@ -54,6 +57,7 @@ class ReconciliationTableMixin:
                 "right_reconciliations": right_reconciliations,
                 "formset": formset,
                 "error": error,
+                "date": date,
             },
         )
 
@@ -120,9 +124,23 @@ class ReconciliationView(ReconciliationTableMixin, LoginRequiredMixin, View):
             )
             formset = ReconciliationFormset(request.POST)
 
-            if formset.is_valid():
+            formset_is_valid = formset.is_valid()
+            if formset_is_valid:
                 reconciliations = formset.save()
 
+            # Plug all saves the amounts on screen first, then plugs them.
+            if request.POST.get("plug_all"):
+                try:
+                    plug_date = datetime.date.fromisoformat(request.POST["plug_all"])
+                except ValueError:
+                    plug_error = "Invalid reconciliation date."
+                else:
+                    if formset_is_valid:
+                        result = plug_investment_reconciliations(plug_date)
+                        plug_error = result.error
+                    else:
+                        plug_error = "Fix the reconciliation amounts before plugging."
+
         filter_form = ReconciliationFilterForm(request.POST)
         if filter_form.is_valid():
             reconciliations = filter_form.get_reconciliations()
@@ -13,7 +13,7 @@ from django.views import View
 from api import utils
 from api.forms import FromToDateForm
 from api.services import statement_services
-from api.statement import BalanceSheet, IncomeStatement
+from api.statement import statement_cache
 from api.views import statement_helpers
 from api.views.page_utils import render_full_page
 
@@ -120,7 +120,7 @@ class StatementView(LoginRequiredMixin, View):
 
     def _render_income_statement(self, from_date, to_date):
         """Render income statement using services and helpers."""
-        income_statement = IncomeStatement(end_date=to_date, start_date=from_date)
+        income_statement = statement_cache.get_income_statement(to_date, from_date)
         summary = statement_services.build_statement_summary(income_statement)
         realized_balances, unrealized_balances = (
             statement_services.partition_income_balances(summary)
@@ -140,7 +140,7 @@ class StatementView(LoginRequiredMixin, View):
 
     def _render_income_statement_by_entity(self, from_date, to_date):
         """Render income statement grouped by entity using services and helpers."""
-        income_statement = IncomeStatement(end_date=to_date, start_date=from_date)
+        income_statement = statement_cache.get_income_statement(to_date, from_date)
         summary = statement_services.build_entity_income_summary(income_statement)
 
         return statement_helpers.render_income_statement_by_entity(
@@ -154,7 +154,7 @@ class StatementView(LoginRequiredMixin, View):
 
     def _render_balance_sheet(self, to_date):
         """Render balance sheet using services and helpers."""
-        balance_sheet = BalanceSheet(end_date=to_date)
+        balance_sheet = statement_cache.get_balance_sheet(to_date)
         summary = statement_services.build_statement_summary(balance_sheet)
         unbalanced = statement_services.find_unbalanced_journal_entries()
 
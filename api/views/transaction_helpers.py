@@ -12,6 +12,21 @@ from django.template.loader import render_to_string
 from api import utils
 from api.forms import TransactionFilterForm, TransactionForm, TransactionLinkForm
 from api.models import Transaction
+from api.services.transaction_services import TransactionCursor
+
+# Rows per transaction table window.
+TRANSACTION_PAGE_SIZE = 100
+
+
+def parse_window(value: Optional[str]) -> Optional[TransactionCursor]:
+    """Decodes a posted table window cursor; a missing or bad one reads as the
+    first window."""
+    if not value:
+        return None
+    try:
+        return TransactionCursor.decode(value)
+    except ValueError:
+        return None
 
 
 def render_transaction_table(
@@ -20,6 +35,9 @@ def render_transaction_table(
     no_highlight: bool = False,
     row_url: Optional[str] = None,
     double_row_click: bool = False,
+    after: Optional[TransactionCursor] = None,
+    next_cursor: Optional[TransactionCursor] = None,
+    page_url: Optional[str] = None,
 ) -> str:
     """
     Renders the transaction table HTML.
@@ -30,6 +48,9 @@ def render_transaction_table(
         no_highlight: If True, don't highlight any row
         row_url: URL pattern for row clicks
         double_row_click: If True, require double-click to activate
+        after: Cursor the displayed window starts after (None for the first)
+        next_cursor: Cursor of the following window, if any
+        page_url: Content URL the First/Next buttons reload the table from
 
     Returns:
         HTML string for transaction table
@@ -40,6 +61,9 @@ def render_transaction_table(
         "no_highlight": no_highlight,
         "row_url": row_url,
         "double_row_click": double_row_click,
+        "window": after.encode() if after else "",
+        "next_window": next_cursor.encode() if next_cursor else "",
+        "page_url": page_url,
     }
 
     table_template = "api/tables/transactions-table-new.html"
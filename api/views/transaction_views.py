@@ -18,10 +18,23 @@ from api import utils
 from api.forms import TransactionFilterForm, TransactionForm, TransactionLinkForm
 from api.models import Transaction
 from api.services import transaction_services
+from api.services.transaction_services import TransactionFilterResult
 from api.views import transaction_helpers
 from api.views.page_utils import render_full_page
 
 
+def _get_window(filter_form, window):
+    """The posted table window of a filter form's transactions (empty when the
+    filter is invalid)."""
+    if not filter_form.is_valid():
+        return TransactionFilterResult(transactions=[], count=0)
+    return transaction_services.get_transaction_window(
+        filter_form.get_transactions(),
+        after=transaction_helpers.parse_window(window),
+        limit=transaction_helpers.TRANSACTION_PAGE_SIZE,
+    )
+
+
 # ------------------Transactions View-----------------------
 
 
@@ -30,18 +43,18 @@ class TransactionContentView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         # Parse and validate filter form
         form = TransactionFilterForm(request.GET, prefix="filter")
-        if form.is_valid():
-            transactions = form.get_transactions()
-        else:
-            transactions = []
+        window = _get_window(form, request.GET.get("window"))
 
         # Render via helpers
         form_html = transaction_helpers.render_transaction_form()
         row_url = reverse("transactions")
         table_html = transaction_helpers.render_transaction_table(
-            transactions=transactions,
+            transactions=window.transactions,
             no_highlight=True,
-            row_url=row_url
+            row_url=row_url,
+            after=window.after,
+            next_cursor=window.next_cursor,
+            page_url=reverse("transactions-content"),
         )
 
         # Combine content
@@ -82,6 +95,7 @@ class TransactionsView(LoginRequiredMixin, View):
             date_from=first_day_of_last_month,
             date_to=last_day_of_last_month,
             is_closed=False,
+            limit=transaction_helpers.TRANSACTION_PAGE_SIZE,
         )
 
         # Render filter form
@@ -97,7 +111,9 @@ class TransactionsView(LoginRequiredMixin, View):
         table_html = transaction_helpers.render_transaction_table(
             transactions=filter_result.transactions,
             no_highlight=True,
-            row_url=row_url
+            row_url=row_url,
+            next_cursor=filter_result.next_cursor,
+            page_url=reverse("transactions-content"),
         )
         transaction_form_html = transaction_helpers.render_transaction_form()
 
@@ -115,13 +131,7 @@ class TransactionsView(LoginRequiredMixin, View):
         return render_full_page(request, html)
 
     def post(self, request, transaction_id=None):
-        # Parse filter form to get current transaction list
         filter_form = TransactionFilterForm(request.POST, prefix="filter")
-        if filter_form.is_valid():
-            transactions = list(filter_form.get_transactions())
-        else:
-            print(filter_form.errors)
-            transactions = []
 
         # Handle different actions
         action = request.POST.get("action")
@@ -163,12 +173,16 @@ class TransactionsView(LoginRequiredMixin, View):
                 # Return form with errors
                 return HttpResponse("Form validation failed", status=400)
 
-        # Render updated table
+        # Render the current table window after the change
+        window = _get_window(filter_form, request.POST.get("window"))
         row_url = reverse("transactions")
         table_html = transaction_helpers.render_transaction_table(
-            transactions=transactions,
+            transactions=window.transactions,
             no_highlight=True,
-            row_url=row_url
+            row_url=row_url,
+            after=window.after,
+            next_cursor=window.next_cursor,
+            page_url=reverse("transactions-content"),
         )
 
         # Combine and return
@@ -190,16 +204,16 @@ class LinkTransactionsContentView(LoginRequiredMixin, View):
     def get(self, request):
         # Parse and validate filter form
         form = TransactionFilterForm(request.GET, prefix="filter")
-        if form.is_valid():
-            transactions = list(form.get_transactions())
-        else:
-            transactions = []
+        window = _get_window(form, request.GET.get("window"))
 
         # Render via helpers
         table_html = transaction_helpers.render_transaction_table(
-            transactions,
+            window.transactions,
             no_highlight=True,
-            double_row_click=True
+            double_row_click=True,
+            after=window.after,
+            next_cursor=window.next_cursor,
+            page_url=reverse("link-transactions-content"),
         )
         link_form_html = transaction_helpers.render_transaction_link_form()
 
@@ -226,6 +240,7 @@ class LinkTransactionsView(LoginRequiredMixin, View):
                 Transaction.TransactionType.TRANSFER,
                 Transaction.TransactionType.PAYMENT,
             ],
+            limit=transaction_helpers.TRANSACTION_PAGE_SIZE,
         )
 
         # Render filter form
@@ -243,7 +258,9 @@ class LinkTransactionsView(LoginRequiredMixin, View):
         table_html = transaction_helpers.render_transaction_table(
             filter_result.transactions,
             no_highlight=True,
-            double_row_click=True
+            double_row_click=True,
+            next_cursor=filter_result.next_cursor,
+            page_url=reverse("link-transactions-content"),
         )
         link_form_html = transaction_helpers.render_transaction_link_form()
 
@@ -273,16 +290,16 @@ class LinkTransactionsView(LoginRequiredMixin, View):
 
         # Re-query transactions AFTER linking so linked/closed ones are excluded
         filter_form = TransactionFilterForm(request.POST, prefix="filter")
-        if filter_form.is_valid():
-            transactions = list(filter_form.get_transactions())
-        else:
-            transactions = []
+        window = _get_window(filter_form, request.POST.get("window"))
 
         # Render updated table and form
         table_html = transaction_helpers.render_transaction_table(
-            transactions=transactions,
+            transactions=window.transactions,
             no_highlight=True,
-            double_row_click=True
+            double_row_click=True,
+            after=window.after,
+            next_cursor=window.next_cursor,
+            page_url=reverse("link-transactions-content"),
         )
         link_form_html = transaction_helpers.render_transaction_link_form()
 
@@ -110,6 +110,13 @@ REST_FRAMEWORK = {
 # API Key for REST API authentication
 LEDGER_API_KEY = os.environ.get("LEDGER_API_KEY")
 
+# /api/v1/transactions/ pages: the default and largest page sizes, and whether
+# a page reports the total match count (one extra COUNT query) unless the
+# caller passes include_count.
+LEDGER_API_PAGE_SIZE = int(os.environ.get("LEDGER_API_PAGE_SIZE", "100"))
+LEDGER_API_MAX_PAGE_SIZE = int(os.environ.get("LEDGER_API_MAX_PAGE_SIZE", "1000"))
+LEDGER_API_INCLUDE_COUNT = os.environ.get("LEDGER_API_INCLUDE_COUNT", "true") == "true"
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -162,6 +169,29 @@ CELERY_BROKER_URL = os.environ.get("REDIS_URL")
 CELERY_ACCEPT_CONTENT = ["json"]  # Accepted content formats
 CELERY_TASK_SERIALIZER = "json"  # Serialization format
 
+# Cache
+# Computed statements live in their own cache (see api.statement.StatementCache).
+# Local memory evicts least-recently-used entries past MAX_ENTRIES; with Redis,
+# give the server an LRU policy (maxmemory-policy allkeys-lru) instead.
+if os.environ.get("REDIS_URL"):
+    STATEMENT_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL"),
+        "KEY_PREFIX": "statements",
+        "TIMEOUT": 60 * 60 * 24,
+    }
+else:
+    STATEMENT_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "statements",
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {"MAX_ENTRIES": 256},
+    }
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "statements": STATEMENT_CACHE,
+}
+
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 if IS_HEROKU_APP:
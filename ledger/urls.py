@@ -14,9 +14,15 @@ from api.views.entity_views import (
     EntityHistoryTable,
     TagEntitiesForm,
     TagEntitiesView,
+    UntaggedItemsTable,
     UntagJournalEntryView,
 )
-from api.views.frontend_views import IndexView, TrendView, UploadTransactionsView
+from api.views.frontend_views import (
+    IndexView,
+    TransactionImportStatusView,
+    TrendView,
+    UploadTransactionsView,
+)
 from api.views.journal_entry_views import (
     JournalEntryFormView,
     JournalEntryTableView,
@@ -92,6 +98,11 @@ urlpatterns = [
         UploadTransactionsView.as_view(),
         name="upload-transactions",
     ),
+    path(
+        "upload-transactions/imports/<int:transaction_import_id>/",
+        TransactionImportStatusView.as_view(),
+        name="transaction-import-status",
+    ),
     # Statements
     path(
         "statements/<str:statement_type>/", StatementView.as_view(), name="statements"
@@ -409,6 +420,7 @@ urlpatterns = [
     ),
     path("tag/", TagEntitiesView.as_view(), name="tag-entities"),
     path("tag/balances/", EntityGroupedBalancesView.as_view(), name="entity-balances"),
+    path("tag/untagged/", UntaggedItemsTable.as_view(), name="untagged-items"),
     path(
         "tag/form/<int:journal_entry_item_id>/",
         TagEntitiesForm.as_view(),
@@ -33,8 +33,19 @@ _client = httpx.Client(
 )
 
 
+# Last response per URL + params, keyed for conditional GETs: the reports send
+# an ETag, and a repeat question while the ledger is unchanged comes back 304.
+# Oldest entries are dropped past _ETAG_CACHE_SIZE.
+_ETAG_CACHE_SIZE = 128
+_etag_cache: dict = {}
+
+
 def _get(path: str, params: Optional[dict] = None) -> Any:
-    """GET a reporting endpoint and return parsed JSON (or an error dict)."""
+    """GET a reporting endpoint and return parsed JSON (or an error dict).
+
+    Revalidates with If-None-Match when an earlier response carried an ETag,
+    and reuses that response's body on a 304.
+    """
     if not BASE_URL:
         return {"error": "LEDGER_API_BASE_URL is not set."}
     if not API_KEY:
@@ -42,14 +53,27 @@ def _get(path: str, params: Optional[dict] = None) -> Any:
 
     # Drop unset optional filters so the API applies its own defaults.
     clean = {k: v for k, v in (params or {}).items() if v is not None}
+    url = f"{BASE_URL}/{path.lstrip('/')}"
+    cache_key = (url, tuple(sorted((k, str(v)) for k, v in clean.items())))
+    cached = _etag_cache.get(cache_key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
     try:
-        response = _client.get(f"{BASE_URL}/{path.lstrip('/')}", params=clean)
+        response = _client.get(url, params=clean, headers=headers)
     except httpx.HTTPError as exc:
         return {"error": f"Request failed: {exc}"}
 
+    if response.status_code == 304 and cached:
+        return cached[1]
     if response.status_code != 200:
         return {"error": f"HTTP {response.status_code}", "body": response.text[:500]}
-    return response.json()
+    data = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        _etag_cache.pop(cache_key, None)
+        _etag_cache[cache_key] = (etag, data)
+        if len(_etag_cache) > _ETAG_CACHE_SIZE:
+            del _etag_cache[next(iter(_etag_cache))]
+    return data
 
 
 # --- Reporting tools (aggregations wrapping the statement engine) -----------
@@ -164,12 +188,30 @@ def list_transactions(
     account: Optional[str] = None,
     type: Optional[str] = None,
     is_closed: Optional[bool] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
 ) -> Any:
-    """List raw transactions. Optional filters: account name, type
-    (income/purchase/payment/transfer), is_closed."""
+    """List raw transactions, newest first, one page at a time. Optional
+    filters: account name, type (income/purchase/payment/transfer), is_closed,
+    from_date/to_date (YYYY-MM-DD). fields is a comma-separated subset of the
+    columns to return. Pass the response's next_cursor as cursor for the next
+    page; it is null on the last one."""
     return _get(
         "transactions/",
-        {"account": account, "type": type, "is_closed": is_closed},
+        {
+            "account": account,
+            "type": type,
+            "is_closed": is_closed,
+            "from_date": from_date,
+            "to_date": to_date,
+            "fields": fields,
+            "cursor": cursor,
+            "page_size": page_size,
+            "include_count": False,
+        },
     )
 
 